@@ -0,0 +1,126 @@
+import json
+import os
+import time
+from xml.sax.saxutils import escape
+
+from patterns import TERM_PATTERN
+from siteindex import entry_date
+
+SEARCH_INDEX_VERSION = 1
+SUMMARY_LENGTH = 200
+FEED_ENTRIES = 20
+
+# Entering one of these starts a new run of text, so words in adjacent blocks don't merge
+BLOCK_TAGS = frozenset(("div", "p", "li", "ul", "ol", "pre", "blockquote", "h1", "h2", "h3", "h4", "h5", "h6"))
+
+def extract_text(html_node):
+    parts = []
+    stack = [html_node]
+    while stack:
+        node = stack.pop()
+        if node.children:
+            if node.tag in BLOCK_TAGS:
+                parts.append(" ")
+            stack.extend(reversed(node.children))
+        elif node.value and node.tag != "img":
+            parts.append(node.value)
+    return " ".join("".join(parts).split())
+
+def summarize(text, length=SUMMARY_LENGTH):
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(" ", 1)[0] + "…"
+
+class TextCollector:
+    # Fed one top-level block at a time, so streamed pages are covered without their whole tree
+    def __init__(self):
+        self.terms = set()
+        self.summary = None
+
+    def add(self, html_node):
+        text = extract_text(html_node)
+        self.terms.update(TERM_PATTERN.findall(text.lower()))
+        if self.summary is None and html_node.tag == "p" and text:
+            self.summary = summarize(text)
+
+    def result(self):
+        return {"summary": self.summary or "", "terms": sorted(self.terms)}
+
+def page_text(html_node):
+    collector = TextCollector()
+    for child in html_node.children:
+        collector.add(child)
+    return collector.result()
+
+def attribute(value):
+    return escape(value, {'"': "&quot;"})
+
+def absolute_url(base_url, url):
+    return base_url.rstrip("/") + url
+
+ATOM_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+def entry_updated(entry):
+    # Atom wants a full timestamp: front matter dates are taken as midnight UTC, undated
+    # pages use their source's mtime so the feed only changes when a page does
+    date = entry_date(entry)
+    if date:
+        return date.strftime(ATOM_TIME_FORMAT)
+    try:
+        mtime = os.path.getmtime(entry["source"])
+    except OSError:
+        mtime = 0
+    return time.strftime(ATOM_TIME_FORMAT, time.gmtime(mtime))
+
+def sitemap_xml(site_index, base_url):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for entry in sorted(site_index.pages.values(), key=lambda entry: entry["url"]):
+        date = entry_date(entry)
+        lastmod = ""
+        if date:
+            lastmod_format = "%Y-%m-%d" if len(entry["date"]) == 10 else ATOM_TIME_FORMAT
+            lastmod = f"<lastmod>{date.strftime(lastmod_format)}</lastmod>"
+        lines.append(f"<url><loc>{escape(absolute_url(base_url, entry['url']))}</loc>{lastmod}</url>")
+    lines.append("</urlset>")
+    return "\n".join(lines) + "\n"
+
+def feed_xml(site_index, base_url, title=None, limit=FEED_ENTRIES):
+    entries = site_index.entries()[:limit]
+    updated = [entry_updated(entry) for entry in entries]
+    if title is None:
+        home = next((entry for entry in site_index.pages.values() if entry["url"] == "/index.html"), None)
+        title = home["title"] if home and home["title"] else base_url
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<feed xmlns="http://www.w3.org/2005/Atom">',
+             f"<title>{escape(title)}</title>",
+             f'<link href="{attribute(absolute_url(base_url, "/"))}"/>',
+             f'<link rel="self" href="{attribute(absolute_url(base_url, "/feed.xml"))}"/>',
+             f"<id>{escape(absolute_url(base_url, '/'))}</id>",
+             f"<updated>{max(updated, default='1970-01-01T00:00:00Z')}</updated>"]
+    for entry, entry_time in zip(entries, updated):
+        url = absolute_url(base_url, entry["url"])
+        lines.append("<entry>")
+        lines.append(f"<title>{escape(entry['title'] or entry['url'])}</title>")
+        lines.append(f'<link href="{attribute(url)}"/>')
+        lines.append(f"<id>{escape(url)}</id>")
+        lines.append(f"<updated>{entry_time}</updated>")
+        for tag in entry["tags"]:
+            lines.append(f'<category term="{attribute(tag)}"/>')
+        if entry.get("summary"):
+            lines.append(f"<summary>{escape(entry['summary'])}</summary>")
+        lines.append("</entry>")
+    lines.append("</feed>")
+    return "\n".join(lines) + "\n"
+
+def search_index_json(site_index):
+    # Pages are listed once and terms point at them by position, so the browser downloads
+    # each URL and title once instead of once per matching term
+    pages = []
+    terms = {}
+    for page_id, entry in enumerate(sorted(site_index.pages.values(), key=lambda entry: entry["url"])):
+        pages.append([entry["url"], entry["title"] or entry["url"]])
+        for term in entry.get("terms", ()):
+            terms.setdefault(term, []).append(page_id)
+    data = {"version": SEARCH_INDEX_VERSION, "pages": pages, "terms": dict(sorted(terms.items()))}
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,153 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from buildlog import logger
+from manifest import hash_file
+
+SYNC_MODES = ("copy", "hardlink", "reflink")
+CHECK_MODES = ("mtime", "hash")
+
+# ioctl request number of FICLONE on Linux (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+def default_workers():
+    return min(32, (os.cpu_count() or 1) + 4)
+
+# Static files rewritten rather than copied when minification is on
+MINIFIED_EXTENSIONS = (".css",)
+
+def is_minified(path, minify):
+    return minify and path.endswith(MINIFIED_EXTENSIONS)
+
+def is_up_to_date(src_path, dest_path, check="mtime", minify=False):
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    src_stat = os.stat(src_path)
+    if is_minified(src_path, minify):
+        # A minified copy carries its source's mtime. Its size can't tell it from a plain copy
+        # made without minification (an already minified file keeps its size), so compare
+        # against the minified source.
+        return src_stat.st_mtime_ns == dest_stat.st_mtime_ns and read_bytes(dest_path) == minified_css(src_path)
+    if src_stat.st_size != dest_stat.st_size:
+        return False
+    if (src_stat.st_dev, src_stat.st_ino) == (dest_stat.st_dev, dest_stat.st_ino):
+        return True
+    if check == "hash":
+        return hash_file(src_path) == hash_file(dest_path)
+    return src_stat.st_mtime_ns == dest_stat.st_mtime_ns
+
+def reflink_file(src_path, dest_path):
+    import fcntl
+    with open(src_path, 'rb') as src, open(dest_path, 'wb') as dest:
+        fcntl.ioctl(dest.fileno(), FICLONE, src.fileno())
+    shutil.copystat(src_path, dest_path)
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def minified_css(src_path):
+    from minify import minify_css
+    with open(src_path, 'r') as f:
+        css = f.read()
+    return minify_css(css).encode()
+
+def minify_file(src_path, dest_path):
+    with open(dest_path, 'wb') as f:
+        f.write(minified_css(src_path))
+    shutil.copystat(src_path, dest_path)
+
+def sync_file(src_path, dest_path, mode="copy", minify=False):
+    # Never write through an existing output: it may be a hardlink to an old source
+    if os.path.lexists(dest_path):
+        os.unlink(dest_path)
+
+    if is_minified(src_path, minify):
+        minify_file(src_path, dest_path)
+        return "copied"
+
+    if mode == "hardlink":
+        try:
+            os.link(src_path, dest_path)
+            return "linked"
+        except OSError:
+            pass
+    elif mode == "reflink":
+        try:
+            reflink_file(src_path, dest_path)
+            return "linked"
+        except (OSError, ImportError):
+            if os.path.exists(dest_path):
+                os.unlink(dest_path)
+
+    # Plain copy, also the fallback across devices or on filesystems without reflinks
+    shutil.copy2(src_path, dest_path)
+    return "copied"
+
+def list_files(src_dir):
+    files = []
+    stack = [src_dir]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                else:
+                    files.append(os.path.relpath(entry.path, src_dir))
+    return sorted(files)
+
+def sync_directory(src_dir, dest_dir, previous=(), mode="copy", check="mtime", workers=None, minify=False):
+    if mode not in SYNC_MODES:
+        raise ValueError(f"Unknown asset sync mode: {mode}")
+    if check not in CHECK_MODES:
+        raise ValueError(f"Unknown asset check mode: {check}")
+
+    stats = {"copied": 0, "linked": 0, "skipped": 0, "removed": 0, "bytes": 0}
+    files = list_files(src_dir) if os.path.isdir(src_dir) else []
+
+    pending = []
+    for relative_path in files:
+        src_path = os.path.join(src_dir, relative_path)
+        dest_path = os.path.join(dest_dir, relative_path)
+        if is_up_to_date(src_path, dest_path, check, minify):
+            stats["skipped"] += 1
+        else:
+            pending.append((src_path, dest_path))
+
+    for dir_path in {os.path.dirname(dest_path) for _, dest_path in pending}:
+        os.makedirs(dir_path, exist_ok=True)
+
+    # File copies release the GIL, so threads overlap the I/O
+    with ThreadPoolExecutor(max_workers=workers or default_workers()) as executor:
+        outcomes = executor.map(lambda paths: sync_file(paths[0], paths[1], mode, minify), pending)
+        for (src_path, dest_path), outcome in zip(pending, outcomes):
+            logger.debug(f"{outcome.capitalize()} file: {src_path} to {dest_path}")
+            stats[outcome] += 1
+            stats["bytes"] += os.path.getsize(src_path)
+
+    # Only outputs this stage created before are considered orphans; pages share dest_dir
+    current = set(files)
+    for relative_path in previous:
+        if relative_path not in current:
+            dest_path = os.path.join(dest_dir, relative_path)
+            if os.path.isfile(dest_path):
+                os.unlink(dest_path)
+                logger.debug(f"Removed stale output: {dest_path}")
+                stats["removed"] += 1
+            remove_empty_parents(dest_path, dest_dir)
+
+    return stats, files
+
+def remove_empty_parents(path, root):
+    parent = os.path.dirname(path)
+    root = os.path.abspath(root)
+    while os.path.abspath(parent).startswith(root + os.sep) and os.path.isdir(parent) and not os.listdir(parent):
+        os.rmdir(parent)
+        parent = os.path.dirname(parent)
+
+def format_stats(stats):
+    return (f"{stats['copied']} copied, {stats['linked']} linked, {stats['skipped']} unchanged, "
+            f"{stats['removed']} removed ({stats['bytes']} bytes)")
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+
+from buildlog import logger
+from htmlnode import LeafNode, ParentNode
+from textnode import PARSER_VERSION
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+def encode_node(node):
+    # Compact nested lists: ["L", tag, value, props] for leaves, ["P", tag, children, props] for parents
+    props = dict(node.props) if node.props else None
+    if isinstance(node, ParentNode):
+        return ["P", node.tag, [encode_node(child) for child in node.children], props]
+    return ["L", node.tag, node.value, props]
+
+def decode_node(data):
+    kind, tag, body, props = data
+    if kind == "P":
+        return ParentNode(tag, [decode_node(child) for child in body], props)
+    if kind == "L":
+        return LeafNode(tag, body, props)
+    raise ValueError(f"Unknown cached node kind: {kind}")
+
+class ASTCache:
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, markdown):
+        return hashlib.sha256(f"{PARSER_VERSION}\0{markdown}".encode()).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key):
+        path = self.entry_path(key)
+        try:
+            with open(path, 'r') as f:
+                node = decode_node(json.load(f))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, TypeError):
+            # A corrupt entry is dropped and the page is parsed again
+            self.misses += 1
+            self.discard(path)
+            return None
+
+        # Touch the entry so trim() evicts least recently used entries first
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return node
+
+    def put(self, key, node):
+        path = self.entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(encode_node(node), f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # The cache is only an optimization: a full disk or read-only cache directory
+            # must not fail a page that rendered fine
+            logger.warning(f"Could not write AST cache entry {path}: {e}")
+            self.discard(tmp_path)
+
+    def discard(self, path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def trim(self):
+        entries = []
+        total = 0
+        if not os.path.isdir(self.directory):
+            return 0
+        for dir_path, _, filenames in os.walk(self.directory):
+            for name in filenames:
+                path = os.path.join(dir_path, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+                total += stat.st_size
+
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not evict AST cache entry {path}: {e}")
+                continue
+            total -= size
+            removed += 1
+        return removed
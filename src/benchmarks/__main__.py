@@ -0,0 +1,143 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+
+import main as site_main
+from textnode import inline_cache, markdown_to_blocks, markdown_to_html_node, parse_blocks, text_to_textnodes
+from benchmarks.corpus import SHAPES, generate_corpus, write_corpus
+
+BENCH_TEMPLATE = "<html><head><title>{{ Title }}</title></head><body>{{ Content }}</body></html>"
+
+def peak_alloc_kb(func, reset=None):
+    # One extra, untimed run under tracemalloc: unlike the process's peak RSS, this peak
+    # starts over for every stage. Memory of --jobs worker processes is not included.
+    if reset is not None:
+        reset()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+
+def best_of(repeat, func, reset=None):
+    # reset runs untimed before every repetition, so caches don't carry over between runs
+    timings = []
+    for _ in range(repeat):
+        if reset is not None:
+            reset()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def stage_result(seconds, pages, operations, peak_kb):
+    return {
+        "seconds": round(seconds, 6),
+        "pages_per_sec": round(pages / seconds, 2) if seconds else None,
+        "ops": operations,
+        "ops_per_sec": round(operations / seconds, 2) if seconds else None,
+        "peak_alloc_kb": peak_kb,
+    }
+
+def bench_inline(documents, repeat):
+    texts = [block for document in documents for block_type, block in parse_blocks(document)
+             if block_type in ("paragraph", "unordered_list", "ordered_list")]
+    stage = lambda: [text_to_textnodes(text) for text in texts]
+    return stage_result(best_of(repeat, stage), len(documents), len(texts), peak_alloc_kb(stage))
+
+def bench_blocks(documents, repeat):
+    stage = lambda: [markdown_to_blocks(document) for document in documents]
+    return stage_result(best_of(repeat, stage), len(documents), len(documents), peak_alloc_kb(stage))
+
+def cache_reset(warm_cache):
+    # The inline cache lives for the whole process; cleared, every run parses its text again
+    # and the stages stay comparable with each other and with earlier results
+    return None if warm_cache else inline_cache.clear
+
+def bench_html_node(documents, repeat, warm_cache=False):
+    stage = lambda: [markdown_to_html_node(document) for document in documents]
+    reset = cache_reset(warm_cache)
+    return stage_result(best_of(repeat, stage, reset), len(documents), len(documents), peak_alloc_kb(stage, reset))
+
+def bench_to_html(documents, repeat):
+    nodes = [markdown_to_html_node(document) for document in documents]
+    stage = lambda: [node.to_html() for node in nodes]
+    return stage_result(best_of(repeat, stage), len(documents), len(nodes), peak_alloc_kb(stage))
+
+def bench_build(documents, repeat, argv, warm_cache=False):
+    def build():
+        with tempfile.TemporaryDirectory() as root:
+            write_corpus(os.path.join(root, "content"), documents)
+            os.makedirs(os.path.join(root, "static"))
+            with open(os.path.join(root, "static", "index.css"), 'w') as f:
+                f.write("body { margin: 0; }\n")
+            with open(os.path.join(root, "template.html"), 'w') as f:
+                f.write(BENCH_TEMPLATE)
+
+            cwd = os.getcwd()
+            os.chdir(root)
+            try:
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    site_main.main(argv)
+                return time.perf_counter() - start
+            finally:
+                os.chdir(cwd)
+
+    reset = cache_reset(warm_cache)
+    timings = []
+    for _ in range(repeat):
+        if reset is not None:
+            reset()
+        timings.append(build())
+    return stage_result(min(timings), len(documents), len(documents), peak_alloc_kb(build, reset))
+
+def run(pages=100, shape="mixed", blocks=40, repeat=3, seed=0, build_argv=(), warm_cache=False):
+    documents = generate_corpus(pages, shape, blocks, seed)
+    return {
+        "python": platform.python_version(),
+        "corpus": {"pages": pages, "shape": shape, "blocks_per_page": blocks, "seed": seed,
+                   "bytes": sum(len(document) for document in documents)},
+        "inline_cache": "warm" if warm_cache else "cold",
+        "stages": {
+            "text_to_textnodes": bench_inline(documents, repeat),
+            "markdown_to_blocks": bench_blocks(documents, repeat),
+            "markdown_to_html_node": bench_html_node(documents, repeat, warm_cache),
+            "to_html": bench_to_html(documents, repeat),
+            "main": bench_build(documents, repeat, list(build_argv), warm_cache),
+        },
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m benchmarks",
+                                     description="Time the parser and renderer hot paths on a synthetic corpus.")
+    parser.add_argument("--pages", type=int, default=100, help="number of generated pages")
+    parser.add_argument("--shape", choices=SHAPES, default="mixed", help="kind of content to generate")
+    parser.add_argument("--blocks", type=int, default=40, help="blocks per generated page")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions per stage; the best run is reported")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--warm-inline-cache", action="store_true",
+                        help="keep the inline cache between runs instead of clearing it before each one")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("build_args", nargs=argparse.REMAINDER,
+                        help="extra arguments for the full build, after --")
+    args = parser.parse_args(argv)
+
+    build_argv = args.build_args[1:] if args.build_args[:1] == ["--"] else args.build_args
+    results = run(args.pages, args.shape, args.blocks, args.repeat, args.seed, build_argv,
+                  args.warm_inline_cache)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import argparse
+import gc
+import json
+import time
+
+from htmlnode import LeafNode, ParentNode, text_node_to_html_node
+from textnode import (text_nodes_to_html_nodes, text_to_textnodes, text_type_bold, text_type_code,
+                      text_type_image, text_type_italic, text_type_link, text_type_text)
+
+# The if/elif chain text_nodes_to_html_nodes used before the dispatch table, kept for comparison
+def chained_text_nodes_to_html_nodes(text_nodes):
+    html_nodes = []
+    for text_node in text_nodes:
+        if isinstance(text_node, str):
+            html_nodes.append(LeafNode(None, text_node))
+        elif text_node.children:
+            children = chained_text_nodes_to_html_nodes(text_node.children)
+            if text_node.text_type == text_type_bold:
+                html_nodes.append(ParentNode("b", children))
+            elif text_node.text_type == text_type_italic:
+                html_nodes.append(ParentNode("i", children))
+            else:
+                html_nodes.append(ParentNode("a", children, {"href": text_node.url}))
+        elif text_node.text_type == text_type_text:
+            html_nodes.append(LeafNode(None, text_node.text))
+        elif text_node.text_type == text_type_bold:
+            html_nodes.append(LeafNode("b", text_node.text))
+        elif text_node.text_type == text_type_italic:
+            html_nodes.append(LeafNode("i", text_node.text))
+        elif text_node.text_type == text_type_code:
+            html_nodes.append(LeafNode("code", text_node.text))
+        elif text_node.text_type == text_type_link:
+            html_nodes.append(LeafNode("a", text_node.text, {"href": text_node.url}))
+        elif text_node.text_type == text_type_image:
+            html_nodes.append(LeafNode("img", "", {"src": text_node.url, "alt": text_node.text}))
+        else:
+            raise ValueError(f"Invalid text type: {text_node.text_type}")
+    return html_nodes
+
+def chained_dict_to_html_node(text_node):
+    node_type = text_node.get("type")
+    text = text_node.get("text", "")
+    if node_type == "text":
+        return LeafNode(None, text)
+    elif node_type == "bold":
+        return LeafNode("b", text)
+    elif node_type == "italic":
+        return LeafNode("i", text)
+    elif node_type == "code":
+        return LeafNode("code", text)
+    elif node_type == "link":
+        return LeafNode("a", text, {"href": text_node.get("url")})
+    elif node_type == "image":
+        return LeafNode("img", "", {"src": text_node.get("src"), "alt": text_node.get("alt")})
+    else:
+        raise ValueError(f"Unknown TextNode type: {node_type}")
+
+# Roughly prose-shaped: mostly plain runs, with every other text type mixed in
+SAMPLE = ("Plain words then **bold** and *italic* text, some `code`, a [link](/docs/page) "
+          "and an ![image](/img/pic.png), then [**nested** link](/nested) and more plain words.")
+
+def sample_nodes(count):
+    per_text = text_to_textnodes(SAMPLE)
+    return per_text * max(1, count // len(per_text))
+
+def sample_dicts(nodes):
+    dicts = []
+    for node in nodes:
+        if node.text_type == text_type_image:
+            dicts.append({"type": "image", "src": node.url, "alt": node.text})
+        else:
+            dicts.append({"type": node.text_type, "text": node.text, "url": node.url})
+    return dicts
+
+def best_of(repeat, func):
+    # Like timeit, with the collector off: otherwise collections triggered by the allocated
+    # nodes dominate the per-node numbers
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return min(timings)
+
+def case_result(seconds, count):
+    return {"ns_per_node": round(seconds * 1e9 / count, 1), "nodes_per_sec": round(count / seconds)}
+
+def run(count=100_000, repeat=5):
+    nodes = sample_nodes(count)
+    flat = [node for node in nodes if not node.children]
+    dicts = sample_dicts(flat)
+    if chained_text_nodes_to_html_nodes(nodes) != text_nodes_to_html_nodes(nodes):
+        raise AssertionError("dispatch table and if/elif chain disagree")
+
+    cases = {
+        "TextNode": (lambda: chained_text_nodes_to_html_nodes(nodes), lambda: text_nodes_to_html_nodes(nodes),
+                     len(nodes)),
+        "dict": (lambda: [chained_dict_to_html_node(node) for node in dicts],
+                 lambda: [text_node_to_html_node(node) for node in dicts], len(dicts)),
+    }
+    results = {}
+    for name, (before, after, total) in cases.items():
+        before_result = case_result(best_of(repeat, before), total)
+        after_result = case_result(best_of(repeat, after), total)
+        results[name] = {"nodes": total, "before": before_result, "after": after_result,
+                         "speedup": round(before_result["ns_per_node"] / after_result["ns_per_node"], 2)}
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m benchmarks.conversion",
+                                     description="Per-node throughput of the TextNode to HTML node conversion.")
+    parser.add_argument("--count", type=int, default=100_000, help="text nodes converted per run")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case; the fastest is reported")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.count, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'input':<10}{'nodes':>9}{'before ns':>11}{'after ns':>10}{'after nodes/s':>15}{'speedup':>9}")
+    for name, result in results.items():
+        print(f"{name:<10}{result['nodes']:>9}{result['before']['ns_per_node']:>11}{result['after']['ns_per_node']:>10}"
+              f"{result['after']['nodes_per_sec']:>15}{result['speedup']:>8}x")
+
+if __name__ == "__main__":
+    main()
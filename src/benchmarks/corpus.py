@@ -0,0 +1,76 @@
+import os
+import random
+
+SHAPES = ("prose", "list", "link", "code", "mixed")
+
+WORDS = (
+    "middle earth shire hobbit ring wizard elf dwarf river mountain forest road "
+    "journey fellowship council tower king queen sword shadow light star song"
+).split()
+
+def sentence(rng, inline):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(6, 16))]
+    if inline:
+        # Sprinkle inline markup so the inline scanner has real work to do
+        i = rng.randrange(len(words))
+        words[i] = rng.choice((f"**{words[i]}**", f"*{words[i]}*", f"`{words[i]}`"))
+    return " ".join(words).capitalize() + "."
+
+def link(rng):
+    word = rng.choice(WORDS)
+    if rng.random() < 0.2:
+        return f"![{word}](/images/{word}.png)"
+    return f"[{word}](/{rng.choice(WORDS)}/{word})"
+
+def prose_block(rng):
+    return " ".join(sentence(rng, inline=True) for _ in range(rng.randint(3, 6)))
+
+def list_block(rng):
+    if rng.random() < 0.5:
+        return "\n".join(f"* {sentence(rng, inline=True)}" for _ in range(rng.randint(3, 8)))
+    return "\n".join(f"{i + 1}. {sentence(rng, inline=True)}" for i in range(rng.randint(3, 8)))
+
+def link_block(rng):
+    parts = []
+    for _ in range(rng.randint(3, 6)):
+        parts.append(sentence(rng, inline=False))
+        parts.append(link(rng))
+    return " ".join(parts)
+
+def code_block(rng):
+    lines = [f"{rng.choice(WORDS)} = {rng.randint(0, 999)}" for _ in range(rng.randint(4, 12))]
+    return "```\n" + "\n".join(lines) + "\n```"
+
+BLOCK_GENERATORS = {
+    "prose": (prose_block,),
+    "list": (list_block,),
+    "link": (link_block,),
+    "code": (code_block,),
+    "mixed": (prose_block, list_block, link_block, code_block),
+}
+
+def generate_markdown(shape="mixed", blocks=40, seed=0):
+    if shape not in BLOCK_GENERATORS:
+        raise ValueError(f"Unknown corpus shape: {shape}")
+    rng = random.Random(seed)
+    generators = BLOCK_GENERATORS[shape]
+    parts = [f"# {sentence(rng, inline=False)}"]
+    for i in range(blocks):
+        if i % 10 == 9:
+            parts.append(f"## {sentence(rng, inline=False)}")
+        parts.append(rng.choice(generators)(rng))
+    return "\n\n".join(parts) + "\n"
+
+def generate_corpus(pages=100, shape="mixed", blocks=40, seed=0):
+    return [generate_markdown(shape, blocks, seed + i) for i in range(pages)]
+
+def write_corpus(content_dir, documents, pages_per_dir=50):
+    paths = []
+    for i, document in enumerate(documents):
+        dir_path = os.path.join(content_dir, f"section{i // pages_per_dir}")
+        os.makedirs(dir_path, exist_ok=True)
+        path = os.path.join(dir_path, f"page{i}.md")
+        with open(path, 'w') as f:
+            f.write(document)
+        paths.append(path)
+    return paths
@@ -0,0 +1,85 @@
+import argparse
+import json
+import tracemalloc
+
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode, text_type_text
+
+# Dict-backed replicas of the node classes before they were slotted, kept for comparison
+class DictTextNode:
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+class DictLeafNode:
+    def __init__(self, tag, value, props=None):
+        if props is None:
+            props = {}
+        self.tag = tag
+        self.value = value
+        self.children = []
+        self.props = props
+
+class DictParentNode:
+    def __init__(self, tag, children, props=None):
+        self.tag = tag
+        self.value = None
+        self.children = children
+        self.props = props or {}
+
+def measure(factory, count):
+    # Text payloads are created up front so only the node objects themselves are counted
+    texts = [f"word {i}" for i in range(count)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = [factory(text) for text in texts]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del nodes
+    return (after - before) / count
+
+CASES = {
+    "TextNode": (
+        lambda text: DictTextNode(text, text_type_text),
+        lambda text: TextNode(text, text_type_text),
+    ),
+    "LeafNode(text)": (
+        lambda text: DictLeafNode(None, text),
+        lambda text: LeafNode(None, text),
+    ),
+    "LeafNode(b)": (
+        lambda text: DictLeafNode("b", text),
+        lambda text: LeafNode("b", text),
+    ),
+    "ParentNode(p)": (
+        lambda text: DictParentNode("p", [text]),
+        lambda text: ParentNode("p", [text]),
+    ),
+}
+
+def run(count):
+    results = {}
+    for name, (before_factory, after_factory) in CASES.items():
+        before = measure(before_factory, count)
+        after = measure(after_factory, count)
+        results[name] = {"before_bytes": round(before, 1), "after_bytes": round(after, 1),
+                         "saved_pct": round(100 * (before - after) / before, 1)}
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-node memory footprint of the node classes.")
+    parser.add_argument("--count", type=int, default=100_000, help="nodes allocated per case")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.count)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'node':<16}{'before (B)':>12}{'after (B)':>12}{'saved':>8}")
+    for name, result in results.items():
+        print(f"{name:<16}{result['before_bytes']:>12}{result['after_bytes']:>12}{result['saved_pct']:>7}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Subsystems a plain single-process build should never have to import
+OPTIONAL_MODULES = ("asyncio", "multiprocessing", "concurrent.futures.process", "pipeline", "profiling",
+                    "linkgraph", "highlight", "artifacts", "minify", "compress", "devserver", "http.server")
+
+def parse_importtime(stderr):
+    # Lines look like "import time:  self [us] | cumulative | <indent>module"
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append({"module": name.strip(), "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                        "self_us": int(self_us), "cumulative_us": int(cumulative_us)})
+    return modules
+
+def render_statement(page, template, dest):
+    return f"import main; main.render_page({os.path.abspath(page)!r}, {os.path.abspath(template)!r}, {dest!r})"
+
+def measure(statement):
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=SRC_DIR,
+                             capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    return wall, parse_importtime(process.stderr)
+
+def run(statement="import main", repeat=5, top=10):
+    baseline = min(measure("pass")[0] for _ in range(repeat))
+    best = None
+    for _ in range(repeat):
+        wall, modules = measure(statement)
+        if best is None or wall < best[0]:
+            best = (wall, modules)
+    wall, modules = best
+
+    loaded = {module["module"] for module in modules}
+    slowest = sorted((module for module in modules if module["depth"] == 0),
+                     key=lambda module: module["cumulative_us"], reverse=True)
+    return {
+        "statement": statement,
+        "wall_ms": round(wall * 1000, 1),
+        "interpreter_ms": round(baseline * 1000, 1),
+        "import_ms": round(sum(module["cumulative_us"] for module in modules if module["depth"] == 0) / 1000, 1),
+        "modules_imported": len(modules),
+        "optional_loaded": [name for name in OPTIONAL_MODULES if name in loaded],
+        "slowest": [{"module": module["module"], "cumulative_ms": round(module["cumulative_us"] / 1000, 2)}
+                    for module in slowest[:top]],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m benchmarks.startup",
+                                     description="Cold-start time of the generator, from python -X importtime.")
+    parser.add_argument("--page", help="also render this Markdown file, like a single-page preview")
+    parser.add_argument("--template", default=os.path.join(os.path.dirname(SRC_DIR), "template.html"),
+                        help="template used with --page")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement; the fastest is reported")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest top-level imports to list")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        statement = "import main"
+        if args.page:
+            statement = render_statement(args.page, args.template, os.path.join(output_dir, "page.html"))
+        results = run(statement, args.repeat, args.top)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{results['statement']}")
+    print(f"  wall {results['wall_ms']} ms (bare interpreter {results['interpreter_ms']} ms), "
+          f"imports {results['import_ms']} ms across {results['modules_imported']} modules")
+    print(f"  optional subsystems loaded: {', '.join(results['optional_loaded']) or 'none'}")
+    for module in results["slowest"]:
+        print(f"  {module['cumulative_ms']:>8.2f} ms  {module['module']}")
+
+if __name__ == "__main__":
+    main()
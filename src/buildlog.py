@@ -0,0 +1,56 @@
+import json
+import logging
+import sys
+
+logger = logging.getLogger("static_site")
+
+VERBOSITY_LEVELS = {"quiet": logging.WARNING, "normal": logging.INFO, "verbose": logging.DEBUG}
+
+class JSONLinesFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {"time": round(record.created, 6), "level": record.levelname.lower(), "message": record.getMessage()}
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry)
+
+def configure_logging(verbosity="normal", json_log=None):
+    console_level = VERBOSITY_LEVELS[verbosity]
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    logger.propagate = False
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setLevel(console_level)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(console)
+
+    # The JSON-lines file always gets every event, whatever the console shows
+    if json_log:
+        log_file = logging.FileHandler(json_log, mode='w')
+        log_file.setLevel(logging.DEBUG)
+        log_file.setFormatter(JSONLinesFormatter())
+        logger.addHandler(log_file)
+    logger.setLevel(logging.DEBUG if json_log else console_level)
+    return logger
+
+class BuildStats:
+    __slots__ = ("pages_rendered", "pages_changed", "bytes_written", "files_copied", "links_found")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.pages_rendered = 0
+        self.pages_changed = 0
+        self.bytes_written = 0
+        self.files_copied = 0
+        self.links_found = 0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __str__(self):
+        return (f"{self.pages_rendered} pages rendered ({self.pages_changed} changed, {self.bytes_written} bytes written), "
+                f"{self.files_copied} files copied, {self.links_found} links found")
+
+stats = BuildStats()
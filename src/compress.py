@@ -0,0 +1,94 @@
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from assets import default_workers
+from output import write_bytes_if_changed
+
+COMPRESSIBLE_EXTENSIONS = (".html", ".css", ".js", ".json", ".xml", ".svg", ".txt")
+# Below this a compressed sibling saves less than the request around it costs
+MIN_COMPRESS_SIZE = 256
+
+def gzip_compress(data):
+    # mtime=0 keeps the bytes reproducible, so unchanged outputs keep unchanged siblings
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+_codecs = None
+
+def available_codecs():
+    # (extension, compress, decompress) for gzip plus whichever of brotli and zstd can be imported
+    global _codecs
+    if _codecs is not None:
+        return _codecs
+    codecs = [(".gz", gzip_compress, gzip.decompress)]
+    try:
+        import brotli
+        codecs.append((".br", lambda data: brotli.compress(data, quality=11), brotli.decompress))
+    except ImportError:
+        pass
+    try:
+        from compression import zstd
+        codecs.append((".zst", lambda data: zstd.compress(data, level=19), zstd.decompress))
+    except ImportError:
+        try:
+            import zstandard
+            codecs.append((".zst", lambda data: zstandard.ZstdCompressor(level=19).compress(data),
+                           lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)))
+        except ImportError:
+            pass
+    _codecs = codecs
+    return codecs
+
+def is_compressible(path):
+    return path.endswith(COMPRESSIBLE_EXTENSIONS)
+
+def is_current(sibling, data, decompress):
+    # Static outputs keep their source's mtime, so only the content tells whether a sibling
+    # is stale; decompressing is far cheaper than compressing again
+    try:
+        with open(sibling, 'rb') as f:
+            return decompress(f.read()) == data
+    except Exception:
+        # Missing, truncated or foreign files are simply replaced
+        return False
+
+def output_stamp(path):
+    # The inode change time moves on every write, rename or link and can't be set back like
+    # an mtime, so an output with the same stamp still has the content its siblings hold
+    stat = os.stat(path)
+    return [stat.st_ino, stat.st_size, stat.st_ctime_ns]
+
+def compress_file(path, codecs, previous_stamp=None):
+    # Returns (siblings, number written, stamp of the output they were made from)
+    stamp = output_stamp(path)
+    if stamp[1] < MIN_COMPRESS_SIZE:
+        return [], 0, None
+    siblings = [path + extension for extension, _, _ in codecs]
+    if stamp == previous_stamp and all(os.path.exists(sibling) for sibling in siblings):
+        # Untouched since it was last compressed: skip reading it and its siblings
+        return siblings, 0, stamp
+    with open(path, 'rb') as f:
+        data = f.read()
+    written = 0
+    for sibling, (_, compress, decompress) in zip(siblings, codecs):
+        if not is_current(sibling, data, decompress):
+            written += write_bytes_if_changed(sibling, compress(data))
+    return siblings, written, stamp
+
+def compress_files(paths, workers=None, stamps=None):
+    # zlib, brotli and zstd all release the GIL while compressing, so threads run in parallel.
+    # stamps maps outputs to their stamps from an earlier run; the returned ones replace them.
+    codecs = available_codecs()
+    stamps = stamps or {}
+    paths = [path for path in paths if is_compressible(path)]
+    siblings = []
+    written = 0
+    new_stamps = {}
+    with ThreadPoolExecutor(max_workers=workers or default_workers()) as executor:
+        results = executor.map(lambda path: compress_file(path, codecs, stamps.get(path)), paths)
+        for path, (file_siblings, file_written, stamp) in zip(paths, results):
+            siblings.extend(file_siblings)
+            written += file_written
+            if stamp is not None:
+                new_stamps[path] = stamp
+    return siblings, written, [codec[0] for codec in codecs], new_stamps
@@ -0,0 +1,194 @@
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from assets import sync_file
+from buildlog import logger
+from frontmatter import front_matter_template, read_front_matter
+from template import TEMPLATE_FILENAME, PAGE_TEMPLATE_SUFFIX, resolve_template
+
+def snapshot_tree(root):
+    files = {}
+    if not os.path.isdir(root):
+        return files
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    stat = entry.stat()
+                    files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+def file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class SiteWatcher:
+    def __init__(self, content_dir, static_dir, template_path, public_dir, main_module, drafts=False,
+                 asset_mode="copy"):
+        # Pages are rebuilt through the module that ran the first build, so they pick up its
+        # configuration (--minify, --ast-cache, ...); under `python3 src/main.py` that is
+        # __main__, and importing main here would load a second, unconfigured copy
+        self.main_module = main_module
+        self.content_dir = content_dir
+        self.static_dir = static_dir
+        self.template_path = template_path
+        self.public_dir = public_dir
+        self.drafts = drafts
+        self.asset_mode = asset_mode
+        # Page -> the template it renders with, so a template change rebuilds just its pages
+        self.templates = {}
+        for page_path in sorted(path for path in snapshot_tree(content_dir) if path.endswith('.md')):
+            self.templates[page_path] = self.page_template(page_path)
+        self.snapshot = self.scan()
+
+    def scan(self):
+        files = snapshot_tree(self.content_dir)
+        files.update(snapshot_tree(self.static_dir))
+        # Front matter may name templates outside the content directory
+        for template_path in {self.template_path, *self.templates.values()}:
+            stamp = file_stamp(template_path)
+            if stamp is not None:
+                files[template_path] = stamp
+        return files
+
+    def poll(self):
+        current = self.scan()
+        changed = [path for path, stamp in current.items() if self.snapshot.get(path) != stamp]
+        removed = [path for path in self.snapshot if path not in current]
+        self.snapshot = current
+        return changed, removed
+
+    def page_output(self, page_path):
+        relative_path = os.path.relpath(page_path, self.content_dir)
+        return os.path.join(self.public_dir, Path(relative_path).with_suffix('.html'))
+
+    def pages_under(self, dir_path):
+        prefix = os.path.join(dir_path, "")
+        return sorted(path for path in self.snapshot if path.endswith('.md') and path.startswith(prefix))
+
+    def page_template(self, page_path, meta=None):
+        if meta is None:
+            meta, _ = read_front_matter(page_path)
+        template_path = resolve_template(page_path, self.content_dir, self.template_path)
+        return front_matter_template(meta, page_path, template_path)
+
+    def use_template(self, page_path, template_path):
+        self.templates[page_path] = template_path
+        if template_path not in self.snapshot:
+            # Watch a newly named template from now on without reporting it as changed
+            stamp = file_stamp(template_path)
+            if stamp is not None:
+                self.snapshot[template_path] = stamp
+
+    def pages_using(self, template_path):
+        return [page_path for page_path, used in self.templates.items() if used == template_path]
+
+    def retemplated_pages(self, template_path):
+        # Adding or removing template.html or page.template.html changes which template the
+        # pages below it resolve to
+        dir_path = os.path.dirname(template_path)
+        if dir_path != self.content_dir and not dir_path.startswith(os.path.join(self.content_dir, "")):
+            return []
+        return [page_path for page_path in self.pages_under(dir_path)
+                if self.page_template(page_path) != self.templates.get(page_path)]
+
+    def rebuild_page(self, page_path):
+        try:
+            meta, _ = read_front_matter(page_path)
+            template_path = self.page_template(page_path, meta)
+            self.use_template(page_path, template_path)
+            if meta["draft"] and not self.drafts:
+                # A page that just became a draft disappears from the served site
+                self.main_module.remove_output(self.page_output(page_path), self.public_dir)
+                return
+            self.main_module.generate_page(page_path, template_path, self.page_output(page_path))
+        except Exception as e:
+            # Keep serving; the page is retried on its next change
+            logger.error(f"Failed to generate {page_path}: {type(e).__name__}: {e}")
+
+    def sync_static(self, path, removed):
+        # The build's asset path: an output hardlinked to its source is replaced rather than
+        # copied onto itself, and CSS is minified when the build minifies
+        dest_path = os.path.join(self.public_dir, os.path.relpath(path, self.static_dir))
+        try:
+            if removed:
+                self.main_module.remove_output(dest_path, self.public_dir)
+                return
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            outcome = sync_file(path, dest_path, self.asset_mode, self.main_module.minify_output)
+            logger.debug(f"{outcome.capitalize()} file: {path} to {dest_path}")
+        except Exception as e:
+            # Keep serving; the file is retried on its next change
+            logger.error(f"Failed to sync {path}: {type(e).__name__}: {e}")
+
+    def apply(self, changed, removed):
+        # Work out the smallest set of pages and assets touched by the changes
+        pages = set()
+        for path in changed + removed:
+            name = os.path.basename(path)
+            if path.startswith(os.path.join(self.static_dir, "")):
+                self.sync_static(path, path in removed)
+            elif name.endswith('.md'):
+                if path in removed:
+                    self.templates.pop(path, None)
+                    self.main_module.remove_output(self.page_output(path), self.public_dir)
+                else:
+                    pages.add(path)
+            else:
+                pages.update(self.pages_using(path))
+                if name == TEMPLATE_FILENAME or name.endswith(PAGE_TEMPLATE_SUFFIX):
+                    pages.update(self.retemplated_pages(path))
+
+        for page_path in sorted(pages):
+            self.rebuild_page(page_path)
+        return pages
+
+    def watch(self, interval=0.2, stop_event=None):
+        while stop_event is None or not stop_event.is_set():
+            changed, removed = self.poll()
+            if changed or removed:
+                start = time.perf_counter()
+                self.apply(changed, removed)
+                logger.info(f"Handled {len(changed) + len(removed)} changed files in {(time.perf_counter() - start) * 1000:.1f} ms")
+            time.sleep(interval)
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+def serve(content_dir, static_dir, template_path, public_dir, main_module, port=8888, watch=False, interval=0.2,
+          drafts=False, asset_mode="copy"):
+    handler = functools.partial(QuietHandler, directory=public_dir)
+    server = ThreadingHTTPServer(("", port), handler)
+    logger.info(f"Serving {public_dir} at http://localhost:{port}/")
+
+    if not watch:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    watcher = SiteWatcher(content_dir, static_dir, template_path, public_dir, main_module, drafts, asset_mode)
+    logger.info(f"Watching {content_dir}, {static_dir} and {template_path} for changes")
+    try:
+        watcher.watch(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
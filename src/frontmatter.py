@@ -0,0 +1,96 @@
+import os
+
+# Opening fence -> key/value separator: YAML-ish "---" with "key: value", TOML-ish "+++" with "key = value"
+FENCES = {"---": ":", "+++": "="}
+
+def parse_scalar(raw):
+    value = raw.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    if value.startswith("[") and value.endswith("]"):
+        return [parse_scalar(item) for item in value[1:-1].split(",") if item.strip()]
+    lowered = value.lower()
+    if lowered in ("true", "yes", "on"):
+        return True
+    if lowered in ("false", "no", "off"):
+        return False
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+def parse_front_matter(lines, separator):
+    meta = {}
+    key = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        # YAML block lists: "tags:" followed by "- item" lines
+        if stripped.startswith("- ") and key is not None and isinstance(meta[key], list):
+            meta[key].append(parse_scalar(stripped[2:]))
+            continue
+        name, found, raw = stripped.partition(separator)
+        if not found:
+            raise ValueError(f"Invalid front matter line: {stripped}")
+        key = name.strip().lower()
+        meta[key] = parse_scalar(raw) if raw.strip() else []
+    return normalize(meta)
+
+def normalize(meta):
+    # The fields the build relies on get fixed types; anything else is kept as parsed
+    for key in ("title", "date", "template"):
+        if key in meta:
+            if meta[key] in ("", []):
+                del meta[key]
+            else:
+                meta[key] = str(meta[key])
+    tags = meta.get("tags", [])
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    elif not isinstance(tags, list):
+        tags = [tags]
+    meta["tags"] = [str(tag).strip() for tag in tags if str(tag).strip()]
+    meta["draft"] = meta.get("draft") is True
+    return meta
+
+def front_matter_lines(lines):
+    # Returns (meta, header line count); a document without a closed fence has no front matter
+    lines = iter(lines)
+    # The fence must open the document: split_front_matter and read_front_matter both rely on
+    # this, so an indented " ---" is page content on every path
+    first = next(lines, "").rstrip()
+    if first not in FENCES:
+        return normalize({}), 0
+    header = []
+    for line in lines:
+        if line.strip() == first:
+            try:
+                return parse_front_matter(header, FENCES[first]), len(header) + 2
+            except ValueError:
+                # Not a header after all, e.g. a document opening with a "---" rule
+                return normalize({}), 0
+        header.append(line)
+    return normalize({}), 0
+
+def split_front_matter(markdown):
+    if not markdown.startswith(tuple(FENCES)):
+        return normalize({}), markdown
+    lines = markdown.split("\n")
+    meta, header_lines = front_matter_lines(lines)
+    if not header_lines:
+        return meta, markdown
+    return meta, "\n".join(lines[header_lines:])
+
+def read_front_matter(path):
+    # Reads only the header, so drafts and the site index never touch the page body
+    with open(path, 'r') as f:
+        meta, header_lines = front_matter_lines(f)
+    return meta, header_lines
+
+def front_matter_template(meta, page_path, default_template):
+    # A front matter template is relative to the page, like page.template.html next to it
+    template = meta.get("template")
+    if not template:
+        return default_template
+    return os.path.normpath(os.path.join(os.path.dirname(page_path), template))
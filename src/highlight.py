@@ -0,0 +1,218 @@
+import hashlib
+import html
+import re
+import threading
+from collections import OrderedDict
+
+from htmlnode import LeafNode
+
+# Token classes follow Pygments' short names, so any Pygments stylesheet colours the output
+HIGHLIGHT_CACHE_SIZE = 1024
+
+def words(*names):
+    return r"\b(?:" + "|".join(names) + r")\b"
+
+DOUBLE_QUOTED = r'"(?:\\.|[^"\\\n])*"'
+SINGLE_QUOTED = r"'(?:\\.|[^'\\\n])*'"
+# A single character, so Rust lifetimes and generics like <'a> aren't read as strings
+CHAR_LITERAL = r"'(?:\\(?:u\{[0-9a-fA-F]+\}|x[0-9a-fA-F]{2}|.)|[^'\\\n])'"
+NUMBER = r"\b(?:0[xX][0-9a-fA-F_]+|0[oObB][0-7_]+|\d[\d_]*(?:\.\d[\d_]*)?(?:[eE][+-]?\d+)?)[jJlLuUfF]?\b"
+C_COMMENT = r"//[^\n]*|/\*[\s\S]*?\*/"
+
+def c_family(keywords, constants, builtins=(), extra=(), single_quoted=CHAR_LITERAL):
+    return [
+        ("c", C_COMMENT),
+        *extra,
+        ("s", DOUBLE_QUOTED),
+        ("s", single_quoted),
+        ("kc", words(*constants)),
+        ("k", words(*keywords)),
+        *([("nb", words(*builtins))] if builtins else []),
+        ("m", NUMBER),
+    ]
+
+LANGUAGES = {
+    "python": [
+        ("c", r"#[^\n]*"),
+        ("s", r"[rRbBfFuU]{0,2}(?:\"\"\"[\s\S]*?\"\"\"|'''[\s\S]*?''')"),
+        ("s", r"[rRbBfFuU]{0,2}(?:" + DOUBLE_QUOTED + "|" + SINGLE_QUOTED + ")"),
+        ("nd", r"@[\w.]+"),
+        ("kc", words("True", "False", "None")),
+        ("k", words("and", "as", "assert", "async", "await", "break", "class", "continue", "def", "del",
+                    "elif", "else", "except", "finally", "for", "from", "global", "if", "import", "in", "is",
+                    "lambda", "nonlocal", "not", "or", "pass", "raise", "return", "try", "while", "with",
+                    "yield")),
+        ("nb", words("abs", "all", "any", "bool", "bytes", "dict", "enumerate", "filter", "float", "int",
+                     "isinstance", "len", "list", "map", "max", "min", "open", "print", "range", "repr",
+                     "self", "set", "sorted", "str", "sum", "super", "tuple", "type", "zip")),
+        ("m", NUMBER),
+    ],
+    "javascript": c_family(
+        ("async", "await", "break", "case", "catch", "class", "const", "continue", "default", "delete", "do",
+         "else", "export", "extends", "finally", "for", "from", "function", "if", "import", "in", "instanceof",
+         "interface", "let", "new", "of", "return", "static", "switch", "throw", "try", "type", "typeof",
+         "var", "void", "while", "yield"),
+        ("true", "false", "null", "undefined", "this", "NaN", "Infinity"),
+        ("Array", "JSON", "Math", "Object", "Promise", "String", "Number", "console", "document", "window"),
+        extra=[("s", r"`(?:\\.|[^`\\])*`")],
+        single_quoted=SINGLE_QUOTED,
+    ),
+    "c": c_family(
+        ("auto", "break", "case", "char", "class", "const", "continue", "default", "delete", "do", "double",
+         "else", "enum", "extern", "float", "for", "goto", "if", "inline", "int", "long", "namespace", "new",
+         "private", "protected", "public", "register", "return", "short", "signed", "sizeof", "static",
+         "struct", "switch", "template", "typedef", "typename", "union", "unsigned", "using", "virtual",
+         "void", "volatile", "while"),
+        ("true", "false", "NULL", "nullptr", "this"),
+        extra=[("cp", r"^[ \t]*#[^\n]*")],
+    ),
+    "java": c_family(
+        ("abstract", "boolean", "break", "byte", "case", "catch", "char", "class", "continue", "default",
+         "do", "double", "else", "enum", "extends", "final", "finally", "float", "for", "if", "implements",
+         "import", "instanceof", "int", "interface", "long", "new", "package", "private", "protected",
+         "public", "return", "short", "static", "super", "switch", "synchronized", "throw", "throws", "try",
+         "var", "void", "while"),
+        ("true", "false", "null", "this"),
+        extra=[("nd", r"@\w+")],
+    ),
+    "go": c_family(
+        ("break", "case", "chan", "const", "continue", "default", "defer", "else", "fallthrough", "for",
+         "func", "go", "goto", "if", "import", "interface", "map", "package", "range", "return", "select",
+         "struct", "switch", "type", "var"),
+        ("true", "false", "nil", "iota"),
+        ("append", "cap", "close", "delete", "error", "len", "make", "new", "panic", "print", "println",
+         "recover", "string", "int", "bool", "byte", "float64", "rune"),
+        extra=[("s", r"`[^`]*`")],
+    ),
+    "rust": c_family(
+        ("as", "async", "await", "break", "const", "continue", "crate", "dyn", "else", "enum", "extern", "fn",
+         "for", "if", "impl", "in", "let", "loop", "match", "mod", "move", "mut", "pub", "ref", "return",
+         "static", "struct", "trait", "type", "unsafe", "use", "where", "while"),
+        ("true", "false", "self", "Self", "None", "Some", "Ok", "Err"),
+        extra=[("nf", r"\b\w+!")],
+    ),
+    "bash": [
+        ("c", r"(?<![\w$])#[^\n]*"),
+        ("s", DOUBLE_QUOTED),
+        ("s", SINGLE_QUOTED),
+        ("nv", r"\$(?:\{[^}\n]*\}|\w+|[@#?$!*-])"),
+        ("k", words("case", "do", "done", "elif", "else", "esac", "fi", "for", "function", "if", "in",
+                    "return", "select", "then", "until", "while")),
+        ("nb", words("alias", "cd", "echo", "eval", "exec", "exit", "export", "local", "printf", "read",
+                     "set", "shift", "source", "test", "unset")),
+        ("m", r"\b\d+\b"),
+    ],
+    "json": [
+        ("nt", DOUBLE_QUOTED + r"(?=\s*:)"),
+        ("s", DOUBLE_QUOTED),
+        ("kc", words("true", "false", "null")),
+        ("m", r"-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b"),
+    ],
+    "css": [
+        ("c", r"/\*[\s\S]*?\*/"),
+        ("s", DOUBLE_QUOTED),
+        ("s", SINGLE_QUOTED),
+        ("k", r"@[\w-]+"),
+        ("nt", r"[\w-]+(?=\s*:[^;{}]*(?:;|}|$))"),
+        ("m", r"#[0-9a-fA-F]{3,8}\b|-?\b\d+(?:\.\d+)?(?:%|[a-zA-Z]+)?"),
+    ],
+    "html": [
+        ("c", r"<!--[\s\S]*?-->"),
+        ("cp", r"<![^>]*>"),
+        ("nt", r"</?[\w-]+|/?>"),
+        ("na", r"\b[\w-]+(?==)"),
+        ("s", DOUBLE_QUOTED),
+        ("s", SINGLE_QUOTED),
+    ],
+}
+
+ALIASES = {
+    "py": "python", "python3": "python", "js": "javascript", "jsx": "javascript", "ts": "javascript",
+    "typescript": "javascript", "tsx": "javascript", "cpp": "c", "c++": "c", "h": "c", "hpp": "c",
+    "cs": "java", "csharp": "java", "kotlin": "java", "golang": "go", "rs": "rust", "sh": "bash",
+    "shell": "bash", "zsh": "bash", "console": "bash", "xml": "html", "svg": "html",
+}
+
+def compile_lexer(rules):
+    # One alternation per language; the matching group's index gives the token class
+    pattern = "|".join(f"(?P<t{i}>{rule})" for i, (_, rule) in enumerate(rules))
+    return re.compile(pattern, re.MULTILINE), {f"t{i}": token_class for i, (token_class, _) in enumerate(rules)}
+
+# Compiled on first use, so a build only pays for the languages its pages contain
+_lexers = {}
+
+def get_lexer(name):
+    lexer = _lexers.get(name)
+    if lexer is None:
+        lexer = _lexers[name] = compile_lexer(LANGUAGES[name])
+    return lexer
+
+def lexer_name(language):
+    language = language.lower()
+    language = ALIASES.get(language, language)
+    return language if language in LANGUAGES else None
+
+def tokenize(language, code):
+    pattern, classes = get_lexer(language)
+    position = 0
+    for match in pattern.finditer(code):
+        if match.start() > position:
+            yield None, code[position:match.start()]
+        yield classes[match.lastgroup], match.group()
+        position = match.end()
+    if position < len(code):
+        yield None, code[position:]
+
+def escape(text):
+    # Leaves are written as they are, so markup in html/xml code must not reach the page raw
+    return html.escape(text, quote=False)
+
+def highlight_nodes(language, code):
+    nodes = []
+    for token_class, text in tokenize(language, code):
+        if token_class is None:
+            nodes.append(LeafNode(None, escape(text)))
+        else:
+            nodes.append(LeafNode("span", escape(text), {"class": token_class}))
+    return nodes or [LeafNode(None, escape(code))]
+
+class HighlightCache:
+    def __init__(self, max_entries=HIGHLIGHT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def highlight(self, language, code):
+        # Keyed by a digest so repeated snippets don't keep every code string alive twice
+        key = (language, hashlib.sha1(code.encode("utf-8")).digest())
+        with self.lock:
+            nodes = self.entries.get(key)
+            if nodes is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return list(nodes)
+            self.misses += 1
+
+        nodes = tuple(highlight_nodes(language, code))
+        with self.lock:
+            self.entries[key] = nodes
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return list(nodes)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+highlight_cache = HighlightCache()
+
+def highlight(language, code):
+    # Returns the code block's children; unknown languages come back as plain text
+    name = lexer_name(language)
+    if name is None:
+        return [LeafNode(None, escape(code))]
+    return highlight_cache.highlight(name, code)
@@ -1,6 +1,15 @@
+import sys
+from types import MappingProxyType
+
+# Shared, immutable stand-ins so leaves don't each allocate an empty list and dict
+EMPTY_CHILDREN = ()
+EMPTY_PROPS = MappingProxyType({})
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag, value, children, props=None):
-        self.tag = tag
+        self.tag = sys.intern(tag) if type(tag) is str else tag
         self.value = value
         self.children = children
         self.props = props if props is not None else {}
@@ -16,7 +25,7 @@ class HTMLNode:
         )
 
     def __repr__(self):
-        return f"HTMLNode(tag='{self.tag}', value='{self.value}', children={self.children}, props={self.props})"
+        return f"HTMLNode(tag='{self.tag}', value='{self.value}', children={self.children}, props={dict(self.props)})"
 
     def render(self):
         return f"<{self.tag}>{self.value}</{self.children}>"
@@ -24,14 +33,21 @@ class HTMLNode:
     def to_html(self):
         raise NotImplementedError("This method must be implemented by a subclass")
 
+    def emit_html(self, write):
+        raise NotImplementedError("This method must be implemented by a subclass")
+
+    def write_html(self, fp):
+        # Streams the tree into fp without building intermediate subtree strings
+        self.emit_html(fp.write)
+
     def props_to_html(self):
         return " ".join([f"{key}='{value}'" for key, value in self.props.items()])
     
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
-        if props is None:
-            props = {}
-        super().__init__(tag, value, [], props)
+        super().__init__(tag, value, EMPTY_CHILDREN, props or EMPTY_PROPS)
 
     def __eq__(self, other):
         if not isinstance(other, LeafNode):
@@ -60,11 +76,16 @@ class LeafNode(HTMLNode):
         else:
             return f"<{self.tag}>{self.value}</{self.tag}>"
 
+    def emit_html(self, write):
+        write(self.to_html())
+
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         if not children:
             raise ValueError("Must have children nodes.")
-        super().__init__(tag, None, children, props or {})
+        super().__init__(tag, None, children, props or EMPTY_PROPS)
 
     def __eq__(self, other):
         if not isinstance(other, ParentNode):
@@ -72,42 +93,56 @@ class ParentNode(HTMLNode):
         return super().__eq__(other)
 
     def __repr__(self):
-        return f"ParentNode(tag='{self.tag}', children={self.children}, props={self.props})"
+        return f"ParentNode(tag='{self.tag}', children={self.children}, props={dict(self.props)})"
 
     def to_html(self):
+        # Collect every chunk once and join at the end instead of concatenating per level
+        parts = []
+        self.emit_html(parts.append)
+        return "".join(parts)
+
+    def emit_html(self, write):
         if not self.tag:
             raise ValueError("ParentNode must have a tag.")
-        
-        # Recursively render all children using their `to_html` methods
-        children_html = "".join([child.to_html() for child in self.children])
-        
+
         # Render the props
         props_html = self.props_to_html()
-        
-        # Render the tag with the children
+
+        # Render the tag, then stream each child in place
         if props_html:
-            return f"<{self.tag} {props_html}>{children_html}</{self.tag}>"
+            write(f"<{self.tag} {props_html}>")
         else:
-            return f"<{self.tag}>{children_html}</{self.tag}>"
+            write(f"<{self.tag}>")
+        for child in self.children:
+            child.emit_html(write)
+        write(f"</{self.tag}>")
+
+def make_leaf(tag, value, props=EMPTY_PROPS):
+    # Same node as LeafNode(tag, value, props) without the __init__ chain, for the per-node
+    # converters below; tag must be None or already interned (string literals are)
+    node = LeafNode.__new__(LeafNode)
+    node.tag = tag
+    node.value = value
+    node.children = EMPTY_CHILDREN
+    node.props = props
+    return node
+
+# Text type -> converter(text, url), shared by TextNode conversion and the dict API below
+TEXT_TYPE_CONVERTERS = {
+    "text": lambda text, url: make_leaf(None, text),
+    "bold": lambda text, url: make_leaf("b", text),
+    "italic": lambda text, url: make_leaf("i", text),
+    "code": lambda text, url: make_leaf("code", text),
+    "link": lambda text, url: make_leaf("a", text, {"href": url}),
+    "image": lambda text, url: make_leaf("img", "", {"src": url, "alt": text}),
+}
 
 def text_node_to_html_node(text_node):
     node_type = text_node.get("type")
-    text = text_node.get("text", "")
-    
-    if node_type == "text":
-        return LeafNode(None, text)
-    elif node_type == "bold":
-        return LeafNode("b", text)
-    elif node_type == "italic":
-        return LeafNode("i", text)
-    elif node_type == "code":
-        return LeafNode("code", text)
-    elif node_type == "link":
-        url = text_node.get("url")
-        return LeafNode("a", text, {"href": url})
-    elif node_type == "image":
-        src = text_node.get("src")
-        alt = text_node.get("alt")
-        return LeafNode("img", "", {"src": src, "alt": alt})
-    else:
-        raise ValueError(f"Unknown TextNode type: {node_type}")
\ No newline at end of file
+    converter = TEXT_TYPE_CONVERTERS.get(node_type)
+    if converter is None:
+        raise ValueError(f"Unknown TextNode type: {node_type}")
+    # Image dicts carry their URL and text as "src" and "alt"
+    if node_type == "image":
+        return converter(text_node.get("alt"), text_node.get("src"))
+    return converter(text_node.get("text", ""), text_node.get("url"))
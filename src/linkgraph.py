@@ -0,0 +1,87 @@
+import json
+import os
+from urllib.parse import unquote, urljoin, urlsplit
+
+def output_url(path, public_dir):
+    return "/" + os.path.relpath(path, public_dir).replace(os.sep, "/")
+
+def site_paths(public_dir):
+    paths = set()
+    for dir_path, _, filenames in os.walk(public_dir):
+        for name in filenames:
+            paths.add(output_url(os.path.join(dir_path, name), public_dir))
+    return paths
+
+def resolve_link(page_url, link):
+    parts = urlsplit(link)
+    # External URLs (http:, mailto:, //host) and same-page fragments aren't part of the site graph
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+    return unquote(urljoin(page_url, parts.path))
+
+def candidate_paths(path):
+    if path.endswith("/"):
+        return (path + "index.html",)
+    if os.path.splitext(path)[1]:
+        return (path,)
+    return (path, path + ".html", path + "/index.html")
+
+class LinkGraph:
+    def __init__(self):
+        self.outbound = {}
+        self.inbound = {}
+
+    @classmethod
+    def from_results(cls, results, public_dir):
+        graph = cls()
+        for result in results:
+            graph.add_page(output_url(result["output"], public_dir), result["hyperlinks"], result["images"])
+        return graph
+
+    def add_page(self, page_url, hyperlinks, images):
+        self.outbound[page_url] = {"links": list(hyperlinks), "images": list(images)}
+
+    def link_count(self):
+        return sum(len(entry["links"]) + len(entry["images"]) for entry in self.outbound.values())
+
+    def resolve_target(self, page_url, link, existing):
+        target = resolve_link(page_url, link)
+        if target is None:
+            return None, True
+        for candidate in candidate_paths(target):
+            if candidate in existing:
+                return candidate, True
+        return target, False
+
+    def broken(self, existing):
+        # One pass over every link; lookups are set/dict hits so this stays linear in the link count
+        broken_links = []
+        missing_images = []
+        inbound = {}
+        for page_url, entry in self.outbound.items():
+            for kind, links, failures in (("links", entry["links"], broken_links),
+                                          ("images", entry["images"], missing_images)):
+                for link in links:
+                    target, found = self.resolve_target(page_url, link, existing)
+                    if target is None:
+                        continue
+                    inbound.setdefault(target, []).append(page_url)
+                    if not found:
+                        failures.append((page_url, link))
+        self.inbound = inbound
+        return broken_links, missing_images
+
+    def backlinks(self, target_url):
+        return self.inbound.get(target_url, [])
+
+    def to_json(self):
+        return {
+            "pages": {
+                page_url: dict(entry, backlinks=sorted(set(self.backlinks(page_url))))
+                for page_url, entry in self.outbound.items()
+            },
+        }
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_json(), f, indent=1, sort_keys=True)
@@ -1,109 +1,828 @@
+import argparse
+import functools
+import itertools
+import logging
+import mmap
 import os
-import shutil
-import re
+import sys
+import time
 from pathlib import Path
-from textnode import markdown_to_html_node
+from textnode import INLINE_CACHE_SIZE, PARSER_VERSION, inline_cache, iter_html_nodes, markdown_to_html_node
 from htmlnode import LeafNode, ParentNode
+from astcache import DEFAULT_MAX_BYTES, ASTCache
+from assets import CHECK_MODES, SYNC_MODES, format_stats, is_up_to_date, list_files, remove_empty_parents, sync_directory, sync_file
+from buildlog import configure_logging, logger, stats
+from frontmatter import front_matter_template, read_front_matter, split_front_matter
+from manifest import file_record, hash_file, load_manifest, save_manifest
+from output import remove_stale_files, replace_if_changed, temp_path, write_if_changed
+from patterns import TITLE_BYTES_PATTERN, TITLE_PATTERN
+from siteindex import SiteIndex, listing_pages, page_entry
+from template import directory_template, load_template, page_template
 
-def delete_directory_contents(directory):
-    for item in os.listdir(directory):
-        item_path = os.path.join(directory, item)
-        if os.path.isfile(item_path):
-            os.unlink(item_path)
-        elif os.path.isdir(item_path):
-            shutil.rmtree(item_path)
-    print(f"Deleted contents of {directory}")
-
-def copy_directory(src, dst):
-    if not os.path.exists(dst):
-        os.makedirs(dst)
-    
-    for item in os.listdir(src):
-        s = os.path.join(src, item)
-        d = os.path.join(dst, item)
-        
-        if os.path.isfile(s):
-            shutil.copy2(s, d)
-            print(f"Copied file: {s} to {d}")
-        else:
-            copy_directory(s, d)
-            print(f"Copied directory: {s} to {d}")
+OUTPUT_BUFFER_SIZE = 1 << 16
+STREAM_THRESHOLD = 32 << 20
+
+ast_cache = None
+stream_threshold = STREAM_THRESHOLD
+collect_text = False
+minify_output = False
+
+def configure_ast_cache(directory, max_bytes=DEFAULT_MAX_BYTES):
+    # Also the worker initializer, so every process shares the same on-disk cache
+    global ast_cache
+    ast_cache = ASTCache(directory, max_bytes) if directory else None
+    return ast_cache
+
+def configure_streaming(threshold):
+    # Sources of at least this many bytes are rendered block by block; 0 turns streaming off
+    global stream_threshold
+    stream_threshold = threshold
+
+def configure_inline_cache(max_entries):
+    # The cache itself lives on across builds in one process; only the counters start over
+    inline_cache.resize(max_entries)
+    inline_cache.hits = 0
+    inline_cache.misses = 0
+    return inline_cache
+
+def configure_text_collection(enabled):
+    # Page text is only gathered while rendering when the feed or search index needs it
+    global collect_text
+    collect_text = enabled
+
+def configure_minify(enabled):
+    # Pages are minified as they are written, so streamed and in-memory pages come out the same
+    global minify_output
+    minify_output = enabled
+
+def init_worker(cache_args, threshold, inline_cache_size=INLINE_CACHE_SIZE, text=False, minify=False):
+    configure_ast_cache(*cache_args)
+    configure_streaming(threshold)
+    configure_inline_cache(inline_cache_size)
+    configure_text_collection(text)
+    configure_minify(minify)
+
+def worker_initargs():
+    cache_args = (ast_cache.directory, ast_cache.max_bytes) if ast_cache else (None,)
+    return cache_args, stream_threshold, inline_cache.max_entries, collect_text, minify_output
+
+def cache_counters():
+    # Workers send back how much their caches were hit while rendering, so the parent's
+    # summary covers the whole build
+    ast_counters = (ast_cache.hits, ast_cache.misses) if ast_cache else (0, 0)
+    return ast_counters + (inline_cache.hits, inline_cache.misses)
+
+def counters_since(before):
+    return tuple(now - then for now, then in zip(cache_counters(), before))
+
+def merge_counters(delta):
+    if ast_cache:
+        ast_cache.hits += delta[0]
+        ast_cache.misses += delta[1]
+    inline_cache.hits += delta[2]
+    inline_cache.misses += delta[3]
 
 def extract_title(markdown):
-    match = re.search(r'^\s*#\s*(.+)$', markdown, re.MULTILINE)
+    match = TITLE_PATTERN.search(markdown)
     if match:
         return match.group(1).strip()
     else:
         raise ValueError("No h1 header found in the markdown content")
 
-def generate_page(from_path, template_path, dest_path):
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+def scan_title(path, skip_lines=0):
+    # Search the mapped file so a huge source is never read into memory just for its title
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        start = 0
+        for _ in range(skip_lines):
+            start = mapped.find(b"\n", start) + 1
+        match = TITLE_BYTES_PATTERN.search(mapped, start)
+        title = match.group(1) if match else None
+        del match
+    if title is None:
+        raise ValueError("No h1 header found in the markdown content")
+    return title.decode("utf-8").strip()
+
+def extract_links(html_node):
+    # Read link and image targets straight from the node tree, in document order
+    hyperlinks = []
+    images = []
+    stack = [html_node]
+    while stack:
+        node = stack.pop()
+        if node.tag == "img":
+            src = node.props.get("src")
+            if src:
+                images.append(src)
+        else:
+            href = node.props.get("href")
+            if href:
+                hyperlinks.append(href)
+        if node.children:
+            stack.extend(reversed(node.children))
+    return hyperlinks, images
 
-    with open(from_path, 'r') as f:
-        markdown_content = f.read()
+def extract_hyperlinks(html_node):
+    return extract_links(html_node)[0]
 
-    with open(template_path, 'r') as f:
-        template_content = f.read()
+def parse_markdown(markdown_content):
+    if ast_cache is None:
+        return markdown_to_html_node(markdown_content)
 
-    html_node = markdown_to_html_node(markdown_content)
-    
+    key = ast_cache.key(markdown_content)
+    html_node = ast_cache.get(key)
     if html_node is None:
-        html_content = ""
+        html_node = markdown_to_html_node(markdown_content)
+        ast_cache.put(key, html_node)
+    return html_node
+
+def read_source(path):
+    with open(path, 'r') as f:
+        return f.read()
+
+def write_page(dest_path, template, values):
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+
+    # Stream the page into a buffered temp file instead of materialising the whole document,
+    # then only swap it in when it differs from the current output
+    tmp_path = temp_path(dest_path)
+    try:
+        with open(tmp_path, 'w', buffering=OUTPUT_BUFFER_SIZE) as f:
+            template.write(f, values)
+    except Exception:
+        # Don't leave a half-written page behind
+        os.unlink(tmp_path)
+        raise
+    return replace_if_changed(tmp_path, dest_path)
+
+def output_template(template_path):
+    template = load_template(template_path)
+    return template.minified() if minify_output else template
+
+def minify_content(html):
+    if not minify_output:
+        return html
+    from minify import minify_html
+    return minify_html(html)
+
+def content_writer(html_node):
+    # Minification works on text, so a minified page renders its content to a string first
+    return minify_content(html_node.to_html()) if minify_output else html_node.write_html
+
+def stream_page(from_path, template_path, dest_path):
+    template = output_template(template_path)
+    meta, header_lines = read_front_matter(from_path)
+    title = meta.get("title") or scan_title(from_path, header_lines)
+    hyperlinks, images = [], []
+    collector = None
+    if collect_text:
+        from artifacts import TextCollector
+        collector = TextCollector()
+
+    def write_content(fp):
+        # Each top-level block is written and dropped as soon as it closes, so memory
+        # stays bounded by the largest block. Matches ParentNode("div", ...).write_html.
+        fp.write("<div>")
+        with open(from_path, 'r', buffering=OUTPUT_BUFFER_SIZE) as source:
+            for html_node in iter_html_nodes(itertools.islice(source, header_lines, None)):
+                if minify_output:
+                    fp.write(minify_content(html_node.to_html()))
+                else:
+                    html_node.write_html(fp)
+                block_links, block_images = extract_links(html_node)
+                hyperlinks.extend(block_links)
+                images.extend(block_images)
+                if collector is not None:
+                    collector.add(html_node)
+        fp.write("</div>")
+
+    changed = write_page(dest_path, template, {"Title": title, "Content": write_content})
+
+    return hyperlinks, images, changed, title, collector.result() if collector is not None else None
+
+def collect_page_text(html_node):
+    if not collect_text or html_node is None:
+        return None
+    from artifacts import page_text
+    return page_text(html_node)
+
+def render_page(from_path, template_path, dest_path):
+    # Very large sources skip the AST cache: caching them would need the whole tree in memory
+    if stream_threshold and os.path.getsize(from_path) >= stream_threshold:
+        return stream_page(from_path, template_path, dest_path)
+
+    meta, markdown_content = split_front_matter(read_source(from_path))
+
+    template = output_template(template_path)
+
+    html_node = parse_markdown(markdown_content)
+
+    if html_node is None:
+        write_content = ""
+        hyperlinks, images = [], []
     elif isinstance(html_node, (LeafNode, ParentNode)):
-        html_content = html_node.to_html()
+        write_content = content_writer(html_node)
+        hyperlinks, images = extract_links(html_node)
     else:
         raise TypeError(f"Expected LeafNode or ParentNode, got {type(html_node)}")
 
-    # Extract hyperlinks using regular expression
-    hyperlinks = re.findall(r'href=[\'"]?([^\'" >]+)', html_content)
-
-    title = extract_title(markdown_content)
+    # A front matter title saves the scan for the first heading
+    title = meta.get("title") or extract_title(markdown_content)
 
-    full_html = template_content.replace("{{ Title }}", title).replace("{{ Content }}", html_content)
+    changed = write_page(dest_path, template, {"Title": title, "Content": write_content})
 
-    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    return hyperlinks, images, changed, title, collect_page_text(html_node)
 
-    with open(dest_path, 'w') as f:
-        f.write(full_html)
-    print(f"Written HTML content to {dest_path}")
+def report_page(dest_path, hyperlinks):
+    logger.debug(f"Written HTML content to {dest_path}", extra={"fields": {"output": dest_path, "links": hyperlinks}})
 
-    # Print extracted hyperlinks
-    print("Extracted hyperlinks:")
-    for link in hyperlinks:
-        print(link)
+    # Per-link lines only in verbose mode
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Extracted hyperlinks:")
+        for link in hyperlinks:
+            logger.debug(link)
 
+def generate_page(from_path, template_path, dest_path):
+    logger.debug(f"Generating page from {from_path} to {dest_path} using {template_path}")
+    hyperlinks = render_page(from_path, template_path, dest_path)[0]
+    report_page(dest_path, hyperlinks)
     return hyperlinks
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path):
-    for entry in os.listdir(dir_path_content):
+def count_page(result):
+    stats.pages_rendered += 1
+    stats.links_found += len(result["hyperlinks"]) + len(result["images"])
+    if not result["changed"]:
+        return
+    stats.pages_changed += 1
+    try:
+        stats.bytes_written += os.path.getsize(result["output"])
+    except OSError:
+        pass
+
+def page_result(from_path, dest_path, hyperlinks=(), images=(), changed=False, title=None, text=None, error=None):
+    return {"source": from_path, "output": dest_path, "hyperlinks": list(hyperlinks),
+            "images": list(images), "changed": changed, "title": title, "text": text, "error": error}
+
+def render_page_job(job):
+    # Runs in a worker process; failures are returned so the parent can report every page
+    from_path, template_path, dest_path = job
+    counters = cache_counters()
+    try:
+        result = page_result(from_path, dest_path, *render_page(from_path, template_path, dest_path))
+    except Exception as e:
+        result = page_result(from_path, dest_path, error=f"{type(e).__name__}: {e}")
+    result["cache_counters"] = counters_since(counters)
+    return result
+
+def render_pages(pages, jobs=1):
+    if jobs <= 1:
+        results = []
+        for from_path, template_path, dest_path in pages:
+            logger.debug(f"Generating page from {from_path} to {dest_path} using {template_path}")
+            hyperlinks, images, changed, title, text = render_page(from_path, template_path, dest_path)
+            report_page(dest_path, hyperlinks)
+            result = page_result(from_path, dest_path, hyperlinks, images, changed, title, text)
+            count_page(result)
+            results.append(result)
+        return results
+
+    # Only imported when needed: loading multiprocessing slows down every single-process run
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, len(pages) // (jobs * 4))
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=worker_initargs()) as executor:
+        for job, result in zip(pages, executor.map(render_page_job, pages, chunksize=chunksize)):
+            logger.debug(f"Generating page from {result['source']} to {result['output']} using {job[1]}")
+            if result["error"]:
+                logger.error(f"Failed to generate {result['source']}: {result['error']}")
+            else:
+                report_page(result["output"], result["hyperlinks"])
+                count_page(result)
+            merge_counters(result.pop("cache_counters"))
+            results.append(result)
+
+    failed = [result for result in results if result["error"]]
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(results)} pages failed to generate")
+    return results
+
+def discover_pages(dir_path_content, template_path, dest_dir_path):
+    template_path = directory_template(dir_path_content, template_path)
+    for entry in sorted(os.listdir(dir_path_content)):
         entry_path = os.path.join(dir_path_content, entry)
-        if os.path.isfile(entry_path) and entry.endswith('.md'):
-            relative_path = os.path.relpath(entry_path, dir_path_content)
-            dest_path = os.path.join(dest_dir_path, Path(relative_path).with_suffix('.html'))
-            generate_page(entry_path, template_path, dest_path)
-        elif os.path.isdir(entry_path):
-            subdir_dest_path = os.path.join(dest_dir_path, entry)
-            os.makedirs(subdir_dest_path, exist_ok=True)
-            generate_pages_recursive(entry_path, template_path, subdir_dest_path)
-
-def main():
-    public_dir = "public"
-    content_dir = "content"
-    template_path = "template.html"
-    
-    # Delete anything in the public directory
-    if os.path.exists(public_dir):
-        delete_directory_contents(public_dir)
+        if os.path.isdir(entry_path):
+            yield from discover_pages(entry_path, template_path, os.path.join(dest_dir_path, entry))
+        elif entry.endswith('.md'):
+            dest_path = os.path.join(dest_dir_path, Path(entry).with_suffix('.html'))
+            yield entry_path, page_template(entry_path, template_path), dest_path
+
+def index_pages(pages, dir_path_content, dest_dir_path, site_index, drafts=False):
+    # Only the front matter is read here: drafts are dropped before any parsing, and a
+    # front matter template replaces the one picked by directory
+    for from_path, template_path, dest_path in pages:
+        meta, _ = read_front_matter(from_path)
+        if meta["draft"] and not drafts:
+            logger.debug(f"Skipping draft {from_path}")
+            continue
+        entry = page_entry(meta, from_path, dest_path, dest_dir_path)
+        site_index.add(os.path.relpath(from_path, dir_path_content), entry)
+        yield from_path, front_matter_template(meta, from_path, template_path), dest_path
+
+def record_page_data(site_index, results, dir_path_content):
+    # Pages without a front matter title get the heading found while rendering, and the
+    # text gathered for the feed and search index is kept with the page's entry
+    for result in results:
+        key = os.path.relpath(result["source"], dir_path_content)
+        if result["title"]:
+            site_index.set_title(key, result["title"])
+        if result["text"]:
+            site_index.set_text(key, result["text"]["summary"], result["text"]["terms"])
+
+def generate_pages_parallel(dir_path_content, template_path, dest_dir_path, jobs, site_index=None, drafts=False):
+    site_index = site_index if site_index is not None else SiteIndex()
+    pages = list(index_pages(discover_pages(dir_path_content, template_path, dest_dir_path),
+                             dir_path_content, dest_dir_path, site_index, drafts))
+    results = render_pages(pages, jobs)
+    record_page_data(site_index, results, dir_path_content)
+    return results
+
+def read_page_source(job, _):
+    # Large sources are left for stream_page to read block by block in the render stage
+    if stream_threshold and os.path.getsize(job[0]) >= stream_threshold:
+        return None
+    return read_source(job[0])
+
+def render_source(job, markdown_content):
+    from_path, template_path, dest_path = job
+    counters = cache_counters()
+    if markdown_content is None:
+        # Streamed pages are written here, the write stage only passes them through
+        html = None
+        hyperlinks, images, changed, title, text = stream_page(from_path, template_path, dest_path)
     else:
-        os.makedirs(public_dir)
-    
-    # Copy all static files from static to public
-    copy_directory("static", public_dir)
+        meta, markdown_content = split_front_matter(markdown_content)
+        template = output_template(template_path)
+        html_node = parse_markdown(markdown_content)
+        hyperlinks, images = extract_links(html_node)
+        title = meta.get("title") or extract_title(markdown_content)
+        html = template.render({"Title": title, "Content": minify_content(html_node.to_html())})
+        changed = None
+        text = collect_page_text(html_node)
+    delta = counters_since(counters)
+    return html, hyperlinks, images, delta, changed, title, text
+
+def write_output(dest_path, html):
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    return write_if_changed(dest_path, html)
+
+def write_rendered(job, rendered):
+    html, hyperlinks, images, delta, changed, title, text = rendered
+    if html is not None:
+        changed = write_output(job[2], html)
+    return hyperlinks, images, delta, changed, title, text
+
+def discover_static(static_dir, public_dir):
+    # Yields each static file for the pipeline to copy alongside the page stages
+    if not os.path.isdir(static_dir):
+        return
+    for relative_path in list_files(static_dir):
+        yield os.path.join(static_dir, relative_path), os.path.join(public_dir, relative_path)
+
+def copy_static_file(paths, _, mode="copy", check="mtime", minify=False):
+    src_path, dest_path = paths
+    if is_up_to_date(src_path, dest_path, check, minify):
+        return "skipped"
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    return sync_file(src_path, dest_path, mode, minify)
+
+def build_pipelined(content_dir, static_dir, template_path, public_dir, jobs=1, asset_mode="copy",
+                    asset_check="mtime", io_workers=None, queue_size=None, site_index=None, drafts=False):
+    from concurrent.futures import ProcessPoolExecutor
+    from pipeline import Failed, run_build
+
+    site_index = site_index if site_index is not None else SiteIndex()
+    pages = index_pages(discover_pages(content_dir, template_path, public_dir), content_dir, public_dir,
+                        site_index, drafts)
+    files = discover_static(static_dir, public_dir)
+    copy = functools.partial(copy_static_file, mode=asset_mode, check=asset_check, minify=minify_output)
+
+    render_executor = None
+    if jobs > 1:
+        render_executor = ProcessPoolExecutor(max_workers=jobs, initializer=init_worker,
+                                              initargs=worker_initargs())
+    try:
+        finished_pages, finished_files = run_build(pages, read_page_source, render_source, write_rendered,
+                                                   files, copy, render_executor, jobs, io_workers, queue_size)
+    finally:
+        if render_executor is not None:
+            render_executor.shutdown()
+
+    sync_stats = {"copied": 0, "linked": 0, "skipped": 0, "removed": 0, "bytes": 0}
+    for (src_path, dest_path), outcome in finished_files:
+        if isinstance(outcome, Failed):
+            raise RuntimeError(f"Failed to copy {src_path} to {dest_path}: {outcome.error}")
+        sync_stats[outcome] += 1
+        if outcome != "skipped":
+            logger.debug(f"{outcome.capitalize()} file: {src_path} to {dest_path}")
+            sync_stats["bytes"] += os.path.getsize(src_path)
+    stats.files_copied += sync_stats["copied"] + sync_stats["linked"]
+    logger.info(f"Synced {static_dir} to {public_dir}: {format_stats(sync_stats)}")
+
+    # Stages finish out of order; report pages in discovery order
+    results = []
+    for (from_path, template_path, dest_path), outcome in sorted(finished_pages):
+        logger.debug(f"Generating page from {from_path} to {dest_path} using {template_path}")
+        if isinstance(outcome, Failed):
+            logger.error(f"Failed to generate {from_path}: {outcome.error}")
+            results.append(page_result(from_path, dest_path, error=outcome.error))
+            continue
+        hyperlinks, images, delta, changed, title, text = outcome
+        if render_executor is not None:
+            merge_counters(delta)
+        result = page_result(from_path, dest_path, hyperlinks, images, changed, title, text)
+        report_page(dest_path, hyperlinks)
+        count_page(result)
+        results.append(result)
+
+    failed = [result for result in results if result["error"]]
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(results)} pages failed to generate")
+    record_page_data(site_index, results, content_dir)
+    return results
+
+def remove_output(path, root):
+    if os.path.isfile(path):
+        os.unlink(path)
+        logger.debug(f"Removed stale output: {path}")
+
+    # Drop directories left empty by the removal, but never the output root itself
+    remove_empty_parents(path, root)
+
+def prune_outputs(old_records, new_records, root):
+    for key, record in old_records.items():
+        if key not in new_records:
+            remove_output(record["output"], root)
+
+def generate_pages_incremental(dir_path_content, template_path, dest_dir_path, manifest, jobs=1,
+                               site_index=None, previous_index=None, drafts=False):
+    template_hashes = {}
+    old_pages = manifest["pages"]
+    new_pages = {}
+    stale_pages = []
+    site_index = site_index if site_index is not None else SiteIndex()
+    previous_index = previous_index if previous_index is not None else SiteIndex()
+
+    for entry_path, page_template_path, dest_path in discover_pages(dir_path_content, template_path, dest_dir_path):
+        relative_path = os.path.relpath(entry_path, dir_path_content)
+        previous = old_pages.get(relative_path)
+        record = file_record(entry_path, previous)
+
+        # Unchanged sources reuse their index entry; the rest have their front matter read
+        entry = previous_index.get(relative_path) if previous and previous.get("hash") == record["hash"] else None
+        if entry is None:
+            meta, _ = read_front_matter(entry_path)
+            entry = page_entry(meta, entry_path, dest_path, dest_dir_path)
+        if entry["draft"] and not drafts:
+            logger.debug(f"Skipping draft {entry_path}")
+            continue
+        site_index.add(relative_path, entry)
+        page_template_path = front_matter_template(entry, entry_path, page_template_path)
+
+        if page_template_path not in template_hashes:
+            template_hashes[page_template_path] = hash_file(page_template_path)
+        template_hash = template_hashes[page_template_path]
+        record["template"] = template_hash
+        record["output"] = dest_path
+        # Parser and output option changes affect every page, like a template change does
+        record["parser"] = PARSER_VERSION
+        record["minify"] = minify_output
+
+        if (
+            previous is None
+            or previous.get("hash") != record["hash"]
+            or previous.get("template") != template_hash
+            or previous.get("output") != dest_path
+            or previous.get("parser") != PARSER_VERSION
+            or previous.get("minify", False) != minify_output
+            or not os.path.exists(dest_path)
+            or (collect_text and "terms" not in entry)
+        ):
+            stale_pages.append((entry_path, page_template_path, dest_path))
+        else:
+            # Unchanged pages keep the links recorded when they were last rendered
+            record["hyperlinks"] = previous.get("hyperlinks", [])
+            record["images"] = previous.get("images", [])
+        new_pages[relative_path] = record
+
+    rendered = render_pages(stale_pages, jobs)
+    for result in rendered:
+        record = new_pages[os.path.relpath(result["source"], dir_path_content)]
+        record["hyperlinks"] = result["hyperlinks"]
+        record["images"] = result["images"]
+    record_page_data(site_index, rendered, dir_path_content)
+
+    prune_outputs(old_pages, new_pages, dest_dir_path)
+    manifest["pages"] = new_pages
+    results = [page_result(os.path.join(dir_path_content, relative_path), record["output"],
+                           record["hyperlinks"], record["images"], title=site_index.get(relative_path)["title"])
+               for relative_path, record in new_pages.items()]
+    return len(stale_pages), results
+
+def sync_assets(static_dir, public_dir, manifest=None, mode="copy", check="mtime", workers=None):
+    previous = manifest["static"] if manifest is not None else ()
+    sync_stats, files = sync_directory(static_dir, public_dir, previous, mode, check, workers, minify_output)
+    if manifest is not None:
+        manifest["static"] = {relative_path: {"output": os.path.join(public_dir, relative_path)}
+                              for relative_path in files}
+    stats.files_copied += sync_stats["copied"] + sync_stats["linked"]
+    logger.info(f"Synced {static_dir} to {public_dir}: {format_stats(sync_stats)}")
+    return sync_stats
+
+def default_site_index_path(manifest_path):
+    return os.path.join(os.path.dirname(manifest_path), ".site_index.json")
+
+def write_listings(site_index, template_path, public_dir):
+    # Archive and tag pages come straight from the index, without touching any Markdown
+    template = output_template(template_path)
+    outputs = []
+    changed = 0
+    for dest_path, title, content_node in listing_pages(site_index, public_dir):
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        changed += write_page(dest_path, template, {"Title": title, "Content": content_writer(content_node)})
+        outputs.append(dest_path)
+    logger.info(f"Wrote {len(outputs)} listing pages ({changed} changed).")
+    return outputs
+
+def write_artifacts(site_index, public_dir, sitemap=False, feed=False, search_index=False, base_url=""):
+    # Built from the index the build just filled in, so nothing in public/ is read back
+    if not (sitemap or feed or search_index):
+        return []
+    from artifacts import feed_xml, search_index_json, sitemap_xml
+
+    artifacts = []
+    if sitemap:
+        artifacts.append(("sitemap.xml", sitemap_xml(site_index, base_url)))
+    if feed:
+        artifacts.append(("feed.xml", feed_xml(site_index, base_url)))
+    if search_index:
+        artifacts.append(("search-index.json", search_index_json(site_index)))
+    outputs = []
+    for name, text in artifacts:
+        output = os.path.join(public_dir, name)
+        changed = write_if_changed(output, text)
+        logger.debug(f"{'Wrote' if changed else 'Unchanged'} {output} ({len(text)} bytes)")
+        outputs.append(output)
+    logger.info(f"Wrote {', '.join(name for name, _ in artifacts)} for {len(site_index)} pages.")
+    return outputs
+
+def compress_outputs(paths, workers=None, stamps=None):
+    # Runs last, over pages, listings, artifacts and static files alike. Returns the siblings
+    # and the output stamps that let the next incremental run skip untouched outputs.
+    from compress import compress_files
+    siblings, written, extensions, stamps = compress_files(paths, workers, stamps)
+    logger.info(f"Compressed outputs to {', '.join(extensions)}: {written} of {len(siblings)} siblings written.")
+    return siblings, stamps
+
+def build_incremental(content_dir, static_dir, template_path, public_dir, manifest_path, jobs=1,
+                      asset_mode="copy", asset_check="mtime", asset_workers=None, site_index_path=None,
+                      drafts=False, listings=False, sitemap=False, feed=False, search_index=False, base_url="",
+                      compress=False, compress_workers=None):
+    manifest = load_manifest(manifest_path)
+    # Without a manifest (full builds drop it) nothing records what earlier builds left in public/
+    untracked = not any(manifest[section] for section in ("pages", "static", "generated", "compressed"))
+    configure_text_collection(feed or search_index)
+    site_index_path = site_index_path or default_site_index_path(manifest_path)
+    previous_index = SiteIndex.load(site_index_path)
+    site_index = SiteIndex()
+    os.makedirs(public_dir, exist_ok=True)
+
+    sync_stats = sync_assets(static_dir, public_dir, manifest, asset_mode, asset_check, asset_workers)
+    rendered, results = generate_pages_incremental(content_dir, template_path, public_dir, manifest, jobs,
+                                                   site_index, previous_index, drafts)
+
+    generated = write_listings(site_index, template_path, public_dir) if listings else []
+    generated += write_artifacts(site_index, public_dir, sitemap, feed, search_index, base_url)
+    for output in manifest["generated"]:
+        if output not in generated:
+            remove_output(output, public_dir)
+    manifest["generated"] = generated
+
+    compressed = []
+    stamps = {}
+    if compress:
+        outputs = [record["output"] for record in manifest["pages"].values()] + generated
+        outputs.extend(record["output"] for record in manifest["static"].values())
+        compressed, stamps = compress_outputs(outputs, compress_workers, manifest["compressed_outputs"])
+    current = set(compressed)
+    for sibling in manifest["compressed"]:
+        if sibling not in current:
+            remove_output(sibling, public_dir)
+    manifest["compressed"] = compressed
+    manifest["compressed_outputs"] = stamps
+
+    if untracked:
+        # Sweep public/ like a full build, so outputs of since-deleted sources don't linger
+        expected = [record["output"] for record in manifest["pages"].values()] + generated + compressed
+        expected.extend(record["output"] for record in manifest["static"].values())
+        removed = remove_stale_files(public_dir, expected)
+        logger.info(f"No manifest at {manifest_path}: {len(removed)} stale files removed.")
+
+    save_manifest(manifest_path, manifest)
+    site_index.save(site_index_path)
+    logger.info(f"Incremental build: {rendered} pages rendered, "
+                f"{sync_stats['copied'] + sync_stats['linked']} static files synced.")
+    return results
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the static site from Markdown content.")
+    parser.add_argument("command", nargs="?", choices=("build", "serve"), default="build",
+                        help="build the site once, or build it and serve public/")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only rebuild outputs whose sources or template changed")
+    parser.add_argument("--manifest", default=".build_manifest.json",
+                        help="path of the incremental build manifest")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of worker processes used to render pages")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="full builds: overlap discovery, reads, rendering, writes and static copies")
+    parser.add_argument("--io-workers", type=int, default=None,
+                        help="with --pipeline: threads used for reads, writes and copies")
+    parser.add_argument("--queue-size", type=int, default=None,
+                        help="with --pipeline: pages buffered between stages (default: 32)")
+    parser.add_argument("--asset-mode", choices=SYNC_MODES, default="copy",
+                        help="how static files are placed in the output directory")
+    parser.add_argument("--asset-check", choices=CHECK_MODES, default="mtime",
+                        help="skip static files whose size and mtime, or content hash, already match")
+    parser.add_argument("--asset-workers", type=int, default=None,
+                        help="number of threads used to sync static files")
+    parser.add_argument("--ast-cache", nargs="?", const=".cache/ast", metavar="DIR",
+                        help="cache parsed pages on disk, keyed by source hash (default DIR: .cache/ast)")
+    parser.add_argument("--ast-cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), metavar="MB",
+                        help="evict least recently used cache entries above this size")
+    parser.add_argument("--inline-cache-size", type=int, default=INLINE_CACHE_SIZE, metavar="N",
+                        help="reuse the nodes of up to N repeated paragraphs, list items and headings (0: off)")
+    parser.add_argument("--stream-threshold", type=int, default=STREAM_THRESHOLD >> 20, metavar="MB",
+                        help="render sources of at least this size block by block instead of in memory (0: never)")
+    parser.add_argument("--drafts", action="store_true",
+                        help="also render pages marked draft: true in their front matter")
+    parser.add_argument("--listings", action="store_true",
+                        help="write archive.html and tags/ pages from the site index")
+    parser.add_argument("--site-index", metavar="PATH",
+                        help="where the site index is saved (default: .site_index.json next to the manifest)")
+    parser.add_argument("--sitemap", action="store_true",
+                        help="write sitemap.xml from the site index (needs --base-url)")
+    parser.add_argument("--feed", action="store_true",
+                        help="write an Atom feed.xml of the newest pages (needs --base-url)")
+    parser.add_argument("--search-index", action="store_true",
+                        help="write search-index.json, an inverted index from terms to pages")
+    parser.add_argument("--base-url", default="", metavar="URL",
+                        help="absolute site URL used in the sitemap and feed, e.g. https://example.com")
+    parser.add_argument("--minify", action="store_true",
+                        help="minify HTML pages and static CSS; pre, code, script and style contents are kept")
+    parser.add_argument("--compress", action="store_true",
+                        help="write .gz siblings of text outputs, and .br/.zst where brotli or zstd is available")
+    parser.add_argument("--compress-workers", type=int, default=None, metavar="N",
+                        help="with --compress: threads used to compress outputs")
+    parser.add_argument("--check-links", action="store_true",
+                        help="report broken internal links and missing images after the build")
+    parser.add_argument("--link-graph", metavar="PATH",
+                        help="write the site link graph (outbound links and backlinks) as JSON")
+    parser.add_argument("--profile", nargs="?", const="build-trace.json", metavar="TRACE",
+                        help="time each build stage and page; write a Chrome trace (default: build-trace.json)")
+    parser.add_argument("--profile-top", type=int, default=10, metavar="N",
+                        help="with --profile: number of slowest pages to list")
+    parser.add_argument("-q", "--quiet", dest="verbosity", action="store_const", const="quiet", default="normal",
+                        help="only print warnings and errors")
+    parser.add_argument("-v", "--verbose", dest="verbosity", action="store_const", const="verbose",
+                        help="print a line per page, link and copied file")
+    parser.add_argument("--log-file", metavar="PATH",
+                        help="also write every log event as JSON lines to PATH")
+    parser.add_argument("--watch", action="store_true",
+                        help="with serve: rebuild changed files while serving")
+    parser.add_argument("--port", type=int, default=8888,
+                        help="with serve: port to listen on")
+    args = parser.parse_args(argv)
+    if (args.sitemap or args.feed) and not args.base_url:
+        parser.error("--sitemap and --feed need --base-url")
+    return args
+
+def check_links(results, public_dir, graph_path=None):
+    from linkgraph import LinkGraph, site_paths
+
+    graph = LinkGraph.from_results(results, public_dir)
+    broken_links, missing_images = graph.broken(site_paths(public_dir))
+    for page, link in broken_links:
+        logger.warning(f"Broken link in {page}: {link}")
+    for page, image in missing_images:
+        logger.warning(f"Missing image in {page}: {image}")
+    logger.info(f"Checked {graph.link_count()} links on {len(graph.outbound)} pages: "
+                f"{len(broken_links)} broken links, {len(missing_images)} missing images.")
+    if graph_path:
+        graph.save(graph_path)
+    return broken_links, missing_images
+
+def build_site(args, content_dir, static_dir, template_path, public_dir):
+    site_index_path = args.site_index or default_site_index_path(args.manifest)
+    if args.incremental:
+        results = build_incremental(content_dir, static_dir, template_path, public_dir, args.manifest, args.jobs,
+                                    args.asset_mode, args.asset_check, args.asset_workers, site_index_path,
+                                    args.drafts, args.listings, args.sitemap, args.feed, args.search_index,
+                                    args.base_url, args.compress, args.compress_workers)
+        if args.check_links or args.link_graph:
+            check_links(results, public_dir, args.link_graph)
+        logger.info("Static site generation complete.")
+        return results
+
+    # Outputs are rewritten in place, so unchanged pages keep their mtimes
+    os.makedirs(public_dir, exist_ok=True)
+
+    # A full build invalidates whatever the manifest recorded about public/; the next
+    # incremental run sweeps public/ the way this build does
+    if os.path.exists(args.manifest):
+        os.unlink(args.manifest)
     
-    # Generate pages recursively
-    generate_pages_recursive(content_dir, template_path, public_dir)
+    site_index = SiteIndex()
+    configure_text_collection(args.feed or args.search_index)
+    if args.pipeline:
+        # Static copies and page I/O overlap with rendering instead of running stage after stage
+        results = build_pipelined(content_dir, static_dir, template_path, public_dir, args.jobs, args.asset_mode,
+                                  args.asset_check, args.io_workers or args.asset_workers, args.queue_size,
+                                  site_index, args.drafts)
+    else:
+        # Copy all static files from static to public
+        sync_assets(static_dir, public_dir, mode=args.asset_mode, check=args.asset_check,
+                    workers=args.asset_workers)
+
+        # Generate pages, fanning them out over worker processes with --jobs
+        results = generate_pages_parallel(content_dir, template_path, public_dir, args.jobs, site_index, args.drafts)
+
+    site_index.save(site_index_path)
+    generated = write_listings(site_index, template_path, public_dir) if args.listings else []
+    generated += write_artifacts(site_index, public_dir, args.sitemap, args.feed, args.search_index, args.base_url)
+
+    # Drop whatever an earlier build left behind that this one didn't produce
+    expected = [result["output"] for result in results] + generated
+    if os.path.isdir(static_dir):
+        expected.extend(os.path.join(public_dir, relative_path) for relative_path in list_files(static_dir))
+    if args.compress:
+        expected += compress_outputs(expected, args.compress_workers)[0]
+    removed = remove_stale_files(public_dir, expected)
+    logger.info(f"{stats.pages_changed} of {len(results)} pages changed, {len(removed)} stale files removed.")
+
+    if args.check_links or args.link_graph:
+        check_links(results, public_dir, args.link_graph)
     
-    print("Static site generation complete.")
+    logger.info("Static site generation complete.")
+    return results
+
+def configure_build(args):
+    # Process-wide build state; returns the AST cache, if any, so the caller can report and trim it
+    stats.reset()
+    configure_streaming(args.stream_threshold * 1024 * 1024)
+    configure_inline_cache(args.inline_cache_size)
+    configure_minify(args.minify)
+    return configure_ast_cache(args.ast_cache, args.ast_cache_size * 1024 * 1024)
+
+def main(argv=None):
+    args = parse_args(argv)
+    public_dir = "public"
+    content_dir = "content"
+    static_dir = "static"
+    template_path = "template.html"
+
+    configure_logging(args.verbosity, args.log_file)
+    start = time.perf_counter()
+    cache = configure_build(args)
+
+    profiler = None
+    if args.profile:
+        # Instrumentation lives in this process and thread, so profiled builds render serially
+        args.jobs = 1
+        args.pipeline = False
+        from profiling import Profiler, instrument_build
+        profiler = Profiler()
+        instrument_build(profiler, sys.modules[__name__])
+    try:
+        build_site(args, content_dir, static_dir, template_path, public_dir)
+    finally:
+        if profiler is not None:
+            profiler.restore()
+    if profiler is not None:
+        logger.info(profiler.summary(args.profile_top))
+        profiler.save_trace(args.profile)
+        logger.info(f"Wrote trace to {args.profile}")
+    if cache is not None:
+        evicted = cache.trim()
+        logger.info(f"AST cache: {cache.hits} hits, {cache.misses} misses, {evicted} entries evicted.")
+    if inline_cache.max_entries > 0:
+        logger.info(f"Inline cache: {inline_cache.hits} hits, {inline_cache.misses} misses.")
+    logger.info(f"Build summary: {stats} in {time.perf_counter() - start:.2f}s",
+                extra={"fields": stats.as_dict()})
+
+    if args.command == "serve":
+        from devserver import serve
+        serve(content_dir, static_dir, template_path, public_dir, sys.modules[__name__], port=args.port,
+              watch=args.watch, drafts=args.drafts, asset_mode=args.asset_mode)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,49 @@
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 1
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def empty_manifest():
+    return {"version": MANIFEST_VERSION, "pages": {}, "static": {}, "generated": [], "compressed": [],
+            "compressed_outputs": {}}
+
+def load_manifest(path):
+    try:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return empty_manifest()
+
+    # An unreadable or outdated manifest just means a full rebuild
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return empty_manifest()
+    for section in ("pages", "static", "compressed_outputs"):
+        if not isinstance(manifest.get(section), dict):
+            manifest[section] = {}
+    for section in ("generated", "compressed"):
+        if not isinstance(manifest.get(section), list):
+            manifest[section] = []
+    return manifest
+
+def save_manifest(path, manifest):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def file_record(path, previous=None):
+    # Reuse the previous hash when size and mtime are unchanged to avoid re-reading the file
+    stat = os.stat(path)
+    if previous and previous.get("size") == stat.st_size and previous.get("mtime") == stat.st_mtime_ns:
+        source_hash = previous["hash"]
+    else:
+        source_hash = hash_file(path)
+    return {"hash": source_hash, "size": stat.st_size, "mtime": stat.st_mtime_ns}
@@ -1,11 +1,9 @@
-import re
+from patterns import MARKDOWN_IMAGE_PATTERN, MARKDOWN_LINK_PATTERN
 
 def extract_markdown_images(text):
-    pattern = r"!\[(.*?)\]\((.*?)\)"
-    matches = re.findall(pattern, text)
+    matches = MARKDOWN_IMAGE_PATTERN.findall(text)
     return matches
 
 def extract_markdown_links(text):
-    pattern = r"(?<!!)\[(.*?)\]\((.*?)\)"
-    matches = re.findall(pattern, text)
+    matches = MARKDOWN_LINK_PATTERN.findall(text)
     return matches
\ No newline at end of file
@@ -0,0 +1,70 @@
+from patterns import (CSS_PUNCTUATION_PATTERN, CSS_STRING_OR_COMMENT_PATTERN, HTML_TAG_NAME_PATTERN,
+                      HTML_TOKEN_PATTERN, WHITESPACE_PATTERN)
+
+# Whitespace between two of these never renders, so it can go entirely; anywhere else a
+# run of whitespace still collapses to one space
+BLOCK_TAGS = frozenset((
+    "!doctype", "html", "head", "body", "meta", "link", "title", "base", "script", "style", "noscript",
+    "div", "p", "ul", "ol", "li", "dl", "dt", "dd", "pre", "blockquote", "hr", "table", "thead", "tbody",
+    "tfoot", "tr", "td", "th", "article", "section", "header", "footer", "nav", "main", "aside", "figure",
+    "figcaption", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+))
+
+def tag_name(tag):
+    match = HTML_TAG_NAME_PATTERN.match(tag)
+    return match.group(1).lower() if match else None
+
+def minify_html(html):
+    # Only text between tags changes: tags and their attribute values are kept byte for byte,
+    # and pre, code, textarea, script and style elements are copied whole
+    pieces = []
+    for match in HTML_TOKEN_PATTERN.finditer(html):
+        if match.group("comment") is not None:
+            continue
+        text = match.group("text")
+        if text is None:
+            name = match.group("raw_tag") or tag_name(match.group())
+            pieces.append((False, match.group(), name.lower() if name else None))
+        elif pieces and pieces[-1][0]:
+            # Text on both sides of a dropped comment is one run
+            pieces[-1] = (True, pieces[-1][1] + text, None)
+        else:
+            pieces.append((True, text, None))
+
+    parts = []
+    for i, (is_text, value, _) in enumerate(pieces):
+        if not is_text:
+            parts.append(value)
+            continue
+        value = WHITESPACE_PATTERN.sub(" ", value)
+        if value == " ":
+            before = pieces[i - 1][2] if i > 0 else None
+            after = pieces[i + 1][2] if i + 1 < len(pieces) else None
+            if before in BLOCK_TAGS and after in BLOCK_TAGS:
+                continue
+        parts.append(value)
+    return "".join(parts)
+
+def minify_css_code(code):
+    # Space before a colon is a descendant combinator in selectors ("a :hover"), so only the
+    # space after one goes
+    code = WHITESPACE_PATTERN.sub(" ", code).replace(": ", ":")
+    return CSS_PUNCTUATION_PATTERN.sub(r"\1", code).replace(";}", "}")
+
+def minify_css(css):
+    # Strings are copied as they are; comments become whitespace so they still separate tokens
+    parts = []
+    position = 0
+    code = ""
+    for match in CSS_STRING_OR_COMMENT_PATTERN.finditer(css):
+        code += css[position:match.start()]
+        position = match.end()
+        if match.group().startswith("/*"):
+            code += " "
+        else:
+            parts.append(minify_css_code(code))
+            parts.append(match.group())
+            code = ""
+    code += css[position:]
+    parts.append(minify_css_code(code))
+    return "".join(parts).strip()
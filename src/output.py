@@ -0,0 +1,76 @@
+import locale
+import os
+import threading
+
+COMPARE_CHUNK_SIZE = 1 << 20
+
+# Text outputs are opened without an explicit encoding, so compare them in the same one
+TEXT_ENCODING = locale.getpreferredencoding(False)
+
+def temp_path(dest_path):
+    # Hidden sibling on the same filesystem, so the final os.replace is atomic
+    directory, name = os.path.split(dest_path)
+    return os.path.join(directory, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+def same_contents(path, data):
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+def same_files(path_a, path_b):
+    try:
+        if os.path.getsize(path_a) != os.path.getsize(path_b):
+            return False
+        with open(path_a, 'rb') as a, open(path_b, 'rb') as b:
+            while True:
+                chunk = a.read(COMPARE_CHUNK_SIZE)
+                if chunk != b.read(COMPARE_CHUNK_SIZE):
+                    return False
+                if not chunk:
+                    return True
+    except OSError:
+        return False
+
+def replace_if_changed(tmp_path, dest_path):
+    # Identical outputs keep their mtime, so rsync and CDN syncs skip them
+    if same_files(tmp_path, dest_path):
+        os.unlink(tmp_path)
+        return False
+    os.replace(tmp_path, dest_path)
+    return True
+
+def write_if_changed(dest_path, text):
+    return write_bytes_if_changed(dest_path, text.encode(TEXT_ENCODING))
+
+def write_bytes_if_changed(dest_path, data):
+    if same_contents(dest_path, data):
+        return False
+
+    tmp_path = temp_path(dest_path)
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return True
+
+def remove_stale_files(root, expected):
+    # Full builds no longer empty the output directory, so clear out whatever they didn't produce
+    expected = {os.path.abspath(path) for path in expected}
+    removed = []
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if os.path.abspath(path) not in expected:
+                os.unlink(path)
+                removed.append(path)
+        if os.path.abspath(dirpath) != os.path.abspath(root) and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    return removed
@@ -0,0 +1,42 @@
+import re
+
+# Every pattern the build matches against page text, compiled once at import
+
+# Inline Markdown
+IMAGE_PATTERN = re.compile(r"!\[(.*?)\]\((.*?)\)")
+LINK_PATTERN = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+LINK_SPLIT_PATTERN = re.compile(r'(?<!!)\[([^\]]+)\]\(([^)]+)\)')  # This pattern excludes image syntax
+INLINE_START_PATTERN = re.compile(r"[`*!\[]")
+INLINE_DELIMITER_PATTERN = re.compile(r"`|\*\*|\*")
+
+# markdown_parser helpers, which allow empty link text
+MARKDOWN_IMAGE_PATTERN = re.compile(r"!\[(.*?)\]\((.*?)\)")
+MARKDOWN_LINK_PATTERN = re.compile(r"(?<!!)\[(.*?)\]\((.*?)\)")
+
+# Blocks
+ORDERED_ITEM_PATTERN = re.compile(r"\d+\.")
+
+# Page title: the first "# " heading, as text or as bytes for memory-mapped sources
+TITLE_PATTERN = re.compile(r'^\s*#\s*(.+)$', re.MULTILINE)
+TITLE_BYTES_PATTERN = re.compile(rb'^\s*#\s*(.+)$', re.MULTILINE)
+
+# Templates
+SLOT_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# Tag names to file names for tag pages
+TAG_SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
+
+# Search index terms: lowercased words of two or more characters
+TERM_PATTERN = re.compile(r"\w{2,}")
+
+# Minification: comments, raw elements whose whitespace matters, other tags and the text between
+HTML_TOKEN_PATTERN = re.compile(
+    r"(?P<comment><!--(?!\[if).*?-->)"
+    r"|(?P<raw><(?P<raw_tag>pre|code|textarea|script|style)\b[^>]*>.*?</(?P=raw_tag)\s*>)"
+    r"|(?P<tag><[^>]*>)"
+    r"|(?P<text>[^<]+|<)",
+    re.DOTALL | re.IGNORECASE)
+HTML_TAG_NAME_PATTERN = re.compile(r"</?\s*([!\w-]+)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+CSS_STRING_OR_COMMENT_PATTERN = re.compile(r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|/\*.*?\*/', re.DOTALL)
+CSS_PUNCTUATION_PATTERN = re.compile(r"\s*([{};,])\s*")
@@ -0,0 +1,89 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from assets import default_workers
+
+DEFAULT_QUEUE_SIZE = 32
+
+class Failed:
+    __slots__ = ("error",)
+
+    def __init__(self, error):
+        self.error = error
+
+    def __repr__(self):
+        return f"Failed({self.error!r})"
+
+async def call(executor, func, *args):
+    # Without an executor the stage runs on the event loop thread, between awaits
+    if executor is None:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+async def produce(items, outbox, executor, consumers):
+    # Producers are plain iterators (directory walks); each step runs in the pool so
+    # listing a slow volume overlaps with the stages downstream
+    iterator = iter(items)
+    try:
+        while (item := await call(executor, next, iterator, None)) is not None:
+            await outbox.put((item, None))
+    finally:
+        for _ in range(consumers):
+            await outbox.put(None)
+
+async def work(inbox, outbox, func, executor):
+    while (item := await inbox.get()) is not None:
+        job, value = item
+        # A failed item skips the remaining stages but still reaches the end
+        if not isinstance(value, Failed):
+            try:
+                value = await call(executor, func, job, value)
+            except Exception as e:
+                value = Failed(f"{type(e).__name__}: {e}")
+        await outbox.put((job, value))
+
+async def run_stage(inbox, outbox, func, executor, workers, consumers):
+    await asyncio.gather(*(work(inbox, outbox, func, executor) for _ in range(workers)))
+    for _ in range(consumers):
+        await outbox.put(None)
+
+async def run_chain(items, stages, executor, queue_size=DEFAULT_QUEUE_SIZE):
+    # stages is a list of (func, executor, workers); func(job, value) gets the previous
+    # stage's value (None for the first). Bounded queues keep fast stages from running ahead.
+    queues = [asyncio.Queue(queue_size) for _ in stages]
+    results = asyncio.Queue()
+    outboxes = queues[1:] + [results]
+    consumers = [workers for _, _, workers in stages[1:]] + [1]
+
+    tasks = [produce(items, queues[0], executor, stages[0][2])]
+    for (func, stage_executor, workers), inbox, outbox, count in zip(stages, queues, outboxes, consumers):
+        tasks.append(run_stage(inbox, outbox, func, stage_executor, workers, count))
+    await asyncio.gather(*tasks)
+
+    finished = []
+    while not results.empty():
+        item = results.get_nowait()
+        if item is not None:
+            finished.append(item)
+    return finished
+
+def run_build(pages, read, render, write, files=(), copy=None, render_executor=None, render_workers=1,
+              io_workers=None, queue_size=None):
+    # Pages flow discovery -> read -> render -> write; static files flow discovery -> copy.
+    # Reads, writes and copies share one thread pool, rendering uses render_executor.
+    io_workers = io_workers or default_workers()
+    queue_size = queue_size or DEFAULT_QUEUE_SIZE
+    if render_executor is None:
+        render_workers = 1
+
+    async def build(io_executor):
+        page_stages = [(read, io_executor, io_workers), (render, render_executor, render_workers),
+                       (write, io_executor, io_workers)]
+        chains = [run_chain(pages, page_stages, io_executor, queue_size)]
+        if copy is not None:
+            chains.append(run_chain(files, [(copy, io_executor, io_workers)], io_executor, queue_size))
+        return await asyncio.gather(*chains)
+
+    with ThreadPoolExecutor(max_workers=io_workers) as io_executor:
+        finished = asyncio.run(build(io_executor))
+    return finished[0], finished[1] if copy is not None else []
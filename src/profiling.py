@@ -0,0 +1,116 @@
+import functools
+import inspect
+import json
+import os
+import time
+
+class Profiler:
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events = []
+        self.stages = {}
+        self.pages = {}
+        self.stack = []
+        self.patches = []
+
+    def begin(self, name):
+        self.stack.append([name, time.perf_counter(), 0.0])
+
+    def end(self, page=None, call=True):
+        name, start, child_time = self.stack.pop()
+        now = time.perf_counter()
+        duration = now - start
+        if self.stack:
+            self.stack[-1][2] += duration
+
+        calls_total_self = self.stages.setdefault(name, [0, 0.0, 0.0])
+        calls_total_self[0] += call
+        calls_total_self[1] += duration
+        calls_total_self[2] += duration - child_time
+
+        # Chrome trace-event "complete" events, timestamps in microseconds
+        event = {"name": name, "ph": "X", "pid": os.getpid(), "tid": 0,
+                 "ts": round((start - self.origin) * 1e6, 3), "dur": round(duration * 1e6, 3)}
+        if page is not None:
+            event["args"] = {"page": page}
+            self.pages[page] = self.pages.get(page, 0.0) + duration
+        self.events.append(event)
+
+    def wrap(self, func, name, page_arg=None):
+        profiler = self
+
+        def timed_generator(generator):
+            # Generators are timed per resume so lazily consumed stages are still measured; the
+            # resumes add to the time of the one call that created the generator
+            while True:
+                profiler.begin(name)
+                try:
+                    item = next(generator)
+                except StopIteration:
+                    profiler.end(call=False)
+                    return
+                except BaseException:
+                    profiler.end(call=False)
+                    raise
+                profiler.end(call=False)
+                yield item
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            page = args[page_arg] if page_arg is not None else None
+            profiler.begin(name)
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                profiler.end(page)
+            if inspect.isgenerator(result):
+                return timed_generator(result)
+            return result
+        return wrapper
+
+    def instrument(self, owner, attribute, name=None, page_arg=None):
+        original = getattr(owner, attribute)
+        self.patches.append((owner, attribute, original))
+        setattr(owner, attribute, self.wrap(original, name or attribute, page_arg))
+
+    def restore(self):
+        while self.patches:
+            owner, attribute, original = self.patches.pop()
+            setattr(owner, attribute, original)
+
+    def slowest_pages(self, count=10):
+        return sorted(self.pages.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def summary(self, top=10):
+        lines = [f"{'stage':<22}{'calls':>10}{'total (s)':>12}{'self (s)':>12}"]
+        for name, (calls, total, self_time) in sorted(self.stages.items(), key=lambda item: item[1][2], reverse=True):
+            lines.append(f"{name:<22}{calls:>10}{total:>12.4f}{self_time:>12.4f}")
+        if self.pages:
+            lines.append("")
+            lines.append(f"Slowest {min(top, len(self.pages))} pages:")
+            for page, seconds in self.slowest_pages(top):
+                lines.append(f"{seconds * 1000:>10.2f} ms  {page}")
+        return "\n".join(lines)
+
+    def trace(self):
+        return {"traceEvents": self.events, "displayTimeUnit": "ms"}
+
+    def save_trace(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.trace(), f)
+
+def instrument_build(profiler, main_module):
+    import htmlnode
+    import template
+    import textnode
+
+    profiler.instrument(main_module, "sync_assets", "copy_static")
+    profiler.instrument(main_module, "render_page", "page", page_arg=0)
+    profiler.instrument(main_module, "read_source", "read")
+    profiler.instrument(main_module, "parse_markdown", "parse")
+    profiler.instrument(main_module, "extract_title", "extract_title")
+    profiler.instrument(main_module, "write_page", "write")
+    profiler.instrument(textnode, "parse_blocks", "markdown_to_blocks")
+    profiler.instrument(textnode, "text_to_textnodes", "text_to_textnodes")
+    profiler.instrument(htmlnode.HTMLNode, "write_html", "to_html")
+    profiler.instrument(template.Template, "write", "template")
@@ -0,0 +1,83 @@
+import argparse
+import os
+import threading
+
+from frontmatter import split_front_matter
+from main import build_site, configure_ast_cache, configure_build, extract_title, parse_args
+from template import Template, load_template
+from textnode import markdown_to_html_node
+
+# build_site keeps its counters, AST cache and streaming threshold in module globals,
+# so builds in one process take turns; render_string never touches them
+_build_lock = threading.Lock()
+
+class Renderer:
+    def __init__(self, template_path=None, template=None, static_dir="static", default_title=None, **options):
+        # The template is compiled here once; afterwards the object is only read, so one
+        # instance can serve any number of threads
+        if template is not None:
+            self.template = Template(template, template_path)
+        elif template_path is not None:
+            self.template = load_template(template_path)
+        else:
+            self.template = None
+        self.template_path = template_path
+        self.static_dir = static_dir
+        self.default_title = default_title
+
+        # Build options are the command line flags, e.g. jobs=4 or incremental=True
+        self.options = parse_args([])
+        self.options.manifest = None
+        for name, value in options.items():
+            if not hasattr(self.options, name):
+                raise TypeError(f"Unknown build option: {name}")
+            setattr(self.options, name, value)
+
+    def __repr__(self):
+        return f"Renderer(template_path='{self.template_path}', static_dir='{self.static_dir}')"
+
+    def render_node(self, markdown):
+        meta, body = split_front_matter(markdown)
+        return meta, body, markdown_to_html_node(body)
+
+    def render_string(self, markdown):
+        # Without a template this is just the page content
+        meta, body, html_node = self.render_node(markdown)
+        content = html_node.to_html()
+        template = self.template
+        if self.options.minify:
+            from minify import minify_html
+            content = minify_html(content)
+            template = template.minified() if template is not None else None
+        if template is None:
+            return content
+
+        title = meta.get("title")
+        if not title:
+            try:
+                title = extract_title(body)
+            except ValueError:
+                if self.default_title is None:
+                    raise
+                title = self.default_title
+        return template.render({"Title": title, "Content": content})
+
+    def build(self, content_dir, public_dir):
+        if self.template_path is None:
+            raise ValueError("Renderer.build needs a template_path")
+        args = argparse.Namespace(**vars(self.options))
+        # Next to the output directory, as .build_manifest.json sits next to public/, but named
+        # after it: sites built into sibling directories must not prune each other's outputs
+        parent, name = os.path.split(os.path.abspath(public_dir))
+        if args.manifest is None:
+            args.manifest = os.path.join(parent, f".{name}.build_manifest.json")
+        if args.site_index is None:
+            args.site_index = os.path.join(parent, f".{name}.site_index.json")
+        with _build_lock:
+            cache = configure_build(args)
+            try:
+                return build_site(args, content_dir, self.static_dir, self.template_path, public_dir)
+            finally:
+                if cache is not None:
+                    cache.trim()
+                    configure_ast_cache(None)
@@ -0,0 +1,175 @@
+import datetime
+import json
+import os
+
+from buildlog import logger
+
+from htmlnode import LeafNode, ParentNode
+from patterns import TAG_SLUG_PATTERN
+
+INDEX_VERSION = 1
+
+def page_url(output_path, public_dir):
+    return "/" + os.path.relpath(output_path, public_dir).replace(os.sep, "/")
+
+def tag_slug(tag):
+    return TAG_SLUG_PATTERN.sub("-", tag.lower()).strip("-") or "tag"
+
+def tag_slugs(tags):
+    # Tags that slug alike, like "C++" and "C", get numbered suffixes in tag order; "index"
+    # is the tag overview
+    slugs = {}
+    taken = {"index"}
+    for tag in tags:
+        base = slug = tag_slug(tag)
+        suffix = 2
+        while slug in taken:
+            slug = f"{base}-{suffix}"
+            suffix += 1
+        taken.add(slug)
+        slugs[tag] = slug
+    return slugs
+
+def parse_date(value):
+    # A front matter date as an aware UTC datetime: a plain date is its midnight and times
+    # without an offset are taken as UTC. Anything but ISO 8601 gives None.
+    try:
+        if len(value) == 10:
+            parsed = datetime.datetime.combine(datetime.date.fromisoformat(value), datetime.time())
+        else:
+            parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.astimezone(datetime.timezone.utc)
+
+def entry_date(entry):
+    # Indexes saved before dates were checked may still hold other formats
+    return parse_date(entry["date"]) if entry["date"] else None
+
+def page_entry(meta, source_path, output_path, public_dir):
+    date = meta.get("date")
+    if date and parse_date(date) is None:
+        logger.warning(f"Ignoring date {date!r} in {source_path}: expected an ISO 8601 date like 2024-01-31")
+        date = None
+    return {
+        "source": source_path,
+        "output": output_path,
+        "url": page_url(output_path, public_dir),
+        "title": meta.get("title"),
+        "date": date,
+        "tags": list(meta.get("tags", ())),
+        "template": meta.get("template"),
+        "draft": meta.get("draft", False),
+    }
+
+class SiteIndex:
+    def __init__(self, pages=None):
+        # Keyed by the source path relative to the content directory, like the manifest
+        self.pages = pages if pages is not None else {}
+
+    def __len__(self):
+        return len(self.pages)
+
+    def add(self, key, entry):
+        self.pages[key] = entry
+
+    def get(self, key):
+        return self.pages.get(key)
+
+    def set_title(self, key, title):
+        if key in self.pages and not self.pages[key]["title"]:
+            self.pages[key]["title"] = title
+
+    def set_text(self, key, summary, terms):
+        if key in self.pages:
+            self.pages[key]["summary"] = summary
+            self.pages[key]["terms"] = terms
+
+    def entries(self):
+        # Newest first; undated pages last, then by title
+        dated = []
+        undated = []
+        for entry in self.pages.values():
+            date = entry_date(entry)
+            if date:
+                dated.append((date, entry))
+            else:
+                undated.append(entry)
+        dated.sort(key=lambda pair: (pair[0], pair[1]["title"] or ""), reverse=True)
+        undated.sort(key=lambda entry: entry["title"] or "")
+        return [entry for _, entry in dated] + undated
+
+    def tags(self):
+        tags = {}
+        for entry in self.entries():
+            for tag in entry["tags"]:
+                tags.setdefault(tag, []).append(entry)
+        return dict(sorted(tags.items()))
+
+    def to_json(self):
+        return {"version": INDEX_VERSION, "pages": self.pages}
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_json(), f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        # Like the manifest, an unreadable or outdated index is simply rebuilt
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION or not isinstance(data.get("pages"), dict):
+            return cls()
+        return cls(data["pages"])
+
+def entry_list(entries):
+    items = []
+    for entry in entries:
+        children = [LeafNode("a", entry["title"] or entry["url"], {"href": entry["url"]})]
+        if entry["date"]:
+            children.append(LeafNode(None, f" ({entry['date']})"))
+        items.append(ParentNode("li", children))
+    return ParentNode("ul", items)
+
+def listing_pages(index, public_dir, tags_dir="tags"):
+    # Yields (output path, title, content node): an archive of every page, then one page per
+    # tag and a tag overview
+    sources = page_sources(index)
+    for dest_path, title, content_node in index_listings(index, public_dir, tags_dir):
+        check_listing_output(sources, dest_path)
+        yield dest_path, title, content_node
+
+def page_sources(index):
+    # Normalized once, so checking every listing page stays linear in pages plus tags
+    return {os.path.normpath(entry["output"]): entry["source"] for entry in index.pages.values()}
+
+def check_listing_output(sources, dest_path):
+    dest_path = os.path.normpath(dest_path)
+    if dest_path in sources:
+        raise ValueError(f"Listing page {dest_path} would overwrite the page built from {sources[dest_path]}")
+
+def index_listings(index, public_dir, tags_dir):
+    if not index.pages:
+        return
+    yield os.path.join(public_dir, "archive.html"), "All pages", ParentNode("div", [entry_list(index.entries())])
+
+    tags = index.tags()
+    if not tags:
+        return
+    overview = []
+    for tag, slug in tag_slugs(tags).items():
+        entries = tags[tag]
+        yield (os.path.join(public_dir, tags_dir, f"{slug}.html"), f"Tagged: {tag}",
+               ParentNode("div", [entry_list(entries)]))
+        overview.append(ParentNode("li", [
+            LeafNode("a", tag, {"href": f"/{tags_dir}/{slug}.html"}),
+            LeafNode(None, f" ({len(entries)})"),
+        ]))
+    yield os.path.join(public_dir, tags_dir, "index.html"), "Tags", ParentNode("div", [ParentNode("ul", overview)])
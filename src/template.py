@@ -0,0 +1,97 @@
+import os
+from pathlib import Path
+
+from patterns import SLOT_PATTERN
+
+TEMPLATE_FILENAME = "template.html"
+PAGE_TEMPLATE_SUFFIX = ".template.html"
+
+class Template:
+    def __init__(self, source, path=None):
+        self.path = path
+        self.literals = []
+        self.slots = []
+        self.placeholders = []
+        self.minified_template = None
+
+        last_end = 0
+        for match in SLOT_PATTERN.finditer(source):
+            self.literals.append(source[last_end:match.start()])
+            self.slots.append(match.group(1))
+            self.placeholders.append(match.group(0))
+            last_end = match.end()
+        self.literals.append(source[last_end:])
+
+    def __repr__(self):
+        return f"Template(path='{self.path}', slots={self.slots})"
+
+    def minified(self):
+        # Literals are minified once per compiled template; slot values are the caller's business
+        if self.minified_template is None:
+            from minify import minify_html
+            template = Template("", self.path)
+            template.literals = [minify_html(literal) for literal in self.literals]
+            # The first and last literals are the edges of the page, where whitespace never renders
+            template.literals[0] = template.literals[0].lstrip()
+            template.literals[-1] = template.literals[-1].rstrip()
+            template.slots = self.slots
+            template.placeholders = self.placeholders
+            template.minified_template = template
+            self.minified_template = template
+        return self.minified_template
+
+    def render(self, values):
+        # Slots without a value keep their placeholder, like an unmatched str.replace would
+        parts = [self.literals[0]]
+        for slot, placeholder, literal in zip(self.slots, self.placeholders, self.literals[1:]):
+            parts.append(values.get(slot, placeholder))
+            parts.append(literal)
+        return "".join(parts)
+
+    def write(self, fp, values):
+        # Callable values stream their slot directly, e.g. {"Content": node.write_html}
+        fp.write(self.literals[0])
+        for slot, placeholder, literal in zip(self.slots, self.placeholders, self.literals[1:]):
+            value = values.get(slot, placeholder)
+            if callable(value):
+                value(fp)
+            else:
+                fp.write(value)
+            fp.write(literal)
+
+_template_cache = {}
+
+def load_template(path):
+    stat = os.stat(path)
+    cached = _template_cache.get(path)
+    if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+        return cached[1]
+
+    with open(path, 'r') as f:
+        template = Template(f.read(), path)
+    _template_cache[path] = ((stat.st_mtime_ns, stat.st_size), template)
+    return template
+
+def clear_template_cache():
+    _template_cache.clear()
+
+def directory_template(dir_path, inherited_template):
+    # A template.html inside a content directory applies to every page below it
+    candidate = os.path.join(dir_path, TEMPLATE_FILENAME)
+    return candidate if os.path.isfile(candidate) else inherited_template
+
+def page_template(page_path, directory_template_path):
+    # page.template.html next to page.md overrides the directory template for that page only
+    candidate = str(Path(page_path).with_suffix(PAGE_TEMPLATE_SUFFIX))
+    return candidate if os.path.isfile(candidate) else directory_template_path
+
+def resolve_template(page_path, content_dir, default_template_path):
+    # Same inheritance as a recursive walk from content_dir down to the page's directory
+    template_path = directory_template(content_dir, default_template_path)
+    dir_path = content_dir
+    for part in Path(os.path.relpath(os.path.dirname(page_path), content_dir)).parts:
+        if part == os.curdir:
+            continue
+        dir_path = os.path.join(dir_path, part)
+        template_path = directory_template(dir_path, template_path)
+    return page_template(page_path, template_path)
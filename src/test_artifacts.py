@@ -0,0 +1,79 @@
+import contextlib
+import io
+import json
+import unittest
+import main
+from artifacts import TextCollector, extract_text, feed_xml, page_text, search_index_json, sitemap_xml, summarize
+from siteindex import SiteIndex, page_entry
+from textnode import markdown_to_html_node
+
+def index_with(*pages):
+    index = SiteIndex()
+    for name, meta, text in pages:
+        index.add(f"{name}.md", page_entry(dict({"tags": [], "draft": False}, **meta), f"content/{name}.md",
+                                           f"public/{name}.html", "public"))
+        if text:
+            index.set_text(f"{name}.md", text["summary"], text["terms"])
+    return index
+
+class TestPageText(unittest.TestCase):
+
+    def test_extract_text_separates_blocks(self):
+        node = markdown_to_html_node("# Title\n\n* one\n* two\n\nA **bold** [link](/x) ![alt](/i.png)")
+        self.assertEqual(extract_text(node), "Title one two A bold link")
+
+    def test_page_text(self):
+        text = page_text(markdown_to_html_node("# Title\n\nFirst *para*.\n\nSecond para, the END."))
+        self.assertEqual(text["summary"], "First para.")
+        self.assertEqual(text["terms"], ["end", "first", "para", "second", "the", "title"])
+
+    def test_collector_matches_page_text(self):
+        node = markdown_to_html_node("Intro text\n\n```\ncode here\n```")
+        collector = TextCollector()
+        for child in node.children:
+            collector.add(child)
+        self.assertEqual(collector.result(), page_text(node))
+
+    def test_summarize_cuts_at_a_word(self):
+        self.assertEqual(summarize("alpha beta gamma", 12), "alpha beta…")
+        self.assertEqual(summarize("short", 12), "short")
+
+class TestArtifacts(unittest.TestCase):
+
+    def setUp(self):
+        self.index = index_with(
+            ("index", {"title": "Home"}, {"summary": "Welcome", "terms": ["home", "welcome"]}),
+            ("post", {"title": "Fish & <Chips>", "date": "2024-03-01", "tags": ['a "tag"']},
+             {"summary": "Chips", "terms": ["chips", "welcome"]}),
+        )
+
+    def test_sitemap(self):
+        sitemap = sitemap_xml(self.index, "https://example.com/")
+        self.assertIn("<url><loc>https://example.com/index.html</loc></url>", sitemap)
+        self.assertIn("<url><loc>https://example.com/post.html</loc><lastmod>2024-03-01</lastmod></url>", sitemap)
+
+    def test_sitemap_needs_base_url(self):
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main.parse_args(["--sitemap"])
+        self.assertEqual(main.parse_args(["--feed", "--base-url", "https://example.com"]).base_url, "https://example.com")
+
+    def test_feed(self):
+        feed = feed_xml(self.index, "https://example.com")
+        self.assertIn("<title>Home</title>", feed)
+        self.assertIn("<title>Fish &amp; &lt;Chips&gt;</title>", feed)
+        self.assertIn('<category term="a &quot;tag&quot;"/>', feed)
+        self.assertIn("<updated>2024-03-01T00:00:00Z</updated>", feed)
+        self.assertLess(feed.index("<id>https://example.com/post.html</id>"),
+                        feed.index("<id>https://example.com/index.html</id>"))
+
+    def test_feed_times_are_normalized_to_utc(self):
+        self.index.pages["post.md"]["date"] = "2024-03-01T09:30:00+02:00"
+        self.assertIn("<updated>2024-03-01T07:30:00Z</updated>", feed_xml(self.index, "https://example.com"))
+
+    def test_search_index(self):
+        data = json.loads(search_index_json(self.index))
+        self.assertEqual(data["pages"], [["/index.html", "Home"], ["/post.html", "Fish & <Chips>"]])
+        self.assertEqual(data["terms"], {"chips": [1], "home": [0], "welcome": [0, 1]})
+
+if __name__ == '__main__':
+    unittest.main()
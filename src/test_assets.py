@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from assets import format_stats, is_up_to_date, sync_directory
+
+class TestSyncDirectory(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, "static")
+        self.dst = os.path.join(self.tmp.name, "public")
+        os.makedirs(os.path.join(self.src, "images"))
+        self.write(os.path.join(self.src, "index.css"), "body {}")
+        self.write(os.path.join(self.src, "images", "logo.png"), "png")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def test_first_sync_copies_everything(self):
+        stats, files = sync_directory(self.src, self.dst, workers=2)
+        self.assertEqual(files, [os.path.join("images", "logo.png"), "index.css"])
+        self.assertEqual(stats["copied"], 2)
+        self.assertEqual(stats["bytes"], 10)
+        self.assertTrue(is_up_to_date(os.path.join(self.src, "index.css"), os.path.join(self.dst, "index.css")))
+
+    def test_unchanged_files_are_skipped(self):
+        sync_directory(self.src, self.dst)
+        self.write(os.path.join(self.src, "index.css"), "main {}")
+        stats, _ = sync_directory(self.src, self.dst)
+        self.assertEqual((stats["copied"], stats["skipped"]), (1, 1))
+        with open(os.path.join(self.dst, "index.css")) as f:
+            self.assertEqual(f.read(), "main {}")
+
+    def test_hash_check_ignores_mtime(self):
+        sync_directory(self.src, self.dst)
+        os.utime(os.path.join(self.dst, "index.css"), ns=(0, 0))
+        stats, _ = sync_directory(self.src, self.dst, check="hash")
+        self.assertEqual(stats["skipped"], 2)
+
+    def test_hardlink_mode(self):
+        stats, _ = sync_directory(self.src, self.dst, mode="hardlink")
+        self.assertEqual(stats["linked"], 2)
+        self.assertTrue(os.path.samefile(os.path.join(self.src, "index.css"), os.path.join(self.dst, "index.css")))
+
+    def test_reflink_falls_back_to_copy(self):
+        stats, _ = sync_directory(self.src, self.dst, mode="reflink")
+        self.assertEqual(stats["copied"] + stats["linked"], 2)
+        with open(os.path.join(self.dst, "index.css")) as f:
+            self.assertEqual(f.read(), "body {}")
+
+    def test_orphans_from_previous_sync_are_removed(self):
+        _, files = sync_directory(self.src, self.dst)
+        self.write(os.path.join(self.dst, "page.html"), "not an asset")
+        os.unlink(os.path.join(self.src, "images", "logo.png"))
+        stats, _ = sync_directory(self.src, self.dst, previous=files)
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.dst, "page.html")))
+
+    def test_each_file_is_logged_at_debug_level(self):
+        with self.assertLogs("static_site", "DEBUG") as logs:
+            sync_directory(self.src, self.dst)
+        self.assertEqual(logs.output, [
+            f"DEBUG:static_site:Copied file: {os.path.join(self.src, 'images', 'logo.png')} to "
+            f"{os.path.join(self.dst, 'images', 'logo.png')}",
+            f"DEBUG:static_site:Copied file: {os.path.join(self.src, 'index.css')} to {os.path.join(self.dst, 'index.css')}",
+        ])
+        os.unlink(os.path.join(self.src, "index.css"))
+        with self.assertLogs("static_site", "DEBUG") as logs:
+            sync_directory(self.src, self.dst, previous=["index.css"])
+        self.assertEqual(logs.output, [f"DEBUG:static_site:Removed stale output: {os.path.join(self.dst, 'index.css')}"])
+
+    def test_format_stats(self):
+        stats, _ = sync_directory(self.src, self.dst)
+        self.assertEqual(format_stats(stats), "2 copied, 0 linked, 0 unchanged, 0 removed (10 bytes)")
+
+    def test_minified_css(self):
+        self.write(os.path.join(self.src, "index.css"), "body {\n  margin: 0;\n}\n")
+        stats, _ = sync_directory(self.src, self.dst, minify=True)
+        with open(os.path.join(self.dst, "index.css")) as f:
+            self.assertEqual(f.read(), "body{margin:0}")
+        stats, _ = sync_directory(self.src, self.dst, minify=True)
+        self.assertEqual(stats["skipped"], 2)
+        # A plain copy left by a build without minification is replaced
+        stats, _ = sync_directory(self.src, self.dst)
+        self.assertEqual(stats["copied"], 1)
+        stats, _ = sync_directory(self.src, self.dst, minify=True)
+        self.assertEqual(stats["copied"], 1)
+
+    def test_already_minified_css_is_skipped(self):
+        self.write(os.path.join(self.src, "index.css"), "body{margin:0}")
+        stats, _ = sync_directory(self.src, self.dst, minify=True)
+        self.assertEqual(stats["copied"], 2)
+        for _ in range(2):
+            stats, _ = sync_directory(self.src, self.dst, minify=True)
+            self.assertEqual(stats["copied"], 0)
+            self.assertEqual(stats["skipped"], 2)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            sync_directory(self.src, self.dst, mode="rsync")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from astcache import ASTCache, decode_node, encode_node
+from textnode import markdown_to_html_node
+
+MARKDOWN = "# Title\n\nSome **bold** and a [link](/x) with ![img](/i.png)\n\n* one\n* two"
+
+class TestASTCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ASTCache(os.path.join(self.tmp.name, "ast"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_encode_round_trip(self):
+        node = markdown_to_html_node(MARKDOWN)
+        self.assertEqual(decode_node(encode_node(node)).to_html(), node.to_html())
+
+    def test_miss_then_hit(self):
+        key = self.cache.key(MARKDOWN)
+        self.assertIsNone(self.cache.get(key))
+        node = markdown_to_html_node(MARKDOWN)
+        self.cache.put(key, node)
+        self.assertEqual(self.cache.get(key).to_html(), node.to_html())
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_key_depends_on_content(self):
+        self.assertNotEqual(self.cache.key(MARKDOWN), self.cache.key(MARKDOWN + " "))
+
+    def test_corrupt_entry_is_discarded(self):
+        key = self.cache.key(MARKDOWN)
+        self.cache.put(key, markdown_to_html_node(MARKDOWN))
+        with open(self.cache.entry_path(key), 'w') as f:
+            f.write('["L", "b"')
+        self.assertIsNone(self.cache.get(key))
+        self.assertFalse(os.path.exists(self.cache.entry_path(key)))
+
+    def test_failed_write_is_only_a_warning(self):
+        key = self.cache.key(MARKDOWN)
+        with mock.patch("astcache.json.dump", side_effect=OSError(28, "No space left on device")):
+            with self.assertLogs("static_site", "WARNING"):
+                self.cache.put(key, markdown_to_html_node(MARKDOWN))
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(os.listdir(os.path.dirname(self.cache.entry_path(key))), [])
+
+    def test_failed_eviction_is_only_a_warning(self):
+        for i in range(2):
+            self.cache.put(self.cache.key(f"# Page {i}"), markdown_to_html_node(f"# Page {i}"))
+        self.cache.max_bytes = 0
+        with mock.patch("astcache.os.unlink", side_effect=PermissionError(13, "Permission denied")):
+            with self.assertLogs("static_site", "WARNING"):
+                self.assertEqual(self.cache.trim(), 0)
+
+    def test_trim_evicts_least_recently_used(self):
+        keys = [self.cache.key(f"# Page {i}") for i in range(3)]
+        for i, key in enumerate(keys):
+            self.cache.put(key, markdown_to_html_node(f"# Page {i}"))
+            os.utime(self.cache.entry_path(key), ns=(i, i))
+        self.cache.get(keys[0])
+
+        entry_size = os.path.getsize(self.cache.entry_path(keys[1]))
+        self.cache.max_bytes = entry_size * 2
+        self.assertEqual(self.cache.trim(), 1)
+        self.assertFalse(os.path.exists(self.cache.entry_path(keys[1])))
+        self.assertTrue(os.path.exists(self.cache.entry_path(keys[0])))
+
+if __name__ == '__main__':
+    unittest.main()
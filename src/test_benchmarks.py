@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from benchmarks import conversion, memory, startup
+from benchmarks.__main__ import bench_html_node, run
+from benchmarks.corpus import SHAPES, generate_corpus, generate_markdown, write_corpus
+from main import extract_title
+from textnode import inline_cache, markdown_to_html_node, parse_blocks
+
+class TestCorpus(unittest.TestCase):
+
+    def test_generation_is_deterministic(self):
+        self.assertEqual(generate_markdown("mixed", 20, seed=3), generate_markdown("mixed", 20, seed=3))
+        self.assertNotEqual(generate_markdown("mixed", 20, seed=3), generate_markdown("mixed", 20, seed=4))
+
+    def test_shapes_produce_matching_blocks(self):
+        block_types = {block_type for block_type, _ in parse_blocks(generate_markdown("code", 10))}
+        self.assertEqual(block_types, {"heading", "code"})
+        for shape in SHAPES:
+            self.assertTrue(extract_title(generate_markdown(shape, 5)))
+
+    def test_unknown_shape(self):
+        with self.assertRaises(ValueError):
+            generate_markdown("tables")
+
+    def test_write_corpus(self):
+        with tempfile.TemporaryDirectory() as root:
+            paths = write_corpus(root, generate_corpus(pages=3, blocks=2), pages_per_dir=2)
+            self.assertEqual(len(paths), 3)
+            self.assertTrue(all(os.path.isfile(path) for path in paths))
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_run_reports_every_stage(self):
+        results = run(pages=2, blocks=3, repeat=1)
+        self.assertEqual(
+            set(results["stages"]),
+            {"text_to_textnodes", "markdown_to_blocks", "markdown_to_html_node", "to_html", "main"},
+        )
+        for stage in results["stages"].values():
+            self.assertGreater(stage["pages_per_sec"], 0)
+            self.assertGreater(stage["peak_alloc_kb"], 0)
+
+    def test_runs_start_with_a_cold_inline_cache(self):
+        documents = generate_corpus(pages=3, blocks=10)
+        inline_cache.clear()
+        for document in documents:
+            markdown_to_html_node(document)
+        single_run = (inline_cache.hits, inline_cache.misses)
+
+        bench_html_node(documents, repeat=3)
+        self.assertEqual((inline_cache.hits, inline_cache.misses), single_run)
+        bench_html_node(documents, repeat=3, warm_cache=True)
+        self.assertEqual(inline_cache.misses, single_run[1])
+
+    def test_memory_benchmark(self):
+        results = memory.run(count=1000)
+        self.assertLess(results["LeafNode(text)"]["after_bytes"], results["LeafNode(text)"]["before_bytes"])
+
+class TestConversion(unittest.TestCase):
+
+    def test_conversion_benchmark(self):
+        results = conversion.run(count=200, repeat=1)
+        self.assertEqual(set(results), {"TextNode", "dict"})
+        for result in results.values():
+            self.assertGreater(result["after"]["nodes_per_sec"], 0)
+
+class TestStartup(unittest.TestCase):
+
+    def test_parse_importtime(self):
+        stderr = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       120 |        120 |   re._parser\n"
+                  "import time:       300 |        420 | re\n"
+                  "unrelated line\n")
+        self.assertEqual(startup.parse_importtime(stderr), [
+            {"module": "re._parser", "depth": 1, "self_us": 120, "cumulative_us": 120},
+            {"module": "re", "depth": 0, "self_us": 300, "cumulative_us": 420},
+        ])
+
+    def test_plain_import_skips_optional_subsystems(self):
+        results = startup.run(repeat=1, top=3)
+        self.assertEqual(results["optional_loaded"], [])
+        self.assertIn("main", [module["module"] for module in results["slowest"]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import contextlib
+import io
+import json
+import logging
+import os
+import tempfile
+import unittest
+from buildlog import BuildStats, configure_logging, logger
+
+class TestConfigureLogging(unittest.TestCase):
+
+    def tearDown(self):
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+
+    def emit(self, verbosity, json_log=None):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            configure_logging(verbosity, json_log)
+            logger.debug("per item")
+            logger.info("summary")
+            logger.warning("broken")
+        return output.getvalue().splitlines()
+
+    def test_levels(self):
+        self.assertEqual(self.emit("quiet"), ["broken"])
+        self.assertEqual(self.emit("normal"), ["summary", "broken"])
+        self.assertEqual(self.emit("verbose"), ["per item", "summary", "broken"])
+
+    def test_json_log_records_everything(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "build.jsonl")
+            self.assertEqual(self.emit("quiet", path), ["broken"])
+            logger.info("counts", extra={"fields": {"pages_rendered": 3}})
+            logger.handlers[-1].flush()
+            with open(path) as f:
+                entries = [json.loads(line) for line in f]
+        self.assertEqual([entry["message"] for entry in entries], ["per item", "summary", "broken", "counts"])
+        self.assertEqual(entries[0]["level"], "debug")
+        self.assertEqual(entries[-1]["pages_rendered"], 3)
+        self.assertTrue(logger.isEnabledFor(logging.DEBUG))
+
+class TestBuildStats(unittest.TestCase):
+
+    def test_counters(self):
+        stats = BuildStats()
+        stats.pages_rendered += 2
+        stats.pages_changed += 1
+        stats.bytes_written += 100
+        self.assertEqual(stats.as_dict(), {"pages_rendered": 2, "pages_changed": 1, "bytes_written": 100,
+                                           "files_copied": 0, "links_found": 0})
+        self.assertEqual(str(stats), "2 pages rendered (1 changed, 100 bytes written), 0 files copied, 0 links found")
+        stats.reset()
+        self.assertEqual(stats.pages_rendered, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import gzip
+import os
+import tempfile
+import unittest
+from compress import compress_file, compress_files, gzip_compress
+
+class TestCompress(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.page = os.path.join(self.tmp.name, "page.html")
+        self.write(self.page, "<p>repeated text</p>" * 50)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def test_gzip_sibling_round_trips(self):
+        siblings, written, extensions, stamps = compress_files([self.page], workers=2)
+        self.assertEqual(list(stamps), [self.page])
+        self.assertIn(self.page + ".gz", siblings)
+        self.assertEqual(written, len(extensions))
+        with open(self.page, 'rb') as f, gzip.open(self.page + ".gz") as g:
+            self.assertEqual(g.read(), f.read())
+
+    def test_gzip_output_is_reproducible(self):
+        self.assertEqual(gzip_compress(b"same"), gzip_compress(b"same"))
+
+    def test_small_and_binary_files_are_skipped(self):
+        small = os.path.join(self.tmp.name, "small.css")
+        image = os.path.join(self.tmp.name, "logo.png")
+        self.write(small, "body{}")
+        self.write(image, "x" * 1000)
+        self.assertEqual(compress_files([small, image]), ([], 0, compress_files([])[2], {}))
+
+    def test_siblings_follow_content_not_mtime(self):
+        codecs = [(".gz", gzip_compress, gzip.decompress)]
+        self.assertEqual(compress_file(self.page, codecs)[:2], ([self.page + ".gz"], 1))
+        self.assertEqual(compress_file(self.page, codecs)[:2], ([self.page + ".gz"], 0))
+        # A replacement with an older mtime, as copy2 gives a backdated static file
+        self.write(self.page, "<p>changed</p>" * 50)
+        os.utime(self.page, ns=(0, 0))
+        self.assertEqual(compress_file(self.page, codecs)[:2], ([self.page + ".gz"], 1))
+        with gzip.open(self.page + ".gz") as g:
+            self.assertEqual(g.read(), b"<p>changed</p>" * 50)
+
+    def test_untouched_outputs_are_not_read_again(self):
+        codecs = [(".gz", gzip_compress, gzip.decompress)]
+        _, _, stamp = compress_file(self.page, codecs)
+        self.write(self.page + ".gz", "not checked")
+        self.assertEqual(compress_file(self.page, codecs, stamp), ([self.page + ".gz"], 0, stamp))
+        # Any write to the output changes its stamp, even one that keeps size and mtime
+        self.write(self.page, "<p>repeated text</p>" * 50)
+        os.utime(self.page, ns=(0, 0))
+        self.assertEqual(compress_file(self.page, codecs, stamp)[1], 1)
+        with gzip.open(self.page + ".gz") as g:
+            self.assertEqual(g.read(), b"<p>repeated text</p>" * 50)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import main
+from devserver import SiteWatcher
+
+class TestSiteWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.static = os.path.join(self.root, "static")
+        self.public = os.path.join(self.root, "public")
+        self.template = os.path.join(self.root, "template.html")
+        os.makedirs(os.path.join(self.content, "blog"))
+        os.makedirs(self.static)
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.write(os.path.join(self.content, "index.md"), "# Home")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post")
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.generate_pages_parallel(self.content, self.template, self.public, jobs=1)
+        self.watcher = SiteWatcher(self.content, self.static, self.template, self.public, main)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text, mtime=None):
+        with open(path, 'w') as f:
+            f.write(text)
+        if mtime is not None:
+            os.utime(path, ns=(mtime, mtime))
+
+    def read(self, *parts):
+        with open(os.path.join(self.public, *parts)) as f:
+            return f.read()
+
+    def rebuild(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.watcher.apply(*self.watcher.poll())
+
+    def test_no_changes(self):
+        self.assertEqual(self.watcher.poll(), ([], []))
+
+    def test_only_touched_page_is_rebuilt(self):
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Edited", mtime=1)
+        rebuilt = self.rebuild()
+        self.assertEqual(rebuilt, {os.path.join(self.content, "blog", "post.md")})
+        self.assertEqual(self.read("blog", "post.html"), "<title>Edited</title><div><h1>Edited</h1></div>")
+
+    def test_template_change_rebuilds_all_pages(self):
+        self.write(self.template, "<h1>{{ Title }}</h1>", mtime=1)
+        self.assertEqual(len(self.rebuild()), 2)
+        self.assertEqual(self.read("index.html"), "<h1>Home</h1>")
+
+    def test_directory_template_rebuilds_its_subtree(self):
+        self.write(os.path.join(self.content, "blog", "template.html"), "<p>{{ Title }}</p>")
+        self.assertEqual(self.rebuild(), {os.path.join(self.content, "blog", "post.md")})
+        self.assertEqual(self.read("blog", "post.html"), "<p>Post</p>")
+
+    def test_template_change_rebuilds_only_its_pages(self):
+        self.write(os.path.join(self.content, "blog", "post.md"), "---\ntemplate: ../plain.html\n---\n# Post")
+        self.write(os.path.join(self.content, "plain.html"), "<p>{{ Title }}</p>")
+        self.assertEqual(self.rebuild(), {os.path.join(self.content, "blog", "post.md")})
+        self.assertEqual(self.read("blog", "post.html"), "<p>Post</p>")
+
+        self.write(os.path.join(self.content, "plain.html"), "<h2>{{ Title }}</h2>", mtime=1)
+        self.assertEqual(self.rebuild(), {os.path.join(self.content, "blog", "post.md")})
+        self.assertEqual(self.read("blog", "post.html"), "<h2>Post</h2>")
+
+        self.write(self.template, "<h1>{{ Title }}</h1>", mtime=1)
+        self.assertEqual(self.rebuild(), {os.path.join(self.content, "index.md")})
+        self.assertEqual(self.read("blog", "post.html"), "<h2>Post</h2>")
+
+    def test_removed_page_template_falls_back(self):
+        page_template = os.path.join(self.content, "blog", "post.template.html")
+        self.write(page_template, "<p>{{ Title }}</p>")
+        self.assertEqual(self.rebuild(), {os.path.join(self.content, "blog", "post.md")})
+        self.assertEqual(self.read("blog", "post.html"), "<p>Post</p>")
+
+        os.unlink(page_template)
+        self.assertEqual(self.rebuild(), {os.path.join(self.content, "blog", "post.md")})
+        self.assertEqual(self.read("blog", "post.html"), "<title>Post</title><div><h1>Post</h1></div>")
+
+    def test_static_files_and_removals(self):
+        self.write(os.path.join(self.static, "site.css"), "body {}")
+        self.rebuild()
+        self.assertEqual(self.read("site.css"), "body {}")
+
+        os.unlink(os.path.join(self.static, "site.css"))
+        os.unlink(os.path.join(self.content, "blog", "post.md"))
+        self.rebuild()
+        self.assertFalse(os.path.exists(os.path.join(self.public, "site.css")))
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog")))
+
+    def test_rebuild_keeps_build_configuration(self):
+        main.configure_minify(True)
+        self.addCleanup(main.configure_minify, False)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nSome   spaced   text", mtime=1)
+        self.rebuild()
+        self.assertEqual(self.read("index.html"), "<title>Home</title><div><h1>Home</h1><p>Some spaced text</p></div>")
+
+    def test_static_edits_follow_the_asset_mode(self):
+        self.watcher = SiteWatcher(self.content, self.static, self.template, self.public, main, asset_mode="hardlink")
+        css = os.path.join(self.static, "site.css")
+        self.write(css, "body {}")
+        self.rebuild()
+        self.assertTrue(os.path.samefile(css, os.path.join(self.public, "site.css")))
+        self.write(css, "p {}", mtime=1)
+        self.rebuild()
+        self.assertEqual(self.read("site.css"), "p {}")
+
+        main.configure_minify(True)
+        self.addCleanup(main.configure_minify, False)
+        self.write(css, "body {\n  margin: 0;\n}\n", mtime=2)
+        self.rebuild()
+        self.assertEqual(self.read("site.css"), "body{margin:0}")
+
+    def test_failed_page_does_not_stop_watching(self):
+        self.write(os.path.join(self.content, "index.md"), "no title", mtime=1)
+        self.rebuild()
+        self.assertEqual(self.read("index.html"), "<title>Home</title><div><h1>Home</h1></div>")
+
+if __name__ == '__main__':
+    unittest.main()
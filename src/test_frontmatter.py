@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from frontmatter import front_matter_template, parse_front_matter, read_front_matter, split_front_matter
+
+class TestFrontMatter(unittest.TestCase):
+
+    def test_yaml_front_matter(self):
+        meta, body = split_front_matter('---\ntitle: "Hello: World"\ndate: 2024-01-02\ntags: [a, "b"]\ndraft: yes\n---\n# Hi')
+        self.assertEqual(meta, {"title": "Hello: World", "date": "2024-01-02", "tags": ["a", "b"], "draft": True})
+        self.assertEqual(body, "# Hi")
+
+    def test_toml_front_matter(self):
+        meta, body = split_front_matter('+++\ntitle = "Hello"\ntags = ["x"]\n+++\n\n# Hi')
+        self.assertEqual(meta, {"title": "Hello", "tags": ["x"], "draft": False})
+        self.assertEqual(body, "\n# Hi")
+
+    def test_yaml_block_list(self):
+        meta, _ = split_front_matter("---\ntags:\n  - one\n  - two\n---\n")
+        self.assertEqual(meta["tags"], ["one", "two"])
+
+    def test_no_front_matter(self):
+        self.assertEqual(split_front_matter("# Hi\n---\n"), ({"tags": [], "draft": False}, "# Hi\n---\n"))
+
+    def test_unclosed_fence_is_content(self):
+        markdown = "---\ntitle: Hi\n\n# Hi"
+        self.assertEqual(split_front_matter(markdown)[1], markdown)
+
+    def test_invalid_line_raises(self):
+        with self.assertRaises(ValueError):
+            parse_front_matter(["not a field"], ":")
+
+    def test_rule_without_fields_is_content(self):
+        markdown = "---\nJust a paragraph between rules\n---\n# Hi"
+        self.assertEqual(split_front_matter(markdown), ({"tags": [], "draft": False}, markdown))
+
+    def test_read_front_matter_counts_header_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            with open(path, 'w') as f:
+                f.write("---\ntitle: Hi\ntemplate: ../t.html\n---\n# Hi\n")
+            meta, header_lines = read_front_matter(path)
+            self.assertEqual(header_lines, 4)
+            self.assertEqual(front_matter_template(meta, path, "default.html"), os.path.join(os.path.dirname(tmp), "t.html"))
+            self.assertEqual(front_matter_template({}, path, "default.html"), "default.html")
+
+    def test_both_entry_points_agree(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            for text in ("---\ndraft: true\n---\n# Hi\n", "--- \r\ndraft: true\r\n---\r\n# Hi\r\n",
+                         " ---\ndraft: true\n---\n# Hi\n", "\n---\ndraft: true\n---\n# Hi\n"):
+                with open(path, 'w', newline='') as f:
+                    f.write(text)
+                meta, body = split_front_matter(text)
+                read_meta, header_lines = read_front_matter(path)
+                self.assertEqual(read_meta, meta)
+                self.assertEqual(header_lines == 0, body == text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from highlight import HighlightCache, highlight, lexer_name, tokenize
+from htmlnode import LeafNode
+
+class TestTokenize(unittest.TestCase):
+
+    def tokens(self, language, code):
+        return [(token_class, text) for token_class, text in tokenize(language, code) if token_class]
+
+    def test_python(self):
+        self.assertEqual(self.tokens("python", 'def f():  # note\n    return "x", 42, None'), [
+            ("k", "def"), ("c", "# note"), ("k", "return"), ("s", '"x"'), ("m", "42"), ("kc", "None"),
+        ])
+
+    def test_keywords_inside_strings_and_comments(self):
+        self.assertEqual(self.tokens("javascript", '// if else\nconst s = "return";'), [
+            ("c", "// if else"), ("k", "const"), ("s", '"return"'),
+        ])
+
+    def test_rust_lifetimes_are_not_strings(self):
+        self.assertEqual(self.tokens("rust", "fn f<'a>(c: char) { 'x' }"), [("k", "fn"), ("s", "'x'")])
+
+    def test_json_keys(self):
+        self.assertEqual(self.tokens("json", '{"a": "b", "c": 1}'), [
+            ("nt", '"a"'), ("s", '"b"'), ("nt", '"c"'), ("m", "1"),
+        ])
+
+    def test_text_is_preserved(self):
+        code = 'echo "$HOME" # done\nfor x in 1 2; do ls $x; done'
+        self.assertEqual("".join(text for _, text in tokenize("bash", code)), code)
+
+class TestHighlight(unittest.TestCase):
+
+    def test_aliases(self):
+        self.assertEqual(lexer_name("PY"), "python")
+        self.assertEqual(lexer_name("sh"), "bash")
+        self.assertIsNone(lexer_name("klingon"))
+
+    def test_nodes(self):
+        self.assertEqual(highlight("py", "x = 1"), [
+            LeafNode(None, "x = "), LeafNode("span", "1", {"class": "m"}),
+        ])
+
+    def test_unknown_language_is_plain(self):
+        self.assertEqual(highlight("klingon", "qapla"), [LeafNode(None, "qapla")])
+        self.assertEqual(highlight("klingon", "a < b"), [LeafNode(None, "a &lt; b")])
+
+    def test_markup_is_escaped(self):
+        html = "".join(node.to_html() for node in highlight("html", '<div class="x">a & b</div>'))
+        self.assertNotIn("<div", html)
+        self.assertIn("&lt;div", html)
+        self.assertIn("a &amp; b", html)
+
+    def test_cache_is_keyed_by_language_and_code(self):
+        cache = HighlightCache(max_entries=2)
+        first = cache.highlight("python", "x = 1")
+        self.assertEqual(cache.highlight("python", "x = 1"), first)
+        cache.highlight("javascript", "x = 1")
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        cache.highlight("python", "y = 2")
+        self.assertEqual(len(cache.entries), 2)
+        cache.highlight("python", "x = 1")
+        self.assertEqual(cache.misses, 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
+import io
 import unittest
-from htmlnode import HTMLNode,LeafNode,ParentNode, text_node_to_html_node
+from htmlnode import HTMLNode,LeafNode,ParentNode, text_node_to_html_node, make_leaf, EMPTY_CHILDREN, EMPTY_PROPS
 
 class TestHTMLNode(unittest.TestCase):
 
@@ -47,6 +48,16 @@ class TestLeafNode(unittest.TestCase):
         expected_html = "Raw text content."
         self.assertEqual(node.to_html(), expected_html)
 
+    def test_leaves_share_empty_children_and_props(self):
+        """Test that leaves are slotted and reuse the shared empty sentinels"""
+        first = LeafNode(None, "one")
+        second = LeafNode("b", "two")
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertIs(first.children, EMPTY_CHILDREN)
+        self.assertIs(second.props, EMPTY_PROPS)
+        with self.assertRaises(TypeError):
+            second.props["class"] = "x"
+
     def test_to_html_missing_value(self):
         """Test that missing value raises a ValueError"""
         with self.assertRaises(ValueError):
@@ -116,6 +127,29 @@ class TestParentNode(unittest.TestCase):
         expected_html = "<a href='https://example.com' class='link'>Click me!</a>"
         self.assertEqual(node.to_html(), expected_html)
 
+    def test_write_html_matches_to_html(self):
+        """Test that streaming into a file object produces the same HTML as to_html"""
+        node = ParentNode(
+            "div",
+            [
+                ParentNode("p", [LeafNode("b", "Bold"), LeafNode(None, " text")], {"class": "intro"}),
+                LeafNode("img", "", {"src": "a.png", "alt": "A"}),
+            ]
+        )
+        buffer = io.StringIO()
+        node.write_html(buffer)
+        self.assertEqual(buffer.getvalue(), node.to_html())
+        self.assertEqual(
+            buffer.getvalue(),
+            "<div><p class='intro'><b>Bold</b> text</p><img src='a.png' alt='A' /></div>",
+        )
+
+    def test_write_html_streams_chunks(self):
+        """Test that a parent emits its children as separate chunks"""
+        chunks = []
+        ParentNode("ul", [LeafNode("li", "a"), LeafNode("li", "b")]).emit_html(chunks.append)
+        self.assertEqual(chunks, ["<ul>", "<li>a</li>", "<li>b</li>", "</ul>"])
+
 class TestTextNodeConversion(unittest.TestCase):
     
     def test_text_type_text(self):
@@ -148,6 +182,15 @@ class TestTextNodeConversion(unittest.TestCase):
         node = text_node_to_html_node(text_node)
         self.assertEqual(node.to_html(), "<img src='image.jpg' alt='An image' />")
 
+    def test_image_dict_without_text(self):
+        node = text_node_to_html_node({"type": "image", "src": "a.png"})
+        self.assertEqual(node.props, {"src": "a.png", "alt": None})
+
+    def test_make_leaf_matches_leaf_node(self):
+        self.assertEqual(make_leaf("a", "x", {"href": "/"}), LeafNode("a", "x", {"href": "/"}))
+        self.assertEqual(make_leaf(None, "plain").to_html(), "plain")
+        self.assertIs(make_leaf("b", "x").children, EMPTY_CHILDREN)
+
     def test_unknown_type(self):
         text_node = {"type": "unknown", "text": "Unknown type"}
         with self.assertRaises(ValueError):
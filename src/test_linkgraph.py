@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+from linkgraph import LinkGraph, candidate_paths, output_url, resolve_link, site_paths
+
+class TestResolveLink(unittest.TestCase):
+
+    def test_relative_and_absolute_links(self):
+        self.assertEqual(resolve_link("/blog/post.html", "other.html"), "/blog/other.html")
+        self.assertEqual(resolve_link("/blog/post.html", "../images/a.png"), "/images/a.png")
+        self.assertEqual(resolve_link("/blog/post.html", "/majesty#top"), "/majesty")
+        self.assertEqual(resolve_link("/index.html", "/my%20page.html"), "/my page.html")
+
+    def test_external_links_are_skipped(self):
+        for link in ("https://example.com", "mailto:a@b.c", "//cdn.example.com/x.js", "#section"):
+            self.assertIsNone(resolve_link("/index.html", link))
+
+    def test_candidate_paths(self):
+        self.assertEqual(candidate_paths("/"), ("/index.html",))
+        self.assertEqual(candidate_paths("/a.png"), ("/a.png",))
+        self.assertEqual(candidate_paths("/majesty"), ("/majesty", "/majesty.html", "/majesty/index.html"))
+
+class TestLinkGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = LinkGraph()
+        self.graph.add_page("/index.html", ["/majesty", "/missing", "https://example.com"], ["/images/a.png"])
+        self.graph.add_page("/majesty/index.html", ["/", "../index.html"], ["/images/gone.png"])
+        self.existing = {"/index.html", "/majesty/index.html", "/images/a.png"}
+
+    def test_broken_links_and_missing_images(self):
+        broken_links, missing_images = self.graph.broken(self.existing)
+        self.assertEqual(broken_links, [("/index.html", "/missing")])
+        self.assertEqual(missing_images, [("/majesty/index.html", "/images/gone.png")])
+        self.assertEqual(self.graph.link_count(), 7)
+
+    def test_backlinks(self):
+        self.graph.broken(self.existing)
+        self.assertEqual(self.graph.backlinks("/index.html"), ["/majesty/index.html", "/majesty/index.html"])
+        self.assertEqual(self.graph.backlinks("/majesty/index.html"), ["/index.html"])
+        self.assertEqual(self.graph.to_json()["pages"]["/index.html"]["backlinks"], ["/majesty/index.html"])
+
+    def test_site_paths(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "blog"))
+            open(os.path.join(root, "blog", "post.html"), 'w').close()
+            self.assertEqual(site_paths(root), {"/blog/post.html"})
+            self.assertEqual(output_url(os.path.join(root, "blog", "post.html"), root), "/blog/post.html")
+
+if __name__ == '__main__':
+    unittest.main()
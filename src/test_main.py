@@ -1,5 +1,14 @@
+import contextlib
+import gzip
+import io
+import json
+import os
+import tempfile
 import unittest
-from main import extract_title
+import main
+from manifest import load_manifest, save_manifest
+from textnode import markdown_to_html_node
+from main import SiteIndex, build_incremental, build_pipelined, extract_hyperlinks, extract_links, extract_title, generate_pages_parallel, render_page, scan_title
 
 class TestExtractTitle(unittest.TestCase):
 
@@ -20,5 +29,359 @@ class TestExtractTitle(unittest.TestCase):
         with self.assertRaises(ValueError):
             extract_title(markdown)
 
+class TestExtractHyperlinks(unittest.TestCase):
+
+    def test_links_in_document_order(self):
+        node = markdown_to_html_node("[a](/a) and ![img](/i.png)\n\n* [b](/b)\n* [c **d**](/c)")
+        self.assertEqual(extract_hyperlinks(node), ["/a", "/b", "/c"])
+
+    def test_images_collected_separately(self):
+        node = markdown_to_html_node("![one](/1.png) [a](/a)\n\n![two](/2.png)")
+        self.assertEqual(extract_links(node), (["/a"], ["/1.png", "/2.png"]))
+
+class TestIncrementalBuild(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.static = os.path.join(self.root, "static")
+        self.public = os.path.join(self.root, "public")
+        self.template = os.path.join(self.root, "template.html")
+        self.manifest = os.path.join(self.root, "manifest.json")
+        os.makedirs(os.path.join(self.content, "blog"))
+        os.makedirs(self.static)
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.write(os.path.join(self.content, "index.md"), "# Home")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post")
+        self.write(os.path.join(self.static, "site.css"), "body {}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def build(self):
+        build_incremental(self.content, self.static, self.template, self.public, self.manifest)
+
+    def output(self, *parts):
+        return os.path.join(self.public, *parts)
+
+    def test_links_of_unchanged_pages_are_kept(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n[post](/blog/post)")
+        self.build()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = build_incremental(self.content, self.static, self.template, self.public, self.manifest)
+        links = {os.path.basename(result["output"]): result["hyperlinks"] for result in results}
+        self.assertEqual(links, {"index.html": ["/blog/post"], "post.html": []})
+
+    def test_unchanged_outputs_are_not_rewritten(self):
+        self.build()
+        os.utime(self.output("index.html"), ns=(0, 0))
+        self.build()
+        self.assertEqual(os.stat(self.output("index.html")).st_mtime_ns, 0)
+
+    def test_changed_source_is_rerendered(self):
+        self.build()
+        self.write(os.path.join(self.content, "index.md"), "# Welcome")
+        self.build()
+        with open(self.output("index.html")) as f:
+            self.assertEqual(f.read(), "<title>Welcome</title><div><h1>Welcome</h1></div>")
+
+    def test_template_change_rerenders_every_page(self):
+        self.build()
+        self.write(self.template, "<h1>{{ Title }}</h1>")
+        self.build()
+        with open(self.output("blog", "post.html")) as f:
+            self.assertEqual(f.read(), "<h1>Post</h1>")
+
+    def test_directory_template_applies_to_subtree(self):
+        self.build()
+        self.write(os.path.join(self.content, "blog", "template.html"), "<article>{{ Content }}</article>")
+        self.build()
+        with open(self.output("blog", "post.html")) as f:
+            self.assertEqual(f.read(), "<article><div><h1>Post</h1></div></article>")
+        with open(self.output("index.html")) as f:
+            self.assertEqual(f.read(), "<title>Home</title><div><h1>Home</h1></div>")
+
+    def test_deleted_sources_are_pruned(self):
+        self.build()
+        os.unlink(os.path.join(self.content, "blog", "post.md"))
+        os.unlink(os.path.join(self.static, "site.css"))
+        self.build()
+        self.assertFalse(os.path.exists(self.output("blog")))
+        self.assertFalse(os.path.exists(self.output("site.css")))
+        self.assertTrue(os.path.exists(self.output("index.html")))
+
+    def test_outputs_of_a_full_build_are_pruned(self):
+        args = main.parse_args(["--manifest", self.manifest])
+        main.configure_build(args)
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.build_site(args, self.content, self.static, self.template, self.public)
+        os.unlink(os.path.join(self.content, "blog", "post.md"))
+        os.unlink(os.path.join(self.static, "site.css"))
+        for _ in range(2):
+            self.build()
+            self.assertFalse(os.path.exists(self.output("blog")))
+            self.assertFalse(os.path.exists(self.output("site.css")))
+            self.assertTrue(os.path.exists(self.output("index.html")))
+
+    def test_front_matter_sets_title_and_template(self):
+        self.write(os.path.join(self.content, "blog", "plain.html"), "<main>{{ Content }}</main>")
+        self.write(os.path.join(self.content, "blog", "post.md"),
+                   "---\ntitle: Front Title\ntemplate: plain.html\n---\n# Post")
+        self.write(os.path.join(self.content, "index.md"), "+++\ntitle = \"Home Page\"\n+++\n# Home")
+        self.build()
+        with open(self.output("blog", "post.html")) as f:
+            self.assertEqual(f.read(), "<main><div><h1>Post</h1></div></main>")
+        with open(self.output("index.html")) as f:
+            self.assertEqual(f.read(), "<title>Home Page</title><div><h1>Home</h1></div>")
+
+    def test_drafts_are_skipped_unless_requested(self):
+        self.write(os.path.join(self.content, "blog", "post.md"), "---\ndraft: true\n---\n# Post")
+        self.build()
+        self.assertFalse(os.path.exists(self.output("blog", "post.html")))
+        build_incremental(self.content, self.static, self.template, self.public, self.manifest, drafts=True)
+        self.assertTrue(os.path.exists(self.output("blog", "post.html")))
+        self.build()
+        self.assertFalse(os.path.exists(self.output("blog", "post.html")))
+
+    def test_site_index_is_saved_and_reused(self):
+        self.write(os.path.join(self.content, "blog", "post.md"),
+                   "---\ndate: 2024-05-01\ntags:\n  - news\n---\n# Post")
+        self.build()
+        index_path = os.path.join(self.root, ".site_index.json")
+        entry = SiteIndex.load(index_path).get(os.path.join("blog", "post.md"))
+        self.assertEqual((entry["title"], entry["date"], entry["tags"], entry["url"]),
+                         ("Post", "2024-05-01", ["news"], "/blog/post.html"))
+        os.utime(self.output("blog", "post.html"), ns=(0, 0))
+        self.build()
+        self.assertEqual(SiteIndex.load(index_path).get(os.path.join("blog", "post.md")), entry)
+        self.assertEqual(os.stat(self.output("blog", "post.html")).st_mtime_ns, 0)
+
+    def test_search_index_reuses_text_of_unchanged_pages(self):
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nAbout gardens.")
+        self.build()
+        # Entries from a build that didn't collect text get their pages rendered once more
+        main.stats.reset()
+        build_incremental(self.content, self.static, self.template, self.public, self.manifest, search_index=True)
+        self.assertEqual(main.stats.pages_rendered, 2)
+        main.stats.reset()
+        build_incremental(self.content, self.static, self.template, self.public, self.manifest, search_index=True)
+        self.assertEqual(main.stats.pages_rendered, 0)
+        with open(self.output("search-index.json")) as f:
+            data = json.load(f)
+        self.assertEqual(data["pages"], [["/blog/post.html", "Post"], ["/index.html", "Home"]])
+        self.assertEqual(data["terms"]["gardens"], [0])
+        self.build()
+        self.assertFalse(os.path.exists(self.output("search-index.json")))
+
+    def test_listings_are_written_and_pruned(self):
+        self.write(os.path.join(self.content, "blog", "post.md"), "---\ntags: [News]\n---\n# Post")
+        build_incremental(self.content, self.static, self.template, self.public, self.manifest, listings=True)
+        with open(self.output("tags", "news.html")) as f:
+            self.assertIn("<a href='/blog/post.html'>Post</a>", f.read())
+        self.assertTrue(os.path.exists(self.output("archive.html")))
+        self.build()
+        self.assertFalse(os.path.exists(self.output("archive.html")))
+        self.assertFalse(os.path.exists(self.output("tags")))
+
+    def test_minify_change_rerenders_pages(self):
+        self.build()
+        main.configure_minify(True)
+        self.addCleanup(main.configure_minify, False)
+        main.stats.reset()
+        self.build()
+        self.assertEqual(main.stats.pages_rendered, 2)
+        main.configure_minify(False)
+        main.stats.reset()
+        self.build()
+        self.assertEqual(main.stats.pages_rendered, 2)
+        main.stats.reset()
+        self.build()
+        self.assertEqual(main.stats.pages_rendered, 0)
+
+    def test_parser_version_change_rerenders_pages(self):
+        self.build()
+        manifest = load_manifest(self.manifest)
+        for record in manifest["pages"].values():
+            record["parser"] = "0"
+        save_manifest(self.manifest, manifest)
+        main.stats.reset()
+        self.build()
+        self.assertEqual(main.stats.pages_rendered, 2)
+
+    def test_compressed_siblings_are_written_and_pruned(self):
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\n" + "Compressible words. " * 40)
+        build_incremental(self.content, self.static, self.template, self.public, self.manifest, compress=True)
+        with open(self.output("blog", "post.html"), 'rb') as f, gzip.open(self.output("blog", "post.html.gz")) as g:
+            self.assertEqual(g.read(), f.read())
+        # Outputs below the size threshold get no sibling
+        self.assertFalse(os.path.exists(self.output("index.html.gz")))
+        # A no-op run leaves the siblings of untouched outputs unread
+        self.write(self.output("blog", "post.html.gz"), "untouched")
+        build_incremental(self.content, self.static, self.template, self.public, self.manifest, compress=True)
+        with open(self.output("blog", "post.html.gz")) as f:
+            self.assertEqual(f.read(), "untouched")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\n" + "Other words. " * 40)
+        build_incremental(self.content, self.static, self.template, self.public, self.manifest, compress=True)
+        with open(self.output("blog", "post.html"), 'rb') as f, gzip.open(self.output("blog", "post.html.gz")) as g:
+            self.assertEqual(g.read(), f.read())
+        os.unlink(os.path.join(self.content, "blog", "post.md"))
+        build_incremental(self.content, self.static, self.template, self.public, self.manifest, compress=True)
+        self.assertFalse(os.path.exists(self.output("blog")))
+
+class TestParallelBuild(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        os.makedirs(os.path.join(self.content, "docs"))
+        with open(self.template, 'w') as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+        for i in range(6):
+            with open(os.path.join(self.content, "docs", f"page{i}.md"), 'w') as f:
+                f.write(f"# Page {i}\n\nSee [home](/) and **bold** text.")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_tree(self, root):
+        files = {}
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                with open(path, 'rb') as f:
+                    files[os.path.relpath(path, root)] = f.read()
+        return files
+
+    def build_serial(self, public_dir):
+        # The serial reference is a plain full build, with the same discovery and render path
+        args = main.parse_args(["--manifest", os.path.join(self.tmp.name, ".build_manifest.json")])
+        main.configure_build(args)
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.build_site(args, self.content, os.path.join(self.tmp.name, "static"), self.template, public_dir)
+
+    def test_parallel_output_matches_serial(self):
+        serial = os.path.join(self.tmp.name, "serial")
+        parallel = os.path.join(self.tmp.name, "parallel")
+        self.build_serial(serial)
+        results = generate_pages_parallel(self.content, self.template, parallel, jobs=2)
+        self.assertEqual(self.read_tree(serial), self.read_tree(parallel))
+        self.assertEqual(len(results), 6)
+        self.assertTrue(all(result["hyperlinks"] == ["/"] for result in results))
+
+    def test_parallel_reports_failed_pages(self):
+        with open(os.path.join(self.content, "broken.md"), 'w') as f:
+            f.write("no title here")
+        with self.assertRaises(RuntimeError):
+            generate_pages_parallel(self.content, self.template, os.path.join(self.tmp.name, "out"), jobs=2)
+
+    def test_unchanged_pages_are_not_rewritten(self):
+        out = os.path.join(self.tmp.name, "out")
+        first = generate_pages_parallel(self.content, self.template, out, jobs=1)
+        self.assertTrue(all(result["changed"] for result in first))
+        page = os.path.join(out, "docs", "page0.html")
+        os.utime(page, ns=(1, 1))
+        with open(os.path.join(self.content, "docs", "page1.md"), 'a') as f:
+            f.write("\n\nMore.")
+        second = generate_pages_parallel(self.content, self.template, out, jobs=2)
+        self.assertEqual([os.path.basename(result["output"]) for result in second if result["changed"]],
+                         ["page1.html"])
+        self.assertEqual(os.stat(page).st_mtime_ns, 1)
+
+    def test_pipelined_output_matches_serial(self):
+        static = os.path.join(self.tmp.name, "static")
+        os.makedirs(os.path.join(static, "css"))
+        with open(os.path.join(static, "css", "site.css"), 'w') as f:
+            f.write("body {}")
+        serial = os.path.join(self.tmp.name, "serial")
+        self.build_serial(serial)
+        for jobs in (1, 2):
+            pipelined = os.path.join(self.tmp.name, f"pipelined{jobs}")
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = build_pipelined(self.content, static, self.template, pipelined, jobs=jobs, queue_size=2)
+            self.assertEqual(self.read_tree(pipelined), self.read_tree(serial))
+            self.assertEqual([result["source"] for result in results],
+                             sorted(result["source"] for result in results))
+
+    def test_page_text_is_collected_by_workers(self):
+        main.configure_text_collection(True)
+        self.addCleanup(main.configure_text_collection, False)
+        out = os.path.join(self.tmp.name, "out")
+        with contextlib.redirect_stdout(io.StringIO()):
+            parallel = generate_pages_parallel(self.content, self.template, out, jobs=2)
+            pipelined = build_pipelined(self.content, os.path.join(self.tmp.name, "static"), self.template, out, jobs=2)
+        self.assertEqual([result["text"] for result in parallel], [result["text"] for result in pipelined])
+        self.assertTrue(all(result["text"]["terms"] for result in parallel))
+
+    def test_pipelined_reports_failed_pages(self):
+        with open(os.path.join(self.content, "broken.md"), 'w') as f:
+            f.write("no title here")
+        out = os.path.join(self.tmp.name, "out")
+        with self.assertRaises(RuntimeError):
+            build_pipelined(self.content, os.path.join(self.tmp.name, "static"), self.template, out)
+        self.assertTrue(os.path.exists(os.path.join(out, "docs", "page0.html")))
+
+class TestStreamingRender(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "big.md")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        with open(self.template, 'w') as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+        with open(self.source, 'w') as f:
+            f.write("Intro before the title\n\n  # Big  Page \n\n")
+            for i in range(50):
+                f.write(f"Paragraph {i} with [a link](/p{i}) and ![img](/i{i}.png)\n\n- one\n- two\n\n```\ncode {i}\n```\n\n")
+        self.addCleanup(main.configure_streaming, main.stream_threshold)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def render(self, threshold, name):
+        main.configure_streaming(threshold)
+        dest_path = os.path.join(self.tmp.name, name)
+        links = render_page(self.source, self.template, dest_path)
+        with open(dest_path) as f:
+            return links, f.read()
+
+    def test_streamed_output_matches_in_memory(self):
+        in_memory = self.render(0, "memory.html")
+        streamed = self.render(1, "streamed.html")
+        self.assertEqual(streamed, in_memory)
+        self.assertEqual(len(streamed[0][0]), 50)
+        self.assertEqual(streamed[0][1][0], "/i0.png")
+
+    def test_streamed_text_matches_in_memory(self):
+        main.configure_text_collection(True)
+        self.addCleanup(main.configure_text_collection, False)
+        in_memory = self.render(0, "memory.html")
+        streamed = self.render(1, "streamed.html")
+        self.assertEqual(streamed[0][4], in_memory[0][4])
+        self.assertIn("paragraph", streamed[0][4]["terms"])
+
+    def test_streamed_minified_output_matches_in_memory(self):
+        main.configure_minify(True)
+        self.addCleanup(main.configure_minify, False)
+        in_memory = self.render(0, "memory.html")
+        streamed = self.render(1, "streamed.html")
+        self.assertEqual(streamed, in_memory)
+        self.assertIn("<pre><code>code 0</code></pre>", streamed[1])
+
+    def test_scan_title_matches_extract_title(self):
+        with open(self.source) as f:
+            self.assertEqual(scan_title(self.source), extract_title(f.read()))
+
+    def test_scan_title_without_heading(self):
+        with open(self.source, 'w') as f:
+            f.write("no title here\n")
+        with self.assertRaises(ValueError):
+            scan_title(self.source)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+from manifest import MANIFEST_VERSION, file_record, hash_file, load_manifest, save_manifest
+
+class TestManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "manifest.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_missing_manifest_is_empty(self):
+        manifest = load_manifest(self.path)
+        self.assertEqual(manifest, {"version": MANIFEST_VERSION, "pages": {}, "static": {}, "generated": [], "compressed": [],
+                                    "compressed_outputs": {}})
+
+    def test_round_trip(self):
+        manifest = load_manifest(self.path)
+        manifest["pages"]["index.md"] = {"hash": "abc", "output": "public/index.html"}
+        save_manifest(self.path, manifest)
+        self.assertEqual(load_manifest(self.path), manifest)
+
+    def test_corrupt_manifest_is_empty(self):
+        with open(self.path, 'w') as f:
+            f.write("{not json")
+        self.assertEqual(load_manifest(self.path)["pages"], {})
+
+    def test_file_record_reuses_hash_when_stat_matches(self):
+        source = os.path.join(self.tmp.name, "page.md")
+        with open(source, 'w') as f:
+            f.write("# Title")
+        record = file_record(source)
+        self.assertEqual(record["hash"], hash_file(source))
+        cached = dict(record, hash="cached")
+        self.assertEqual(file_record(source, cached)["hash"], "cached")
+
+if __name__ == '__main__':
+    unittest.main()
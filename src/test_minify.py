@@ -0,0 +1,41 @@
+import unittest
+from minify import minify_css, minify_html
+from template import Template
+
+class TestMinifyHTML(unittest.TestCase):
+
+    def test_whitespace_between_blocks_is_dropped(self):
+        html = "<div>\n  <p>One   two\n three</p>\n  <p>Four</p>\n</div>\n"
+        self.assertEqual(minify_html(html), "<div><p>One two three</p><p>Four</p></div> ")
+
+    def test_inline_whitespace_is_kept(self):
+        self.assertEqual(minify_html("<p><b>bold</b>  \n <i>italic</i></p>"), "<p><b>bold</b> <i>italic</i></p>")
+
+    def test_comments_are_dropped(self):
+        self.assertEqual(minify_html("<p>a <!-- note --> b</p>"), "<p>a b</p>")
+
+    def test_preformatted_text_is_kept(self):
+        html = "<pre><code>def f():\n    return  1\n</code></pre>\n<p>x  <code>a  b</code></p>"
+        self.assertEqual(minify_html(html), "<pre><code>def f():\n    return  1\n</code></pre><p>x <code>a  b</code></p>")
+
+    def test_script_and_attributes_are_kept(self):
+        html = "<script>\n  if (a  <b) {}\n</script>\n<a title='two  spaces' href='/x'>x</a>"
+        self.assertEqual(minify_html(html), "<script>\n  if (a  <b) {}\n</script> <a title='two  spaces' href='/x'>x</a>")
+
+    def test_template_edges_are_trimmed(self):
+        template = Template("<!DOCTYPE html>\n<html>\n<body>\n  {{ Content }}\n</body>\n</html>\n")
+        self.assertEqual(template.minified().literals, ["<!DOCTYPE html><html><body> ", " </body></html>"])
+        self.assertIs(template.minified(), template.minified())
+
+class TestMinifyCSS(unittest.TestCase):
+
+    def test_rules(self):
+        css = "/* layout */\nbody {\n  margin: 0 auto;\n  color: red;\n}\n\na :hover , b > c { x: y }\n"
+        self.assertEqual(minify_css(css), "body{margin:0 auto;color:red}a :hover,b > c{x:y}")
+
+    def test_strings_are_kept(self):
+        css = 'a::before { content: "  /* not a comment */  "; }'
+        self.assertEqual(minify_css(css), 'a::before{content:"  /* not a comment */  "}')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+from output import remove_stale_files, replace_if_changed, same_files, temp_path, write_if_changed
+
+class TestWriteIfChanged(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "page.html")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_identical_output_is_left_alone(self):
+        self.assertTrue(write_if_changed(self.path, "<p>one</p>"))
+        os.utime(self.path, ns=(1, 1))
+        self.assertFalse(write_if_changed(self.path, "<p>one</p>"))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 1)
+
+    def test_changed_output_is_replaced(self):
+        write_if_changed(self.path, "<p>one</p>")
+        self.assertTrue(write_if_changed(self.path, "<p>two</p>"))
+        with open(self.path) as f:
+            self.assertEqual(f.read(), "<p>two</p>")
+        self.assertEqual(os.listdir(self.tmp.name), ["page.html"])
+
+    def test_replace_if_changed(self):
+        write_if_changed(self.path, "same")
+        for contents, changed in (("same", False), ("different", True)):
+            tmp_path = temp_path(self.path)
+            with open(tmp_path, 'w') as f:
+                f.write(contents)
+            self.assertEqual(replace_if_changed(tmp_path, self.path), changed)
+            self.assertFalse(os.path.exists(tmp_path))
+        with open(self.path) as f:
+            self.assertEqual(f.read(), "different")
+
+    def test_same_files_missing_file(self):
+        write_if_changed(self.path, "x")
+        self.assertFalse(same_files(self.path, os.path.join(self.tmp.name, "missing")))
+
+class TestRemoveStaleFiles(unittest.TestCase):
+
+    def test_removes_unexpected_files_and_empty_dirs(self):
+        with tempfile.TemporaryDirectory() as root:
+            for relative_path in ("index.html", "old.html", os.path.join("a", "b", "gone.html"),
+                                  os.path.join("docs", "keep.html")):
+                path = os.path.join(root, relative_path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                open(path, 'w').close()
+            expected = [os.path.join(root, "index.html"), os.path.join(root, "docs", "keep.html")]
+            removed = remove_stale_files(root, expected)
+            self.assertEqual(sorted(os.path.relpath(path, root) for path in removed),
+                             sorted([os.path.join("a", "b", "gone.html"), "old.html"]))
+            self.assertEqual(sorted(os.listdir(root)), ["docs", "index.html"])
+
+if __name__ == '__main__':
+    unittest.main()
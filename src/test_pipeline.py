@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pipeline import Failed, run_build, run_chain
+
+class TestRunChain(unittest.TestCase):
+
+    def run_chain(self, items, stages, queue_size=2):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            stages = [(func, executor if threaded else None, workers) for func, threaded, workers in stages]
+            return asyncio.run(run_chain(items, stages, executor, queue_size))
+
+    def test_every_item_passes_every_stage(self):
+        finished = self.run_chain(range(1, 21), [
+            (lambda job, _: job * 2, True, 3),
+            (lambda job, value: value + 1, False, 1),
+        ])
+        self.assertEqual(sorted(finished), [(n, n * 2 + 1) for n in range(1, 21)])
+
+    def test_failures_skip_later_stages(self):
+        calls = []
+        def check(job, _):
+            if job == 3:
+                raise ValueError("bad page")
+            return job
+        def record(job, value):
+            calls.append(job)
+            return value
+        finished = dict(self.run_chain([1, 2, 3, 4], [(check, True, 2), (record, True, 2)]))
+        self.assertIsInstance(finished[3], Failed)
+        self.assertEqual(finished[3].error, "ValueError: bad page")
+        self.assertEqual(sorted(calls), [1, 2, 4])
+
+    def test_queues_are_bounded(self):
+        produced = []
+        release = threading.Event()
+        def items():
+            for n in range(1, 50):
+                produced.append(n)
+                yield n
+        def slow(job, _):
+            release.wait(5)
+            return job
+        # Discovery can only run a few items ahead of the blocked stage
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            async def run():
+                chain = asyncio.ensure_future(run_chain(items(), [(slow, executor, 1)], executor, 2))
+                await asyncio.sleep(0.2)
+                ahead = len(produced)
+                release.set()
+                return ahead, await chain
+            ahead, finished = asyncio.run(run())
+        self.assertLess(ahead, 10)
+        self.assertEqual(len(finished), 49)
+
+class TestRunBuild(unittest.TestCase):
+
+    def test_pages_and_files(self):
+        pages, files = run_build(
+            ["a", "b"],
+            read=lambda job, _: job.upper(),
+            render=lambda job, text: f"<p>{text}</p>",
+            write=lambda job, html: len(html),
+            files=["x"],
+            copy=lambda job, _: "copied",
+            io_workers=2,
+        )
+        self.assertEqual(sorted(pages), [("a", 8), ("b", 8)])
+        self.assertEqual(files, [("x", "copied")])
+
+if __name__ == '__main__':
+    unittest.main()
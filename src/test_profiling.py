@@ -0,0 +1,56 @@
+import types
+import unittest
+from profiling import Profiler
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.profiler = Profiler()
+        module = types.SimpleNamespace()
+        module.inner = lambda x: x * 2
+        module.outer = lambda page: module.inner(3) + module.inner(4)
+        module.numbers = lambda: (i for i in range(3))
+        self.module = module
+
+    def test_nested_stages_and_pages(self):
+        self.profiler.instrument(self.module, "inner")
+        self.profiler.instrument(self.module, "outer", "page", page_arg=0)
+        self.assertEqual(self.module.outer("a.md"), 14)
+        self.module.outer("b.md")
+
+        calls, total, self_time = self.profiler.stages["page"]
+        self.assertEqual(calls, 2)
+        self.assertLessEqual(self_time, total)
+        self.assertEqual(self.profiler.stages["inner"][0], 4)
+        self.assertEqual({page for page, _ in self.profiler.slowest_pages()}, {"a.md", "b.md"})
+
+    def test_generators_are_timed_per_resume(self):
+        self.profiler.instrument(self.module, "numbers", "blocks")
+        self.assertEqual(list(self.module.numbers()), [0, 1, 2])
+        self.assertEqual(list(self.module.numbers()), [0, 1, 2])
+        # Two calls; their time includes the creating call and four resumes each, the last
+        # one raising StopIteration
+        calls, total, _ = self.profiler.stages["blocks"]
+        self.assertEqual(calls, 2)
+        events = self.profiler.trace()["traceEvents"]
+        self.assertEqual(len(events), 10)
+        self.assertAlmostEqual(total * 1e6, sum(event["dur"] for event in events), delta=1)
+
+    def test_restore(self):
+        original = self.module.inner
+        self.profiler.instrument(self.module, "inner")
+        self.assertIsNot(self.module.inner, original)
+        self.profiler.restore()
+        self.assertIs(self.module.inner, original)
+
+    def test_trace_and_summary(self):
+        self.profiler.instrument(self.module, "outer", "page", page_arg=0)
+        self.module.outer("a.md")
+        event = self.profiler.trace()["traceEvents"][0]
+        self.assertEqual((event["name"], event["ph"], event["args"]), ("page", "X", {"page": "a.md"}))
+        summary = self.profiler.summary(top=1)
+        self.assertIn("page", summary)
+        self.assertIn("Slowest 1 pages:", summary)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from renderer import Renderer
+
+class TestRenderer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.template = os.path.join(self.root, "template.html")
+        with open(self.template, 'w') as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_render_string_without_template(self):
+        self.assertEqual(Renderer().render_string("Some **bold** text"), "<div><p>Some <b>bold</b> text</p></div>")
+
+    def test_render_string_with_template(self):
+        renderer = Renderer(self.template)
+        self.assertEqual(renderer.render_string("# Hello"), "<title>Hello</title><div><h1>Hello</h1></div>")
+        self.assertEqual(renderer.render_string("---\ntitle: Front\n---\n# Hello"),
+                         "<title>Front</title><div><h1>Hello</h1></div>")
+
+    def test_template_source_and_default_title(self):
+        renderer = Renderer(template="[{{ Title }}]", default_title="Preview")
+        self.assertEqual(renderer.render_string("no heading"), "[Preview]")
+        with self.assertRaises(ValueError):
+            Renderer(template="{{ Title }}").render_string("no heading")
+
+    def test_render_string_across_threads(self):
+        renderer = Renderer(self.template)
+        documents = [f"# Page {i}\n\n- item {i}\n\n```python\nx = {i}\n```" for i in range(50)]
+        expected = [renderer.render_string(document) for document in documents]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            self.assertEqual(list(executor.map(renderer.render_string, documents * 4)), expected * 4)
+
+    def test_build(self):
+        content = os.path.join(self.root, "content")
+        os.makedirs(os.path.join(content, "blog"))
+        with open(os.path.join(content, "blog", "post.md"), 'w') as f:
+            f.write("# Post")
+        renderer = Renderer(self.template, static_dir=os.path.join(self.root, "static"))
+        public = os.path.join(self.root, "site")
+        results = renderer.build(content, public)
+        self.assertEqual([result["title"] for result in results], ["Post"])
+        with open(os.path.join(public, "blog", "post.html")) as f:
+            self.assertEqual(f.read(), "<title>Post</title><div><h1>Post</h1></div>")
+        self.assertTrue(os.path.exists(os.path.join(self.root, ".site.site_index.json")))
+
+    def test_sibling_output_directories_keep_their_pages(self):
+        for site in ("a", "b"):
+            os.makedirs(os.path.join(self.root, f"content-{site}"))
+            with open(os.path.join(self.root, f"content-{site}", f"only{site}.md"), 'w') as f:
+                f.write(f"# Only {site}")
+        static = os.path.join(self.root, "static")
+        out = os.path.join(self.root, "out")
+        for options in ({}, {"incremental": True}):
+            for site in ("a", "b"):
+                Renderer(self.template, static_dir=static, **options).build(
+                    os.path.join(self.root, f"content-{site}"), os.path.join(out, site))
+            for site in ("a", "b"):
+                self.assertTrue(os.path.exists(os.path.join(out, site, f"only{site}.html")))
+        self.assertEqual(sorted(os.listdir(out)), [".a.build_manifest.json", ".a.site_index.json",
+                                                   ".b.build_manifest.json", ".b.site_index.json", "a", "b"])
+
+    def test_unknown_option(self):
+        with self.assertRaises(TypeError):
+            Renderer(self.template, job=2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+from siteindex import SiteIndex, listing_pages, page_entry, parse_date, tag_slug, tag_slugs
+
+def entry(name, date=None, tags=()):
+    meta = {"title": name.title(), "tags": list(tags), "draft": False}
+    if date:
+        meta["date"] = date
+    return page_entry(meta, f"content/{name}.md", os.path.join("public", f"{name}.html"), "public")
+
+class TestSiteIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SiteIndex()
+        self.index.add("old.md", entry("old", "2023-01-01", ["News"]))
+        self.index.add("new.md", entry("new", "2024-01-01", ["News", "C++ Tips"]))
+        self.index.add("about.md", entry("about"))
+
+    def test_entries_newest_first_undated_last(self):
+        self.assertEqual([page["url"] for page in self.index.entries()], ["/new.html", "/old.html", "/about.html"])
+
+    def test_dates_are_compared_as_dates(self):
+        self.index.add("later.md", entry("later", "2024-01-01T09:00:00+02:00"))
+        self.assertEqual([page["url"] for page in self.index.entries()][:2], ["/later.html", "/new.html"])
+        self.assertEqual(parse_date("2024-01-01T09:00:00+02:00").hour, 7)
+        self.assertIsNone(parse_date("2024/01/01"))
+
+    def test_non_iso_date_is_dropped(self):
+        with self.assertLogs("static_site", "WARNING"):
+            self.assertIsNone(entry("odd", "2024/01/01")["date"])
+
+    def test_tags(self):
+        tags = self.index.tags()
+        self.assertEqual(list(tags), ["C++ Tips", "News"])
+        self.assertEqual([page["title"] for page in tags["News"]], ["New", "Old"])
+        self.assertEqual(tag_slug("C++ Tips"), "c-tips")
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.json")
+            self.index.save(path)
+            self.assertEqual(SiteIndex.load(path).pages, self.index.pages)
+            with open(path, 'w') as f:
+                f.write("{broken")
+            self.assertEqual(len(SiteIndex.load(path)), 0)
+
+    def test_listing_pages(self):
+        pages = {os.path.relpath(path, "public"): (title, node.to_html())
+                 for path, title, node in listing_pages(self.index, "public")}
+        self.assertEqual(sorted(pages), ["archive.html", os.path.join("tags", "c-tips.html"),
+                                         os.path.join("tags", "index.html"), os.path.join("tags", "news.html")])
+        self.assertEqual(pages[os.path.join("tags", "news.html")][1],
+                         "<div><ul><li><a href='/new.html'>New</a> (2024-01-01)</li>"
+                         "<li><a href='/old.html'>Old</a> (2023-01-01)</li></ul></div>")
+        self.assertIn("<a href='/tags/news.html'>News</a> (2)", pages[os.path.join("tags", "index.html")][1])
+
+    def test_colliding_tag_slugs_are_numbered(self):
+        self.assertEqual(tag_slugs(["C", "C++", "Index"]), {"C": "c", "C++": "c-2", "Index": "index-2"})
+        self.index.add("c.md", entry("c", tags=["C"]))
+        self.index.add("cpp.md", entry("cpp", tags=["C++"]))
+        paths = [os.path.relpath(path, "public") for path, _, _ in listing_pages(self.index, "public")]
+        self.assertIn(os.path.join("tags", "c.html"), paths)
+        self.assertIn(os.path.join("tags", "c-2.html"), paths)
+
+    def test_listing_over_a_page_raises(self):
+        self.index.add("archive.md", entry("archive"))
+        with self.assertRaises(ValueError):
+            list(listing_pages(self.index, "public"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import io
+import os
+import tempfile
+import unittest
+from template import Template, directory_template, load_template, page_template
+
+class TestTemplate(unittest.TestCase):
+
+    def test_render_slots(self):
+        template = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        self.assertEqual(template.slots, ["Title", "Content"])
+        self.assertEqual(
+            template.render({"Title": "Home", "Content": "<p>Hi</p>"}),
+            "<title>Home</title><main><p>Hi</p></main>",
+        )
+
+    def test_arbitrary_slots_and_spacing(self):
+        template = Template("{{Author}} wrote {{  Title }} in {{ Year }}")
+        self.assertEqual(template.render({"Author": "Tolkien", "Title": "LOTR", "Year": "1954"}), "Tolkien wrote LOTR in 1954")
+
+    def test_missing_values_keep_placeholder(self):
+        template = Template("<p>{{ Content }}</p><footer>{{ Footer }}</footer>")
+        self.assertEqual(template.render({"Content": "x"}), "<p>x</p><footer>{{ Footer }}</footer>")
+
+    def test_repeated_slot(self):
+        template = Template("{{ Title }} | {{ Title }}")
+        self.assertEqual(template.render({"Title": "A"}), "A | A")
+
+    def test_write_streams_callable_values(self):
+        template = Template("<title>{{ Title }}</title>{{ Content }}{{ Footer }}")
+        buffer = io.StringIO()
+        template.write(buffer, {"Title": "Home", "Content": lambda fp: fp.write("<p>streamed</p>")})
+        self.assertEqual(buffer.getvalue(), "<title>Home</title><p>streamed</p>{{ Footer }}")
+
+    def test_no_slots(self):
+        self.assertEqual(Template("plain").render({}), "plain")
+
+class TestTemplateLoading(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def test_cache_reused_until_mtime_changes(self):
+        path = os.path.join(self.root, "template.html")
+        self.write(path, "{{ Title }}")
+        first = load_template(path)
+        self.assertIs(load_template(path), first)
+
+        self.write(path, "<h1>{{ Title }}</h1>")
+        os.utime(path, ns=(1, 1))
+        self.assertEqual(load_template(path).render({"Title": "x"}), "<h1>x</h1>")
+
+    def test_directory_and_page_templates(self):
+        default = os.path.join(self.root, "default.html")
+        docs = os.path.join(self.root, "docs")
+        os.makedirs(docs)
+        self.assertEqual(directory_template(docs, default), default)
+
+        self.write(os.path.join(docs, "template.html"), "")
+        docs_template = directory_template(docs, default)
+        self.assertEqual(docs_template, os.path.join(docs, "template.html"))
+
+        page = os.path.join(docs, "api.md")
+        self.assertEqual(page_template(page, docs_template), docs_template)
+        self.write(os.path.join(docs, "api.template.html"), "")
+        self.assertEqual(page_template(page, docs_template), os.path.join(docs, "api.template.html"))
+
+if __name__ == '__main__':
+    unittest.main()
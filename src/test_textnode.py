@@ -1,5 +1,5 @@
 import unittest
-from textnode import TextNode, text_type_text, text_type_bold, text_type_italic, text_type_code, split_nodes_delimiter, split_nodes_link, split_nodes_image, text_type_image, text_type_link, text_to_textnodes, markdown_to_blocks, block_to_block_type, markdown_to_html_node
+from textnode import TextNode, text_type_text, text_type_bold, text_type_italic, text_type_code, split_nodes_delimiter, split_nodes_link, split_nodes_image, text_type_image, text_type_link, text_to_textnodes, markdown_to_blocks, parse_blocks, block_to_block_type, markdown_to_html_node, iter_html_nodes, InlineCache, INLINE_CACHE_MAX_FRAGMENT, text_nodes_to_html_nodes
 from htmlnode import HTMLNode
 
 class TestTextNode(unittest.TestCase):
@@ -186,6 +186,42 @@ class TestTextToTextNodes(unittest.TestCase):
         ]
         self.assertEqual(text_to_textnodes(text), expected)
 
+    def test_text_to_textnodes_code_protects_delimiters(self):
+        text = "Use `a*b` and *c*"
+        expected = [
+            TextNode("Use ", text_type_text),
+            TextNode("a*b", text_type_code),
+            TextNode(" and ", text_type_text),
+            TextNode("c", text_type_italic),
+        ]
+        self.assertEqual(text_to_textnodes(text), expected)
+
+    def test_text_to_textnodes_bold_inside_link(self):
+        text = "See [the **best** docs](https://example.com)"
+        expected = [
+            TextNode("See ", text_type_text),
+            TextNode("the **best** docs", text_type_link, "https://example.com", [
+                TextNode("the ", text_type_text),
+                TextNode("best", text_type_bold),
+                TextNode(" docs", text_type_text),
+            ]),
+        ]
+        self.assertEqual(text_to_textnodes(text), expected)
+
+    def test_text_to_textnodes_italic_inside_bold(self):
+        nodes = text_to_textnodes("**very *nested* text**")
+        self.assertEqual(len(nodes), 1)
+        self.assertEqual(nodes[0].text_type, text_type_bold)
+        self.assertEqual(nodes[0].children[1], TextNode("nested", text_type_italic))
+
+    def test_text_to_textnodes_unmatched_brackets(self):
+        text = "[ ] todo and ! bang"
+        self.assertEqual(text_to_textnodes(text), [TextNode(text, text_type_text)])
+
+    def test_nested_nodes_render_to_html(self):
+        html = markdown_to_html_node("A [**bold** link](/x) here").to_html()
+        self.assertEqual(html, "<div><p>A <a href='/x'><b>bold</b> link</a> here</p></div>")
+
 class TestMarkdownToBlocks(unittest.TestCase):
     def test_basic_split(self):
         markdown = "# This is a heading\n\nThis is a paragraph of text. It has some **bold** and *italic* words inside of it.\n\n* This is the first list item in a list block\n* This is a list item\n* This is another list item"
@@ -219,6 +255,146 @@ class TestMarkdownToBlocks(unittest.TestCase):
         print("Actual:", actual)
         self.assertEqual(actual, expected)
 
+    def test_fenced_code_keeps_blank_and_hash_lines(self):
+        markdown = "Intro\n\n```\n# not a heading\n\nprint('hi')\n```\n\nOutro"
+        expected = [
+            "Intro",
+            "```\n# not a heading\n\nprint('hi')\n```",
+            "Outro",
+        ]
+        self.assertEqual(markdown_to_blocks(markdown), expected)
+
+    def test_heading_interrupts_paragraph(self):
+        self.assertEqual(markdown_to_blocks("Some text\n## Next"), ["Some text", "## Next"])
+
+    def test_list_items_separated_by_blank_lines(self):
+        self.assertEqual(markdown_to_blocks("* one\n\n* two\n\nAfter"), ["* one\n* two", "After"])
+
+    def test_lazy_list_continuation(self):
+        self.assertEqual(markdown_to_blocks("* one\n  continued\n* two"), ["* one continued\n* two"])
+
+class TestParseBlocks(unittest.TestCase):
+    def test_typed_blocks(self):
+        markdown = "# Title\n\n> quoted\n> more\n\n1. a\n2. b\n- c\n\n```\ncode\n```\n\ntext"
+        expected = [
+            ("heading", "# Title"),
+            ("quote", "> quoted\n> more"),
+            ("ordered_list", "1. a\n2. b"),
+            ("unordered_list", "- c"),
+            ("code", "```\ncode\n```"),
+            ("paragraph", "text"),
+        ]
+        self.assertEqual(list(parse_blocks(markdown)), expected)
+
+    def test_types_match_block_to_block_type(self):
+        markdown = "## Sub\n\n1. a\n3. b\n\n+ plus\n\n* star\n- dash"
+        for block_type, block in parse_blocks(markdown):
+            self.assertEqual(block_type, block_to_block_type(block))
+
+    def test_empty_headings_and_quotes_are_text(self):
+        self.assertEqual(markdown_to_html_node("para\n#\nmore").to_html(), "<div><p>para\n#\nmore</p></div>")
+        self.assertEqual(markdown_to_html_node("#\n\n>\n\nafter").to_html(), "<div><p>#</p><p>></p><p>after</p></div>")
+
+    def test_unclosed_fence_runs_to_end(self):
+        self.assertEqual(list(parse_blocks("```\ncode\n\nmore")), [("code", "```\ncode\n\nmore")])
+
+class TestCodeBlocks(unittest.TestCase):
+    def test_language_is_not_part_of_the_content(self):
+        html = markdown_to_html_node("```python\nreturn None\n```").to_html()
+        self.assertEqual(html, "<div><pre><code class='language-python'><span class='k'>return</span> "
+                               "<span class='kc'>None</span></code></pre></div>")
+
+    def test_fence_closes_only_on_a_bare_fence_as_long_as_the_opening(self):
+        markdown = "````md\n```py\nx\n```\n````\n\nafter"
+        self.assertEqual(list(parse_blocks(markdown)), [("code", "````md\n```py\nx\n```\n````"), ("paragraph", "after")])
+        html = markdown_to_html_node(markdown).to_html()
+        self.assertEqual(html, "<div><pre><code class='language-md'>```py\nx\n```</code></pre><p>after</p></div>")
+
+    def test_fence_without_language(self):
+        html = markdown_to_html_node("```\nreturn None\n```").to_html()
+        self.assertEqual(html, "<div><pre><code>return None</code></pre></div>")
+
+    def test_markup_is_escaped_with_and_without_language(self):
+        bare = markdown_to_html_node("```\n<b>a & b</b>\n```").to_html()
+        self.assertEqual(bare, "<div><pre><code>&lt;b&gt;a &amp; b&lt;/b&gt;</code></pre></div>")
+        unknown = markdown_to_html_node("```text\n<b>a & b</b>\n```").to_html()
+        self.assertEqual(unknown, "<div><pre><code class='language-text'>&lt;b&gt;a &amp; b&lt;/b&gt;</code></pre></div>")
+
+    def test_info_string_uses_first_word(self):
+        html = markdown_to_html_node("``` text title=example\nplain\n```").to_html()
+        self.assertEqual(html, "<div><pre><code class='language-text'>plain</code></pre></div>")
+
+class TestIterHTMLNodes(unittest.TestCase):
+    def test_matches_markdown_to_html_node(self):
+        markdown = "# Title\n\nSome **bold** text\n\n- a\n- b\n\n```\ncode\n```"
+        lines = iter(markdown.splitlines(keepends=True))
+        self.assertEqual(list(iter_html_nodes(lines)), markdown_to_html_node(markdown).children)
+
+    def test_nodes_come_out_before_input_ends(self):
+        consumed = []
+        def lines():
+            for line in ["# Title\n", "\n", "para\n", "\n", "rest\n"]:
+                consumed.append(line)
+                yield line
+        nodes = iter_html_nodes(lines())
+        self.assertEqual(next(nodes).tag, "h1")
+        self.assertEqual(len(consumed), 1)
+        self.assertEqual(next(nodes).tag, "p")
+        self.assertEqual(len(consumed), 4)
+
+class TestInlineCache(unittest.TestCase):
+    def test_repeated_text_is_a_hit(self):
+        cache = InlineCache()
+        first = cache.children("A [link](/x) and **bold**")
+        second = cache.children("A [link](/x) and **bold**")
+        self.assertEqual(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        second.append("extra")
+        self.assertEqual(len(cache.children("A [link](/x) and **bold**")), 4)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = InlineCache(max_entries=2)
+        for text in ("one", "two", "one", "three"):
+            cache.children(text)
+        self.assertEqual(list(cache.entries), ["one", "three"])
+        cache.resize(1)
+        self.assertEqual(list(cache.entries), ["three"])
+
+    def test_cached_text_is_bounded_by_size(self):
+        cache = InlineCache(max_chars=10)
+        for text in ("four", "five!", "six..."):
+            cache.children(text)
+        self.assertEqual(list(cache.entries), ["six..."])
+        self.assertEqual(cache.chars, 6)
+        # Long fragments are converted but never kept
+        long_text = "word " * (INLINE_CACHE_MAX_FRAGMENT // 5 + 1)
+        self.assertEqual(cache.children(long_text)[0].value, long_text)
+        self.assertNotIn(long_text, cache.entries)
+
+    def test_disabled_cache_still_converts(self):
+        cache = InlineCache(max_entries=0)
+        self.assertEqual(cache.children("*hi*"), InlineCache().children("*hi*"))
+        self.assertEqual(len(cache.entries), 0)
+
+    def test_repeated_list_items_render_the_same(self):
+        markdown = "* [Home](/)\n* [Docs](/docs)\n\n1. [Home](/)\n2. [Docs](/docs)"
+        self.assertEqual(markdown_to_html_node(markdown).to_html(),
+                         "<div><ul><li><a href='/'>Home</a></li><li><a href='/docs'>Docs</a></li></ul>"
+                         "<ol><li><a href='/'>Home</a></li><li><a href='/docs'>Docs</a></li></ol></div>")
+
+class TestTextNodesToHTMLNodes(unittest.TestCase):
+    def test_every_text_type(self):
+        nodes = text_to_textnodes("a **b** *c* `d` [e](/f) ![g](/h.png) [**i** j](/k)")
+        html = "".join(node.to_html() for node in text_nodes_to_html_nodes(nodes))
+        self.assertEqual(html, "a <b>b</b> <i>c</i> <code>d</code> <a href='/f'>e</a> "
+                               "<img src='/h.png' alt='g' /> <a href='/k'><b>i</b> j</a>")
+
+    def test_invalid_text_type(self):
+        with self.assertRaises(ValueError):
+            text_nodes_to_html_nodes([TextNode("x", "underline")])
+        with self.assertRaises(ValueError):
+            text_nodes_to_html_nodes([TextNode("x", text_type_code, children=[TextNode("x", text_type_text)])])
+
 class TestBlockToBlockType(unittest.TestCase):
     def test_heading(self):
         self.assertEqual(block_to_block_type("# This is a heading"), "heading")
@@ -1,5 +1,10 @@
-from htmlnode import HTMLNode, LeafNode, ParentNode
-import re
+import html
+import threading
+from collections import OrderedDict
+
+from htmlnode import TEXT_TYPE_CONVERTERS, HTMLNode, LeafNode, ParentNode, make_leaf
+from patterns import (IMAGE_PATTERN, INLINE_DELIMITER_PATTERN, INLINE_START_PATTERN, LINK_PATTERN,
+                      LINK_SPLIT_PATTERN, ORDERED_ITEM_PATTERN)
 
 # Define TextNode types
 text_type_text = "text"
@@ -9,11 +14,28 @@ text_type_code = "code"
 text_type_link = "link"
 text_type_image = "image"
 
+# Only these spans can wrap other inline nodes, e.g. [**bold** link](url)
+NESTED_TAGS = {text_type_bold: "b", text_type_italic: "i", text_type_link: "a"}
+
+# Bump whenever parsing produces a different node tree, so cached trees are not reused
+PARSER_VERSION = "5"
+
+INLINE_CACHE_SIZE = 4096
+# Only short fragments repeat across pages; longer ones are converted without being kept, and
+# the cached text as a whole stays under INLINE_CACHE_CHARS so streamed pages stay bounded
+INLINE_CACHE_MAX_FRAGMENT = 1024
+INLINE_CACHE_CHARS = 1 << 20
+
+
 class TextNode:
-    def __init__(self, text, text_type, url=None):
+    __slots__ = ("text", "text_type", "url", "children")
+
+    def __init__(self, text, text_type, url=None, children=None):
         self.text = text
         self.text_type = text_type
         self.url = url
+        # Inline nodes nested inside a bold, italic or link span, e.g. [**bold** link](url)
+        self.children = children
 
     def __eq__(self, other):
         return (
@@ -21,6 +43,7 @@ class TextNode:
             and self.text == other.text
             and self.text_type == other.text_type
             and self.url == other.url
+            and self.children == other.children
         )
 
     def __repr__(self):
@@ -57,8 +80,7 @@ def split_nodes_image(old_nodes):
             new_nodes.append(node)
             continue
         
-        pattern = r"!\[(.*?)\]\((.*?)\)"
-        matches = re.finditer(pattern, node.text)
+        matches = IMAGE_PATTERN.finditer(node.text)
         last_end = 0
         
         for match in matches:
@@ -84,8 +106,7 @@ def split_nodes_link(old_nodes):
             new_nodes.append(node)
             continue
         
-        pattern = r'(?<!!)\[([^\]]+)\]\(([^)]+)\)'  # This pattern excludes image syntax
-        parts = re.split(pattern, node.text)
+        parts = LINK_SPLIT_PATTERN.split(node.text)
         
         for i, part in enumerate(parts):
             if i % 3 == 0:  # Text part
@@ -98,63 +119,184 @@ def split_nodes_link(old_nodes):
     
     return [node for node in new_nodes if node.text]
 
+def find_closing_delimiter(text, delimiter, pos):
+    # Code spans bind tighter than emphasis, so delimiters inside them are skipped
+    while True:
+        match = INLINE_DELIMITER_PATTERN.search(text, pos)
+        if match is None:
+            return -1
+        token = match.group()
+        if token == delimiter:
+            return match.start()
+        pos = match.end()
+        if token == "`":
+            code_end = text.find("`", pos)
+            if code_end != -1:
+                pos = code_end + 1
+
+def nested_textnode(text, text_type, url=None):
+    children = text_to_textnodes(text)
+    if len(children) == 1 and children[0].text_type == text_type_text:
+        children = None
+    return TextNode(text, text_type, url, children or None)
+
 def text_to_textnodes(text):
-    nodes = [TextNode(text, text_type_text)]
-    # Process code formatting first to prevent conflicts
-    nodes = split_nodes_delimiter(nodes, "`", text_type_code)
-    # Process bold before italic to handle nested formatting
-    nodes = split_nodes_delimiter(nodes, "**", text_type_bold)
-    nodes = split_nodes_delimiter(nodes, "*", text_type_italic)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    return [node for node in nodes if node.text]  # Remove empty nodes
+    # Single left-to-right scan: plain runs are sliced out between recognised spans
+    nodes = []
+    plain_start = 0
+    pos = 0
+    while True:
+        match = INLINE_START_PATTERN.search(text, pos)
+        if match is None:
+            break
+        start = match.start()
+        char = text[start]
+        node = None
 
-def markdown_to_blocks(markdown):
-    # Split the markdown into blocks based on headings, paragraphs, and list items
-    blocks = re.split(r'(\n\s*\n|\n(?=\#))', markdown)
-    
-    # Strip leading and trailing whitespace from each block and remove empty blocks
-    blocks = [block.strip() for block in blocks if block.strip()]
-    
-    # Combine consecutive list items into single blocks
-    combined_blocks = []
-    current_block = []
-    for block in blocks:
-        if block.startswith(('* ', '- ', '+ ')) or re.match(r'^\d+\.', block):
-            current_block.append(block)
+        # An unclosed delimiter formats the rest of the text, as the old split passes did
+        if char == "`":
+            end = text.find("`", start + 1)
+            if end == -1:
+                end = len(text)
+            node = TextNode(text[start + 1:end], text_type_code)
+            next_pos = end + 1
+        elif char == "*":
+            delimiter = "**" if text.startswith("**", start) else "*"
+            content_start = start + len(delimiter)
+            end = find_closing_delimiter(text, delimiter, content_start)
+            if end == -1:
+                end = len(text)
+            text_type = text_type_bold if delimiter == "**" else text_type_italic
+            node = nested_textnode(text[content_start:end], text_type)
+            next_pos = end + len(delimiter)
+        elif char == "!":
+            image_match = IMAGE_PATTERN.match(text, start)
+            if image_match:
+                node = TextNode(image_match.group(1), text_type_image, image_match.group(2))
+                next_pos = image_match.end()
         else:
-            if current_block:
-                combined_blocks.append('\n'.join(current_block))
-                current_block = []
-            combined_blocks.append(block)
-    if current_block:
-        combined_blocks.append('\n'.join(current_block))
-    
-    # Separate ordered list items from unordered list items
-    final_blocks = []
-    for block in combined_blocks:
-        if '\n' in block and (block.startswith(('* ', '- ', '+ ')) or re.match(r'^\d+\.', block)):
-            unordered = []
-            ordered = []
-            for line in block.split('\n'):
-                if line.startswith(('* ', '- ', '+ ')):
-                    if ordered:
-                        final_blocks.append('\n'.join(ordered))
-                        ordered = []
-                    unordered.append(line)
-                elif re.match(r'^\d+\.', line):
-                    if unordered:
-                        final_blocks.append('\n'.join(unordered))
-                        unordered = []
-                    ordered.append(line)
-            if unordered:
-                final_blocks.append('\n'.join(unordered))
-            if ordered:
-                final_blocks.append('\n'.join(ordered))
+            link_match = LINK_PATTERN.match(text, start)
+            if link_match:
+                node = nested_textnode(link_match.group(1), text_type_link, link_match.group(2))
+                next_pos = link_match.end()
+
+        if node is None:
+            pos = start + 1
+            continue
+        if start > plain_start:
+            nodes.append(TextNode(text[plain_start:start], text_type_text))
+        if node.text:
+            nodes.append(node)
+        pos = plain_start = next_pos
+
+    if plain_start < len(text):
+        nodes.append(TextNode(text[plain_start:], text_type_text))
+    return nodes
+
+LIST_BLOCK_TYPES = ("unordered_list", "ordered_list")
+
+def line_to_block_type(stripped_line):
+    if stripped_line.startswith("```"):
+        return "code"
+    if stripped_line.startswith("#"):
+        return "heading"
+    if stripped_line.startswith(">"):
+        return "quote"
+    if stripped_line.startswith(('* ', '- ', '+ ')):
+        return "unordered_list"
+    if ORDERED_ITEM_PATTERN.match(stripped_line):
+        return "ordered_list"
+    return "paragraph"
+
+def fence_length(stripped_line):
+    return len(stripped_line) - len(stripped_line.lstrip("`"))
+
+def closes_fence(stripped_line, length):
+    # Only a bare fence at least as long as the opening one closes it; "```py" inside a
+    # "````" block is content
+    return len(stripped_line) >= length and not stripped_line.strip("`")
+
+def iter_blocks(lines):
+    # Line-oriented state machine: each line is classified once and blocks come out typed
+    block_type = None
+    block_lines = []
+    fence = 0
+    well_formed = True
+    blank_pending = False
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+        stripped = line.strip()
+
+        if block_type == "code":
+            block_lines.append(line)
+            if closes_fence(stripped, fence):
+                yield "code", "\n".join(block_lines).strip()
+                block_type = None
+            continue
+
+        if not stripped:
+            # Lists separated by blank lines still form one block, as in the old splitter
+            if block_type in LIST_BLOCK_TYPES:
+                blank_pending = True
+            elif block_type is not None:
+                yield block_type, "\n".join(block_lines)
+                block_type = None
+            continue
+
+        line_type = line_to_block_type(stripped)
+        if line_type == "heading" and not stripped.strip("#").strip():
+            # A bare "#" line is text that stays in the block around it
+            line_type = "paragraph"
+        if block_type is not None and (
+            line_type in ("code", "heading")
+            or (blank_pending and line_type != block_type)
+            or (block_type in LIST_BLOCK_TYPES and line_type in LIST_BLOCK_TYPES and line_type != block_type)
+        ):
+            if block_type in LIST_BLOCK_TYPES and not well_formed:
+                block_type = "paragraph"
+            yield block_type, "\n".join(block_lines)
+            block_type = None
+        blank_pending = False
+
+        if line_type == "heading":
+            yield "heading", stripped
+        elif line_type == "code":
+            if stripped.strip("`") and stripped.endswith("```"):
+                yield "code", stripped
+            else:
+                block_type = "code"
+                block_lines = [line]
+                fence = fence_length(stripped)
+        elif block_type is None:
+            block_type = line_type
+            block_lines = [stripped]
+            well_formed = list_item_is_well_formed(line_type, stripped, 1)
+        elif block_type in LIST_BLOCK_TYPES and line_type != block_type:
+            # Lazy continuation of the previous list item
+            block_lines[-1] = f"{block_lines[-1]} {stripped}"
         else:
-            final_blocks.append(block)
-    
-    return final_blocks
+            block_lines.append(stripped)
+            if block_type in LIST_BLOCK_TYPES:
+                well_formed = well_formed and list_item_is_well_formed(block_type, stripped, len(block_lines))
+
+    if block_type is not None:
+        if block_type in LIST_BLOCK_TYPES and not well_formed:
+            block_type = "paragraph"
+        yield block_type, "\n".join(block_lines).strip()
+
+def list_item_is_well_formed(block_type, stripped_line, number):
+    if block_type == "unordered_list":
+        return stripped_line.startswith(('* ', '- '))
+    if block_type == "ordered_list":
+        return stripped_line.startswith(f"{number}. ")
+    return True
+
+def parse_blocks(markdown):
+    return iter_blocks(markdown.split("\n"))
+
+def markdown_to_blocks(markdown):
+    return [block for _, block in parse_blocks(markdown)]
 
 def block_to_block_type(block):
     lines = block.split('\n')
@@ -199,90 +341,146 @@ def block_to_html_node(block, block_type):
         raise ValueError(f"Invalid block type: {block_type}")
 
 def paragraph_to_html_node(block):
-    text_nodes = text_to_textnodes(block)
-    child_nodes = text_nodes_to_html_nodes(text_nodes)
-    return ParentNode("p", child_nodes)
+    return ParentNode("p", text_to_children(block))
 
 def text_nodes_to_html_nodes(text_nodes):
+    # One table lookup per node instead of a chain of text type comparisons
+    converters = TEXT_TYPE_CONVERTERS
     html_nodes = []
     for text_node in text_nodes:
         if isinstance(text_node, str):
-            html_nodes.append(LeafNode(None, text_node))
-        elif text_node.text_type == text_type_text:
-            html_nodes.append(LeafNode(None, text_node.text))
-        elif text_node.text_type == text_type_bold:
-            html_nodes.append(LeafNode("b", text_node.text))
-        elif text_node.text_type == text_type_italic:
-            html_nodes.append(LeafNode("i", text_node.text))
-        elif text_node.text_type == text_type_code:
-            html_nodes.append(LeafNode("code", text_node.text))
-        elif text_node.text_type == text_type_link:
-            html_nodes.append(LeafNode("a", text_node.text, {"href": text_node.url}))
-        elif text_node.text_type == text_type_image:
-            html_nodes.append(LeafNode("img", "", {"src": text_node.url, "alt": text_node.text}))
+            html_nodes.append(make_leaf(None, text_node))
+        elif text_node.children:
+            html_nodes.append(nested_textnode_to_html_node(text_node))
         else:
-            raise ValueError(f"Invalid text type: {text_node.text_type}")
+            converter = converters.get(text_node.text_type)
+            if converter is None:
+                raise ValueError(f"Invalid text type: {text_node.text_type}")
+            html_nodes.append(converter(text_node.text, text_node.url))
     return html_nodes
 
+def nested_textnode_to_html_node(text_node):
+    tag = NESTED_TAGS.get(text_node.text_type)
+    if tag is None:
+        raise ValueError(f"Text type cannot contain nested nodes: {text_node.text_type}")
+    props = {"href": text_node.url} if text_node.text_type == text_type_link else None
+    return ParentNode(tag, text_nodes_to_html_nodes(text_node.children), props)
+
 def heading_to_html_node(block):
     level = block.count("#")
     content = block.lstrip("#").strip()
+    if not content:
+        # A bare "#" has nothing to head; it is kept as text like any other stray character
+        return paragraph_to_html_node(block)
     children = text_to_children(content)
     return ParentNode(f"h{level}", children)
 
-def code_to_html_node(block):
-    code_content = block.strip("`").strip()
-    return ParentNode("pre", [ParentNode("code", [LeafNode(None, code_content)])])
+def split_code_fence(block):
+    # The info string after the opening fence names the language; only its first word counts
+    first_line, newline, rest = block.partition("\n")
+    info = first_line.strip().lstrip("`").strip()
+    if not newline or "`" in info:
+        return None, block.strip("`").strip()
+    # Drop the closing fence line; an unclosed fence runs to the end of the document
+    lines = rest.split("\n")
+    if closes_fence(lines[-1].strip(), fence_length(first_line.strip())):
+        lines.pop()
+    return (info.split()[0] if info else None), "\n".join(lines).strip()
 
 def code_to_html_node(block):
-    code_content = block.strip("`").strip()
-    return ParentNode("pre", [ParentNode("code", [LeafNode(None, code_content)])])
+    language, code_content = split_code_fence(block)
+    if language is None:
+        # Escaped like highlighted code, so a bare fence and an unknown language render alike
+        return ParentNode("pre", [ParentNode("code", [LeafNode(None, html.escape(code_content, quote=False))])])
+    # The highlighter is only loaded once a page actually names a language
+    from highlight import highlight
+    return ParentNode("pre", [ParentNode("code", highlight(language, code_content), {"class": f"language-{language}"})])
 
 def quote_to_html_node(block):
+    if not block[2:].strip():
+        return paragraph_to_html_node(block)
     return ParentNode("blockquote", text_to_children(block[2:]))
 
 def unordered_list_to_html_node(block):
     items = block.split("\n")
-    list_items = [ParentNode("li", text_nodes_to_html_nodes(text_to_textnodes(item.strip("* ")))) for item in items if item.strip()]
+    list_items = [ParentNode("li", text_to_children(item.strip("* "))) for item in items if item.strip()]
     return ParentNode("ul", list_items)
 
 def ordered_list_to_html_node(block):
     items = block.split("\n")
-    list_items = [ParentNode("li", text_nodes_to_html_nodes(text_to_textnodes(item.split(". ", 1)[1]))) for item in items if item.strip()]
+    list_items = [ParentNode("li", text_to_children(item.split(". ", 1)[1])) for item in items if item.strip()]
     return ParentNode("ol", list_items)
 
+class InlineCache:
+    def __init__(self, max_entries=INLINE_CACHE_SIZE, max_chars=INLINE_CACHE_CHARS):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.entries = OrderedDict()
+        self.chars = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def children(self, text):
+        # Nodes are never modified once built, so pages that repeat a snippet share its nodes
+        if self.max_entries <= 0 or len(text) > INLINE_CACHE_MAX_FRAGMENT:
+            return text_nodes_to_html_nodes(text_to_textnodes(text))
+        with self.lock:
+            nodes = self.entries.get(text)
+            if nodes is not None:
+                self.entries.move_to_end(text)
+                self.hits += 1
+                return list(nodes)
+            self.misses += 1
+
+        nodes = tuple(text_nodes_to_html_nodes(text_to_textnodes(text)))
+        with self.lock:
+            if text not in self.entries:
+                self.entries[text] = nodes
+                self.chars += len(text)
+                self.evict(self.max_entries)
+        return list(nodes)
+
+    def evict(self, max_entries):
+        while self.entries and (len(self.entries) > max_entries or self.chars > self.max_chars):
+            text, _ = self.entries.popitem(last=False)
+            self.chars -= len(text)
+
+    def resize(self, max_entries):
+        with self.lock:
+            self.max_entries = max_entries
+            self.evict(max(max_entries, 0))
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.chars = 0
+            self.hits = 0
+            self.misses = 0
+
+# Shared by every page rendered in this process
+inline_cache = InlineCache()
+
 def text_to_children(text):
-    nodes = text_to_textnodes(text)
-    return [textnode_to_html_node(node) for node in nodes]
+    return inline_cache.children(text)
 
 def textnode_to_html_node(node):
-    if isinstance(node, str):
-        return LeafNode(None, node)
-    elif node.text_type == text_type_text:
-        return LeafNode(None, node.text)
-    elif node.text_type == text_type_bold:
-        return LeafNode("b", node.text)
-    elif node.text_type == text_type_italic:
-        return LeafNode("i", node.text)
-    elif node.text_type == text_type_code:
-        return LeafNode("code", node.text)
-    elif node.text_type == text_type_link:
-        return LeafNode("a", node.text, {"href": node.url})
-    elif node.text_type == text_type_image:
-        return LeafNode("img", "", {"src": node.url, "alt": node.text})
+    return text_nodes_to_html_nodes((node,))[0]
+
+def block_to_child(block_type, block):
+    html_node = block_to_html_node(block, block_type)
+    if isinstance(html_node, (LeafNode, ParentNode)):
+        return html_node
+    elif isinstance(html_node, str):
+        return LeafNode(None, html_node)
     else:
-        raise ValueError(f"Invalid text type: {node.text_type}")
+        raise ValueError(f"Unexpected node type: {type(html_node)}")
+
+def iter_html_nodes(lines):
+    # Top-level nodes come out as soon as their block closes, so callers can stream them
+    for block_type, block in iter_blocks(lines):
+        yield block_to_child(block_type, block)
 
 def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
-    children = []
-    for block in blocks:
-        block_type = block_to_block_type(block)
-        html_node = block_to_html_node(block, block_type)
-        if isinstance(html_node, (LeafNode, ParentNode)):
-            children.append(html_node)
-        elif isinstance(html_node, str):
-            children.append(LeafNode(None, html_node))
-        else:
-            raise ValueError(f"Unexpected node type: {type(html_node)}")
-    return ParentNode("div", children)
\ No newline at end of file
+    children = [block_to_child(block_type, block) for block_type, block in parse_blocks(markdown)]
+    return ParentNode("div", children)